@@ -1,6 +1,7 @@
 import streamlit as st
 from config.settings import setup_page_config
-from database.connection import init_connection, init_db
+from database.connection import init_connection, init_schema
+from database.instrumentation import QUERY_STATS
 from pages.login.login_page import display_login
 from pages.admin.dashboard import admin_dashboard
 from pages.company.dashboard import company_dashboard
@@ -18,28 +19,33 @@ def main():
     engine = init_connection()
     
     if engine:
-        # Initialize database tables if they don't exist
-        init_db(engine)
+        # Apply pending schema migrations (runs once per process)
+        init_schema(engine)
 
-        # Check if user is logged in
-        if "user" not in st.session_state:
-            display_login(engine)
-        else:
-            # Show appropriate dashboard based on user type
-            user_type = st.session_state.user.get("user_type", "")
-            
-            if user_type == "admin":
-                admin_dashboard(engine)
-            elif user_type == "company":
-                company_dashboard(engine)
-            elif user_type == "employee":
-                # Use the new role-based employee dashboard
-                from pages.employee.dashboard import employee_dashboard
-                employee_dashboard(engine)
+        # Time this run's queries for the per-page rollups
+        QUERY_STATS.begin_rerun()
+        try:
+            # Check if user is logged in
+            if "user" not in st.session_state:
+                display_login(engine)
             else:
-                st.error("Invalid user type. Please log out and try again.")
-                if st.button("Logout"):
-                    logout()
+                # Show appropriate dashboard based on user type
+                user_type = st.session_state.user.get("user_type", "")
+                
+                if user_type == "admin":
+                    admin_dashboard(engine)
+                elif user_type == "company":
+                    company_dashboard(engine)
+                elif user_type == "employee":
+                    # Use the new role-based employee dashboard
+                    from pages.employee.dashboard import employee_dashboard
+                    employee_dashboard(engine)
+                else:
+                    st.error("Invalid user type. Please log out and try again.")
+                    if st.button("Logout"):
+                        logout()
+        finally:
+            QUERY_STATS.end_rerun()
     else:
         st.error("Failed to connect to the database. Please check your database configuration.")
 
@@ -0,0 +1,181 @@
+"""Process-wide cache for model read methods.
+
+Streamlit runs every session in the same process, so one cache serves all
+users. Entries are keyed by method and arguments, tagged with the data
+namespaces they read ("roles", "branches", ...) and the tenant
+(company_id) they belong to, and expire after a TTL or when evicted by
+the LRU size bound.
+
+Read methods opt in with ``@cached_query(...)``; write methods declare
+what they change with ``@invalidates(...)``. Writes that cannot name a
+tenant clear the whole namespace.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_MAX_ENTRIES = 2048
+
+class QueryCache:
+    """Thread-safe TTL + LRU cache with namespace/tenant invalidation"""
+    
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.reset_stats()
+    
+    def reset_stats(self):
+        """Clear the hit/miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+    
+    def get(self, key):
+        """Look up a key.
+        
+        Returns:
+            Tuple of (found, value)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[3]
+    
+    def set(self, key, value, namespaces, tenant=None):
+        """Store a value tagged with the namespaces and tenant it depends on."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, frozenset(namespaces), tenant, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def invalidate(self, *namespaces, tenant=None):
+        """Drop entries that read any of the given namespaces.
+        
+        Args:
+            namespaces: Namespaces that changed
+            tenant: Company the change belongs to. Entries of other companies
+                are kept; entries without a tenant (cross-company listings)
+                are always dropped. None drops every tenant.
+        
+        Returns:
+            int: Number of entries dropped
+        """
+        changed = set(namespaces)
+        with self._lock:
+            stale = [
+                key for key, (_, entry_namespaces, entry_tenant, _) in self._entries.items()
+                if entry_namespaces & changed
+                and (tenant is None or entry_tenant is None or entry_tenant == tenant)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+        return len(stale)
+    
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+    
+    def snapshot(self):
+        """Get the current statistics.
+        
+        Returns:
+            dict: Entry count, limits and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            by_namespace = {}
+            for _, namespaces, _, _ in self._entries.values():
+                for namespace in namespaces:
+                    by_namespace[namespace] = by_namespace.get(namespace, 0) + 1
+            
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'entries_by_namespace': by_namespace
+            }
+
+
+QUERY_CACHE = QueryCache()
+
+
+def _tenant_of(signature, args, kwargs, tenant_arg):
+    """Extract the tenant argument from a call, or None if not given."""
+    try:
+        bound = signature.bind(*args, **kwargs)
+    except TypeError:
+        return None
+    return bound.arguments.get(tenant_arg)
+
+def cached_query(*namespaces, tenant_arg="company_id"):
+    """Cache a model read method's result.
+    
+    The decorated function must take the database connection as its first
+    argument; the connection is not part of the cache key.
+    
+    Args:
+        namespaces: Data namespaces the query reads
+        tenant_arg: Name of the argument identifying the company, if any
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(conn, *args, **kwargs):
+            key = (func.__module__, func.__qualname__, args, tuple(sorted(kwargs.items())))
+            found, value = QUERY_CACHE.get(key)
+            if found:
+                # Callers get their own list so they can't alter the cached one
+                return list(value) if isinstance(value, list) else value
+            
+            value = func(conn, *args, **kwargs)
+            QUERY_CACHE.set(key, value, namespaces, _tenant_of(signature, (conn,) + args, kwargs, tenant_arg))
+            return list(value) if isinstance(value, list) else value
+        
+        wrapper.uncached = func
+        return wrapper
+    return decorator
+
+def invalidates(*namespaces, tenant_arg="company_id"):
+    """Invalidate cached reads after a model write method succeeds.
+    
+    Args:
+        namespaces: Data namespaces the write changes
+        tenant_arg: Name of the argument identifying the company; writes
+            without it clear the namespaces for every tenant
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            QUERY_CACHE.invalidate(*namespaces, tenant=_tenant_of(signature, args, kwargs, tenant_arg))
+            return result
+        
+        return wrapper
+    return decorator
@@ -0,0 +1,219 @@
+"""SQL statement timing with per-page rollups and a slow-query log.
+
+Cursor-execute hooks on the engine time every statement, record its row
+count and attribute it to the innermost ``pages.*`` function on the call
+stack. ``begin_rerun``/``end_rerun`` bracket each Streamlit script run;
+at the end of a run its statements are rolled up per page function
+(queries, DB time, most repeated statement), which is what makes N+1
+loops stand out. Statements slower than the threshold are written to the
+slow-query log. Per-panel query counts of the lazily loaded dashboard
+panels go to the panel log.
+
+Settings come from the optional ``[instrumentation]`` secrets section:
+``slow_query_ms`` (default 500), ``slow_query_log`` (default
+``logs/slow_queries.log``) and ``panel_log`` (default ``logs/panels.log``).
+"""
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from sqlalchemy import event
+
+DEFAULT_SLOW_QUERY_MS = 500
+DEFAULT_SLOW_QUERY_LOG = os.path.join("logs", "slow_queries.log")
+DEFAULT_PANEL_LOG = os.path.join("logs", "panels.log")
+
+# Reruns kept per page for the rolling summary, and slow queries kept in memory
+ROLLING_WINDOW = 100
+RECENT_SLOW_QUERIES = 50
+
+OTHER_CALLER = "(outside pages)"
+
+slow_query_logger = logging.getLogger("akhand.slow_queries")
+panel_logger = logging.getLogger("akhand.panels")
+
+def find_page_function():
+    """Name the innermost pages.* function on the current call stack.
+    
+    Returns:
+        str: "module.function", or OTHER_CALLER
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("pages."):
+            return f"{module}.{frame.f_code.co_name}"
+        frame = frame.f_back
+    return OTHER_CALLER
+
+class QueryStats:
+    """Process-wide statement timing, rolled up per page function"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.slow_query_ms = DEFAULT_SLOW_QUERY_MS
+        self.reset()
+    
+    def reset(self):
+        """Clear the rollups and the in-memory slow query list."""
+        with self._lock:
+            self.pages = {}
+            self.slow_queries = deque(maxlen=RECENT_SLOW_QUERIES)
+            self.statements = 0
+            self.started_at = time.time()
+    
+    def begin_rerun(self):
+        """Start collecting statements for the current script run."""
+        self._local.rerun = []
+    
+    def end_rerun(self):
+        """Roll the current script run's statements up per page function."""
+        statements = getattr(self._local, "rerun", None)
+        self._local.rerun = None
+        if not statements:
+            return
+        
+        per_page = {}
+        for page, duration_ms, statement in statements:
+            rollup = per_page.setdefault(page, {'queries': 0, 'db_ms': 0.0, 'repeats': Counter()})
+            rollup['queries'] += 1
+            rollup['db_ms'] += duration_ms
+            rollup['repeats'][statement] += 1
+        
+        with self._lock:
+            for page, rollup in per_page.items():
+                history = self.pages.setdefault(page, deque(maxlen=ROLLING_WINDOW))
+                history.append((rollup['queries'], rollup['db_ms'], rollup['repeats'].most_common(1)[0][1]))
+    
+    def mark(self):
+        """Mark the current position in this script run's statements.
+        
+        Returns:
+            int: Position to pass to since()
+        """
+        return len(getattr(self._local, "rerun", None) or [])
+    
+    def since(self, mark):
+        """Count the statements this script run executed after a mark.
+        
+        Args:
+            mark: Position returned by mark()
+        
+        Returns:
+            Tuple of (queries, DB time in ms)
+        """
+        statements = (getattr(self._local, "rerun", None) or [])[mark:]
+        return len(statements), sum(duration_ms for _, duration_ms, _ in statements)
+    
+    def record(self, statement, duration_ms, rowcount):
+        """Record one executed statement.
+        
+        Parameters are deliberately not recorded; they include passwords.
+        
+        Args:
+            statement: SQL text
+            duration_ms: Execution time in milliseconds
+            rowcount: Rows returned/affected as reported by the driver
+        """
+        page = find_page_function()
+        
+        rerun = getattr(self._local, "rerun", None)
+        if rerun is not None:
+            rerun.append((page, duration_ms, statement))
+        
+        with self._lock:
+            self.statements += 1
+        
+        if duration_ms >= self.slow_query_ms:
+            compact = " ".join(statement.split())
+            with self._lock:
+                self.slow_queries.appendleft({
+                    'at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                    'page': page,
+                    'duration_ms': round(duration_ms, 1),
+                    'rows': rowcount,
+                    'statement': compact
+                })
+            slow_query_logger.warning(
+                "%.1f ms rows=%s page=%s sql=%s",
+                duration_ms, rowcount, page, compact
+            )
+    
+    def summary(self):
+        """Summarize the rolling window of each page function.
+        
+        Returns:
+            List of dicts sorted by average DB time per rerun, slowest first
+        """
+        with self._lock:
+            rows = []
+            for page, history in self.pages.items():
+                reruns = len(history)
+                rows.append({
+                    'page': page,
+                    'reruns': reruns,
+                    'avg_queries': round(sum(h[0] for h in history) / reruns, 1),
+                    'max_queries': max(h[0] for h in history),
+                    'avg_db_ms': round(sum(h[1] for h in history) / reruns, 1),
+                    'max_db_ms': round(max(h[1] for h in history), 1),
+                    'max_repeats': max(h[2] for h in history)
+                })
+        
+        return sorted(rows, key=lambda row: row['avg_db_ms'], reverse=True)
+
+
+QUERY_STATS = QueryStats()
+
+
+def configure_file_log(logger, path, level):
+    """Send a logger's records at or above level to a file (once per path).
+    
+    Args:
+        logger: logging.Logger to configure
+        path: Log file path; its directory is created if needed
+        level: Lowest level written, e.g. logging.INFO
+    """
+    path = os.path.abspath(path)
+    logger.setLevel(level)
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename == path:
+            return
+    
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    handler = logging.FileHandler(path)
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    logger.propagate = False
+
+def configure_slow_query_log(path):
+    """Send the slow-query logger's records to a file (once per path)."""
+    configure_file_log(slow_query_logger, path, logging.WARNING)
+
+def instrument_engine(engine, settings=None):
+    """Attach the timing hooks to an engine.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        settings: Optional mapping with slow_query_ms, slow_query_log and panel_log
+    """
+    settings = settings or {}
+    QUERY_STATS.slow_query_ms = float(settings.get("slow_query_ms", DEFAULT_SLOW_QUERY_MS))
+    configure_slow_query_log(settings.get("slow_query_log", DEFAULT_SLOW_QUERY_LOG))
+    configure_file_log(panel_logger, settings.get("panel_log", DEFAULT_PANEL_LOG), logging.INFO)
+    
+    if event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        return
+    
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, so a failed statement leaves nothing behind
+    context.query_start = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - context.query_start) * 1000
+    QUERY_STATS.record(statement, duration_ms, cursor.rowcount)
@@ -0,0 +1,205 @@
+"""Versioned schema migrations.
+
+Migrations live in ``database/migrations`` as modules named
+``v<NNNN>_<description>.py``, each exposing an ``upgrade(conn)`` function.
+Applied versions are recorded in the ``schema_migrations`` ledger table.
+
+The runner takes a PostgreSQL advisory lock so that several app processes
+starting at the same time apply each migration exactly once. It can be run
+from the app (once per process, see ``database.connection.init_schema``) or
+from the command line::
+    
+    python -m database.migrate            # apply pending migrations
+    python -m database.migrate --status   # show applied/pending versions
+"""
+import argparse
+import importlib
+import os
+import pkgutil
+import re
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+
+MIGRATIONS_PACKAGE = "database.migrations"
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_KEY = 724190511
+
+_MODULE_PATTERN = re.compile(r"^v(\d{4})_(\w+)$")
+
+def get_migrations():
+    """Discover the available migrations.
+    
+    Returns:
+        List of (version, name, module) tuples sorted by version
+    """
+    migrations = []
+    seen_versions = set()
+    
+    for module_info in pkgutil.iter_modules([MIGRATIONS_DIR]):
+        match = _MODULE_PATTERN.match(module_info.name)
+        if not match:
+            continue
+        
+        version = int(match.group(1))
+        if version in seen_versions:
+            raise RuntimeError(f"Duplicate migration version {version:04d}")
+        seen_versions.add(version)
+        
+        module = importlib.import_module(f"{MIGRATIONS_PACKAGE}.{module_info.name}")
+        migrations.append((version, match.group(2), module))
+    
+    return sorted(migrations, key=lambda m: m[0])
+
+def get_latest_version():
+    """Get the version number of the newest migration shipped with the code."""
+    migrations = get_migrations()
+    return migrations[-1][0] if migrations else 0
+
+def ensure_ledger(conn):
+    """Create the schema_migrations ledger table if it doesn't exist.
+    
+    Args:
+        conn: Database connection
+    """
+    conn.execute(text('''
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    '''))
+
+def get_applied_versions(conn):
+    """Get the set of migration versions recorded in the ledger.
+    
+    Args:
+        conn: Database connection
+    
+    Returns:
+        set: Applied version numbers (empty if the ledger doesn't exist yet)
+    """
+    result = conn.execute(text("SELECT to_regclass('schema_migrations') IS NOT NULL"))
+    if not result.fetchone()[0]:
+        return set()
+    
+    result = conn.execute(text('SELECT version FROM schema_migrations'))
+    return {row[0] for row in result.fetchall()}
+
+def is_schema_current(conn):
+    """Check whether every shipped migration has been applied.
+    
+    This is a single cheap query against the ledger, suitable for running
+    before deciding whether the (locking) migration runner is needed.
+    
+    Args:
+        conn: Database connection
+    
+    Returns:
+        bool: True if the database is at the latest version
+    """
+    try:
+        result = conn.execute(text('SELECT COALESCE(MAX(version), 0) FROM schema_migrations'))
+    except ProgrammingError:
+        # Ledger table doesn't exist yet - fresh or pre-migration database
+        conn.rollback()
+        return False
+    
+    return result.fetchone()[0] >= get_latest_version()
+
+def run_migrations(engine, target_version=None):
+    """Apply all pending migrations under an advisory lock.
+    
+    Each migration runs in its own transaction together with its ledger
+    entry, so a failing migration leaves the database at the last good
+    version.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        target_version: Optional version to stop at (inclusive)
+    
+    Returns:
+        list: Versions applied by this call
+    """
+    applied_now = []
+    
+    with engine.connect() as conn:
+        # Fast path - nothing to do and no lock needed
+        if target_version is None and is_schema_current(conn):
+            conn.commit()
+            return applied_now
+        
+        conn.execute(text('SELECT pg_advisory_lock(:key)'), {'key': MIGRATION_LOCK_KEY})
+        conn.commit()
+        
+        try:
+            with conn.begin():
+                ensure_ledger(conn)
+            
+            # Re-read under the lock; another process may have done the work
+            applied = get_applied_versions(conn)
+            conn.commit()
+            
+            for version, name, module in get_migrations():
+                if version in applied:
+                    continue
+                if target_version is not None and version > target_version:
+                    break
+                
+                with conn.begin():
+                    module.upgrade(conn)
+                    conn.execute(text('''
+                    INSERT INTO schema_migrations (version, name)
+                    VALUES (:version, :name)
+                    '''), {'version': version, 'name': name})
+                
+                applied_now.append(version)
+        finally:
+            conn.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': MIGRATION_LOCK_KEY})
+            conn.commit()
+    
+    return applied_now
+
+def get_database_url(url=None):
+    """Resolve the database URL for command line use.
+    
+    Precedence: explicit argument, DATABASE_URL environment variable,
+    then the postgres url in Streamlit secrets.
+    """
+    if url:
+        return url
+    if os.environ.get("DATABASE_URL"):
+        return os.environ["DATABASE_URL"]
+    
+    import streamlit as st
+    return st.secrets["postgres"]["url"]
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Apply database schema migrations")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--target", type=int, help="Only migrate up to this version")
+    parser.add_argument("--status", action="store_true", help="Show migration status and exit")
+    args = parser.parse_args(argv)
+    
+    from database.connection import build_engine
+    engine = build_engine({"url": get_database_url(args.url)})
+    
+    if args.status:
+        with engine.connect() as conn:
+            applied = get_applied_versions(conn)
+        for version, name, _ in get_migrations():
+            state = "applied" if version in applied else "pending"
+            print(f"{version:04d}  {name:<40} {state}")
+        return 0
+    
+    applied_now = run_migrations(engine, target_version=args.target)
+    if applied_now:
+        print("Applied migrations: " + ", ".join(f"{v:04d}" for v in applied_now))
+    else:
+        print("Schema is up to date")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+"""Indexes for the predicates used by the model layer's hot queries.
+
+The original schema only had primary keys and a few UNIQUE constraints, so
+every per-employee, per-branch and per-company lookup was a sequential scan.
+Partial indexes cover the "still open" subsets that dashboards count all day.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create the managed index set.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    -- Reports by employee and date (ReportModel.get_employee_reports, check_report_exists)
+    CREATE INDEX IF NOT EXISTS idx_daily_reports_employee_date
+        ON daily_reports (employee_id, report_date);
+    
+    -- Company/branch report listings filter on the date range after joining employees
+    CREATE INDEX IF NOT EXISTS idx_daily_reports_report_date
+        ON daily_reports (report_date);
+    
+    -- Company task lists and counters (TaskModel.get_tasks_for_company)
+    CREATE INDEX IF NOT EXISTS idx_tasks_company_completed
+        ON tasks (company_id, is_completed);
+    CREATE INDEX IF NOT EXISTS idx_tasks_company_open
+        ON tasks (company_id) WHERE is_completed = FALSE;
+    
+    -- Branch tasks
+    CREATE INDEX IF NOT EXISTS idx_tasks_branch
+        ON tasks (branch_id);
+    CREATE INDEX IF NOT EXISTS idx_tasks_branch_open
+        ON tasks (branch_id) WHERE is_completed = FALSE;
+    
+    -- Directly assigned tasks (TaskModel.get_tasks_for_employee)
+    CREATE INDEX IF NOT EXISTS idx_tasks_employee
+        ON tasks (employee_id);
+    
+    -- Branch task progress and completion checks
+    CREATE INDEX IF NOT EXISTS idx_task_assignments_task_completed
+        ON task_assignments (task_id, is_completed);
+    CREATE INDEX IF NOT EXISTS idx_task_assignments_task_open
+        ON task_assignments (task_id) WHERE is_completed = FALSE;
+    CREATE INDEX IF NOT EXISTS idx_task_assignments_employee
+        ON task_assignments (employee_id);
+    
+    -- Inbox lookups and unread counters; the sender side covers the
+    -- "received OR sent" conversation query
+    CREATE INDEX IF NOT EXISTS idx_messages_receiver_read
+        ON messages (receiver_type, receiver_id, is_read);
+    CREATE INDEX IF NOT EXISTS idx_messages_sender
+        ON messages (sender_type, sender_id);
+    
+    -- Branch employee lists filtered by role
+    CREATE INDEX IF NOT EXISTS idx_employees_branch_role
+        ON employees (branch_id, role_id);
+    
+    -- Admin report filter by employee name
+    CREATE INDEX IF NOT EXISTS idx_employees_full_name
+        ON employees (full_name);
+    '''))
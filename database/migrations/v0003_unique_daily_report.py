@@ -0,0 +1,33 @@
+"""One report per employee per day.
+
+Report submission used to check for an existing row and then insert or
+update, which let concurrent submits create duplicates. Duplicates are
+collapsed to the most recently submitted row before the constraint is
+added; ReportModel.upsert_report relies on it for ON CONFLICT.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Deduplicate daily_reports and add UNIQUE (employee_id, report_date).
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    DELETE FROM daily_reports dr
+    USING (
+        SELECT id,
+               ROW_NUMBER() OVER (
+                   PARTITION BY employee_id, report_date
+                   ORDER BY created_at DESC NULLS LAST, id DESC
+               ) AS rn
+        FROM daily_reports
+    ) ranked
+    WHERE dr.id = ranked.id AND ranked.rn > 1;
+    
+    ALTER TABLE daily_reports
+        ADD CONSTRAINT uq_daily_reports_employee_date UNIQUE (employee_id, report_date);
+    
+    -- The constraint's index has the same leading columns
+    DROP INDEX IF EXISTS idx_daily_reports_employee_date;
+    '''))
@@ -0,0 +1,70 @@
+"""Server-side task completion.
+
+``complete_task`` performs the whole completion state transition that
+TaskModel.mark_task_completed used to drive with up to five statements.
+The task row is locked first, so concurrent completions of the same
+branch task run one after the other and the last one closes the task.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create the complete_task(task_id, employee_id, completed_at) function.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE OR REPLACE FUNCTION complete_task(p_task_id INTEGER, p_employee_id INTEGER, p_now TIMESTAMP)
+    RETURNS BOOLEAN
+    LANGUAGE plpgsql
+    AS $$
+    DECLARE
+        v_branch_id INTEGER;
+        v_employee_id INTEGER;
+        v_is_completed BOOLEAN;
+    BEGIN
+        SELECT branch_id, employee_id, is_completed
+        INTO v_branch_id, v_employee_id, v_is_completed
+        FROM tasks
+        WHERE id = p_task_id
+        FOR UPDATE;
+        
+        IF NOT FOUND THEN
+            RETURN FALSE;
+        END IF;
+        
+        IF v_is_completed THEN
+            RETURN TRUE;
+        END IF;
+        
+        IF v_branch_id IS NOT NULL THEN
+            UPDATE task_assignments
+            SET is_completed = TRUE, completed_at = p_now
+            WHERE task_id = p_task_id AND employee_id = p_employee_id;
+            
+            -- Managers and assistant managers close the whole task; otherwise
+            -- it closes once every assignment is done
+            IF NOT EXISTS (
+                SELECT 1
+                FROM employees e
+                JOIN employee_roles r ON e.role_id = r.id
+                WHERE e.id = p_employee_id AND r.role_level <= 2
+            ) AND EXISTS (
+                SELECT 1
+                FROM task_assignments
+                WHERE task_id = p_task_id AND is_completed = FALSE
+            ) THEN
+                RETURN FALSE;
+            END IF;
+        ELSIF v_employee_id IS DISTINCT FROM p_employee_id THEN
+            RETURN FALSE;
+        END IF;
+        
+        UPDATE tasks
+        SET is_completed = TRUE, completed_at = p_now, completed_by_id = p_employee_id
+        WHERE id = p_task_id;
+        
+        RETURN TRUE;
+    END;
+    $$;
+    '''))
@@ -0,0 +1,18 @@
+"""Index for "most recent reports" lookups.
+
+CompanyStatsModel.get_overview reads the newest reports of each employee;
+this lets it stop after a few index entries per employee instead of
+sorting the company's whole report history.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create idx_daily_reports_employee_created.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE INDEX IF NOT EXISTS idx_daily_reports_employee_created
+        ON daily_reports (employee_id, created_at);
+    '''))
@@ -0,0 +1,122 @@
+"""Trigger-maintained global counters for the admin overview.
+
+The figures the admin dashboard shows are kept as deltas spread over
+COUNTER_SHARDS rows of ``system_counter_shards`` and summed on read.
+Each backend writes to the shard picked by its pid, so concurrent
+writers (e.g. report submissions from different tenants) don't queue on
+a single row lock until commit.
+
+Statement-level triggers with transition tables apply the net change of
+each INSERT/UPDATE/DELETE, so bulk statements touch a shard once, and
+statements that don't change a counted value (report text edits,
+message replies) don't touch one at all.
+
+The ``system_counters_recount`` view counts the same figures from the
+tables; SystemCountersModel.recount uses it to rebuild the shards.
+"""
+from sqlalchemy import text
+
+# Counter column -> (table, predicate selecting the counted rows)
+COUNTERS = {
+    'active_companies': ('companies', 'is_active'),
+    'active_branches': ('branches', 'is_active'),
+    'active_employees': ('employees', 'is_active'),
+    'total_reports': ('daily_reports', 'TRUE'),
+    'total_tasks': ('tasks', 'TRUE'),
+    'completed_tasks': ('tasks', 'is_completed'),
+    'unread_admin_messages': ('messages', "receiver_type = 'admin' AND is_read = FALSE"),
+}
+
+# Rows the counter deltas are spread over
+COUNTER_SHARDS = 16
+
+def _trigger_function_sql(table, counters):
+    """Build the trigger function applying one table's counter deltas."""
+    declarations = []
+    collect = []
+    assignments = []
+    changed = []
+    
+    for column, predicate in counters:
+        declarations.append(f"new_{column} BIGINT := 0; old_{column} BIGINT := 0;")
+        collect.append(f"COUNT(*) FILTER (WHERE {predicate})")
+        assignments.append(f"{column} = {column} + new_{column} - old_{column}")
+        changed.append(f"new_{column} <> old_{column}")
+    
+    new_targets = ", ".join(f"new_{column}" for column, _ in counters)
+    old_targets = ", ".join(f"old_{column}" for column, _ in counters)
+    
+    return f'''
+    CREATE OR REPLACE FUNCTION system_counters_{table}() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    DECLARE
+        {" ".join(declarations)}
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT {", ".join(collect)} INTO {new_targets} FROM new_rows;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT {", ".join(collect)} INTO {old_targets} FROM old_rows;
+        END IF;
+        
+        IF {" OR ".join(changed)} THEN
+            UPDATE system_counter_shards
+            SET {", ".join(assignments)}, updated_at = CURRENT_TIMESTAMP
+            WHERE shard = pg_backend_pid() % {COUNTER_SHARDS};
+        END IF;
+        
+        RETURN NULL;
+    END;
+    $$;
+    
+    CREATE TRIGGER trg_system_counters_{table}_insert
+        AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION system_counters_{table}();
+    CREATE TRIGGER trg_system_counters_{table}_update
+        AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION system_counters_{table}();
+    CREATE TRIGGER trg_system_counters_{table}_delete
+        AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION system_counters_{table}();
+    '''
+
+def upgrade(conn):
+    """Create the counter shards, the recount view and the triggers, and fill the shards.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    columns = ",\n        ".join(f"{column} BIGINT NOT NULL DEFAULT 0" for column in COUNTERS)
+    conn.execute(text(f'''
+    CREATE TABLE system_counter_shards (
+        shard SMALLINT PRIMARY KEY CHECK (shard >= 0 AND shard < {COUNTER_SHARDS}),
+        {columns},
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    INSERT INTO system_counter_shards (shard)
+    SELECT generate_series(0, {COUNTER_SHARDS - 1});
+    '''))
+    
+    counts = ",\n        ".join(
+        f"(SELECT COUNT(*) FROM {table} WHERE {predicate}) AS {column}"
+        for column, (table, predicate) in COUNTERS.items()
+    )
+    conn.execute(text(f'''
+    CREATE VIEW system_counters_recount AS
+    SELECT {counts}
+    '''))
+    
+    by_table = {}
+    for column, (table, predicate) in COUNTERS.items():
+        by_table.setdefault(table, []).append((column, predicate))
+    
+    for table, counters in by_table.items():
+        conn.execute(text(_trigger_function_sql(table, counters)))
+    
+    # Initial values go to shard 0; the migration runs before the app serves requests
+    conn.execute(text(f'''
+    UPDATE system_counter_shards
+    SET ({", ".join(COUNTERS)}) = (SELECT {", ".join(COUNTERS)} FROM system_counters_recount)
+    WHERE shard = 0
+    '''))
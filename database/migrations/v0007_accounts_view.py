@@ -0,0 +1,59 @@
+"""Unified ``accounts`` view over company and employee logins.
+
+Login used to query companies and then, on a miss, run a second join for
+employees. The view exposes both with the same columns so a single query
+resolves user type, tenant and role. Lookups by username are pushed into
+each branch of the UNION ALL and served by the existing UNIQUE username
+indexes on companies and employees.
+
+``is_active`` already folds in the branch and company status for
+employees. ``precedence`` keeps the old behaviour of companies winning
+when a company and an employee share a username.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create the accounts view.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE VIEW accounts AS
+    SELECT 'company'::TEXT AS user_type,
+           1 AS precedence,
+           c.id,
+           c.username,
+           c.password,
+           c.company_name AS full_name,
+           c.profile_pic_url,
+           c.is_active,
+           c.id AS company_id,
+           c.company_name,
+           NULL::INTEGER AS branch_id,
+           NULL::VARCHAR AS branch_name,
+           NULL::INTEGER AS role_id,
+           NULL::VARCHAR AS role_name,
+           NULL::INTEGER AS role_level
+    FROM companies c
+    UNION ALL
+    SELECT 'employee'::TEXT,
+           2,
+           e.id,
+           e.username,
+           e.password,
+           e.full_name,
+           e.profile_pic_url,
+           e.is_active AND b.is_active AND c.is_active,
+           c.id,
+           c.company_name,
+           b.id,
+           b.branch_name,
+           r.id,
+           r.role_name,
+           r.role_level
+    FROM employees e
+    JOIN branches b ON e.branch_id = b.id
+    JOIN companies c ON b.company_id = c.id
+    JOIN employee_roles r ON e.role_id = r.id;
+    '''))
@@ -0,0 +1,113 @@
+"""Version stamp for the cached employee context.
+
+``employees.version`` is bumped whenever something the employee dashboard
+caches per session changes: the employee's own name, picture, status,
+branch or role, or the name/level of their role or the name/status of
+their branch. Triggers do the bumping, so the model methods and the raw
+updates in the pages are all covered.
+
+The accounts view gains the column so login hands the dashboard a
+context that is already stamped.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Add employees.version, its triggers, and expose it on accounts.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    ALTER TABLE employees ADD COLUMN version INTEGER NOT NULL DEFAULT 1;
+    
+    CREATE OR REPLACE FUNCTION bump_employee_version() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        NEW.version := OLD.version + 1;
+        RETURN NEW;
+    END;
+    $$;
+    
+    CREATE TRIGGER trg_employees_version
+        BEFORE UPDATE OF full_name, profile_pic_url, is_active, branch_id, role_id ON employees
+        FOR EACH ROW
+        WHEN (OLD.full_name IS DISTINCT FROM NEW.full_name
+              OR OLD.profile_pic_url IS DISTINCT FROM NEW.profile_pic_url
+              OR OLD.is_active IS DISTINCT FROM NEW.is_active
+              OR OLD.branch_id IS DISTINCT FROM NEW.branch_id
+              OR OLD.role_id IS DISTINCT FROM NEW.role_id)
+        EXECUTE FUNCTION bump_employee_version();
+    
+    CREATE OR REPLACE FUNCTION bump_role_employee_versions() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        UPDATE employees SET version = version + 1 WHERE role_id = NEW.id;
+        RETURN NULL;
+    END;
+    $$;
+    
+    CREATE TRIGGER trg_employee_roles_version
+        AFTER UPDATE OF role_name, role_level ON employee_roles
+        FOR EACH ROW
+        WHEN (OLD.role_name IS DISTINCT FROM NEW.role_name
+              OR OLD.role_level IS DISTINCT FROM NEW.role_level)
+        EXECUTE FUNCTION bump_role_employee_versions();
+    
+    CREATE OR REPLACE FUNCTION bump_branch_employee_versions() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        UPDATE employees SET version = version + 1 WHERE branch_id = NEW.id;
+        RETURN NULL;
+    END;
+    $$;
+    
+    CREATE TRIGGER trg_branches_version
+        AFTER UPDATE OF branch_name, is_active ON branches
+        FOR EACH ROW
+        WHEN (OLD.branch_name IS DISTINCT FROM NEW.branch_name
+              OR OLD.is_active IS DISTINCT FROM NEW.is_active)
+        EXECUTE FUNCTION bump_branch_employee_versions();
+    
+    CREATE OR REPLACE VIEW accounts AS
+    SELECT 'company'::TEXT AS user_type,
+           1 AS precedence,
+           c.id,
+           c.username,
+           c.password,
+           c.company_name AS full_name,
+           c.profile_pic_url,
+           c.is_active,
+           c.id AS company_id,
+           c.company_name,
+           NULL::INTEGER AS branch_id,
+           NULL::VARCHAR AS branch_name,
+           NULL::INTEGER AS role_id,
+           NULL::VARCHAR AS role_name,
+           NULL::INTEGER AS role_level,
+           NULL::INTEGER AS version
+    FROM companies c
+    UNION ALL
+    SELECT 'employee'::TEXT,
+           2,
+           e.id,
+           e.username,
+           e.password,
+           e.full_name,
+           e.profile_pic_url,
+           e.is_active AND b.is_active AND c.is_active,
+           c.id,
+           c.company_name,
+           b.id,
+           b.branch_name,
+           r.id,
+           r.role_name,
+           r.role_level,
+           e.version
+    FROM employees e
+    JOIN branches b ON e.branch_id = b.id
+    JOIN companies c ON b.company_id = c.id
+    JOIN employee_roles r ON e.role_id = r.id;
+    '''))
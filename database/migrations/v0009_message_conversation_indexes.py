@@ -0,0 +1,23 @@
+"""Indexes for paging through conversations newest first.
+
+A company's conversation is what it received plus what it sent. The
+paged queries read each side separately, newest id first, and merge
+them, so each side needs an index ending in id. The receiver index also
+serves the bulk "mark read up to" update. The sender index replaces
+idx_messages_sender, which is a prefix of it.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create the conversation indexes and drop the superseded one.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE INDEX IF NOT EXISTS idx_messages_receiver_id
+        ON messages (receiver_type, receiver_id, id);
+    CREATE INDEX IF NOT EXISTS idx_messages_sender_id
+        ON messages (sender_type, sender_id, id);
+    DROP INDEX IF EXISTS idx_messages_sender;
+    '''))
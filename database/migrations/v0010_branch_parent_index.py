@@ -0,0 +1,17 @@
+"""Index for walking the branch hierarchy.
+
+BranchModel's subtree queries follow parent_branch_id downwards one level
+per recursion step; without an index every step scans all branches.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create idx_branches_parent.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE INDEX IF NOT EXISTS idx_branches_parent
+        ON branches (parent_branch_id);
+    '''))
@@ -0,0 +1,40 @@
+"""Export jobs table for rendering report PDFs in the background.
+
+Each row is one requested export: what to render (kind and params), who
+asked for it, and where it is in its life cycle. Rows are claimed from
+'queued' to 'running' by the app process that renders them, so the
+per-company concurrency limit holds across processes. The partial index
+keeps the dispatcher's look at queued/running jobs small however many
+finished jobs pile up.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create the export_jobs table and its indexes.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE TABLE export_jobs (
+        id SERIAL PRIMARY KEY,
+        company_id INTEGER REFERENCES companies(id) ON DELETE CASCADE,
+        requested_by_type VARCHAR(20) NOT NULL,
+        requested_by_id INTEGER NOT NULL,
+        kind VARCHAR(20) NOT NULL,
+        params JSONB NOT NULL DEFAULT '{}',
+        title VARCHAR(255) NOT NULL,
+        status VARCHAR(20) NOT NULL DEFAULT 'queued'
+            CHECK (status IN ('queued', 'running', 'done', 'failed')),
+        file_path TEXT,
+        file_size BIGINT,
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP,
+        finished_at TIMESTAMP
+    );
+    
+    CREATE INDEX idx_export_jobs_company ON export_jobs (company_id, id);
+    CREATE INDEX idx_export_jobs_active ON export_jobs (status, company_id, id)
+        WHERE status IN ('queued', 'running');
+    '''))
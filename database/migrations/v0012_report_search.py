@@ -0,0 +1,26 @@
+"""Full-text search over daily reports.
+
+Adds a stored generated tsvector of report_text, so Postgres keeps it
+current on every insert and update without triggers, and a GIN index
+over it for ReportModel.search. The 'english' configuration stems words
+("audited" finds "audit") and drops stop words.
+
+Adding a stored column rewrites daily_reports once; on large tables run
+this migration outside business hours.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Add daily_reports.search_vector and idx_daily_reports_search.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    ALTER TABLE daily_reports
+        ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', report_text)) STORED;
+    
+    CREATE INDEX IF NOT EXISTS idx_daily_reports_search
+        ON daily_reports USING GIN (search_vector);
+    '''))
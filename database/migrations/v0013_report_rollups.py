@@ -0,0 +1,163 @@
+"""Monthly per-employee report rollups for report statistics.
+
+``report_rollups`` holds one row per employee and month with the number
+of reports, their first and last dates and their total length. Rows carry
+the employee's current company and branch, so statistics group the same
+way as the report listings; moving an employee to another branch moves
+their rows along. Employees without a branch have no rows.
+
+Statement-level triggers with transition tables keep the rollups current
+for every write to daily_reports, the model methods and raw statements
+alike. A statement recomputes only the months it touched, from at most a
+month of that employee's reports. The rows are locked before they are
+recomputed, so a concurrent write to the same month waits and then
+recomputes with this one's reports visible.
+
+ReportModel.rebuild_rollups rebuilds the table from scratch.
+"""
+from sqlalchemy import text
+
+def upgrade(conn):
+    """Create report_rollups, its triggers, and fill it.
+    
+    Args:
+        conn: Database connection (inside the migration transaction)
+    """
+    conn.execute(text('''
+    CREATE TABLE report_rollups (
+        employee_id INTEGER NOT NULL REFERENCES employees(id) ON DELETE CASCADE,
+        month DATE NOT NULL,
+        company_id INTEGER NOT NULL,
+        branch_id INTEGER NOT NULL,
+        report_count INTEGER NOT NULL,
+        first_date DATE NOT NULL,
+        last_date DATE NOT NULL,
+        total_chars BIGINT NOT NULL,
+        PRIMARY KEY (employee_id, month)
+    );
+    
+    CREATE INDEX idx_report_rollups_company_month ON report_rollups (company_id, month);
+    
+    CREATE OR REPLACE FUNCTION refresh_report_rollups(employee_ids INTEGER[], months DATE[]) RETURNS VOID
+    LANGUAGE plpgsql
+    AS $$
+    BEGIN
+        -- Lock (or create) the rows in key order before reading the reports
+        INSERT INTO report_rollups AS ru
+            (employee_id, month, company_id, branch_id, report_count, first_date, last_date, total_chars)
+        SELECT k.employee_id, k.month, b.company_id, e.branch_id, 0, k.month, k.month, 0
+        FROM unnest(employee_ids, months) AS k(employee_id, month)
+        JOIN employees e ON e.id = k.employee_id
+        JOIN branches b ON b.id = e.branch_id
+        ORDER BY k.employee_id, k.month
+        ON CONFLICT (employee_id, month) DO UPDATE SET report_count = ru.report_count;
+        
+        UPDATE report_rollups ru
+        SET report_count = totals.report_count,
+            first_date = COALESCE(totals.first_date, ru.month),
+            last_date = COALESCE(totals.last_date, ru.month),
+            total_chars = totals.total_chars
+        FROM (
+            SELECT k.employee_id, k.month, COUNT(dr.id) AS report_count,
+                   MIN(dr.report_date) AS first_date, MAX(dr.report_date) AS last_date,
+                   COALESCE(SUM(length(dr.report_text)), 0) AS total_chars
+            FROM unnest(employee_ids, months) AS k(employee_id, month)
+            LEFT JOIN daily_reports dr ON dr.employee_id = k.employee_id
+                AND dr.report_date >= k.month
+                AND dr.report_date < (k.month + INTERVAL '1 month')::date
+            GROUP BY k.employee_id, k.month
+        ) totals
+        WHERE ru.employee_id = totals.employee_id AND ru.month = totals.month;
+        
+        DELETE FROM report_rollups ru
+        USING unnest(employee_ids, months) AS k(employee_id, month)
+        WHERE ru.employee_id = k.employee_id AND ru.month = k.month AND ru.report_count = 0;
+    END;
+    $$;
+    
+    CREATE OR REPLACE FUNCTION report_rollups_daily_reports() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    DECLARE
+        employee_ids INTEGER[];
+        months DATE[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(employee_id ORDER BY employee_id, month), array_agg(month ORDER BY employee_id, month)
+            INTO employee_ids, months
+            FROM (SELECT DISTINCT employee_id, date_trunc('month', report_date)::date AS month
+                  FROM new_rows) touched;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(employee_id ORDER BY employee_id, month), array_agg(month ORDER BY employee_id, month)
+            INTO employee_ids, months
+            FROM (SELECT DISTINCT employee_id, date_trunc('month', report_date)::date AS month
+                  FROM old_rows) touched;
+        ELSE
+            SELECT array_agg(employee_id ORDER BY employee_id, month), array_agg(month ORDER BY employee_id, month)
+            INTO employee_ids, months
+            FROM (SELECT employee_id, date_trunc('month', report_date)::date AS month FROM old_rows
+                  UNION
+                  SELECT employee_id, date_trunc('month', report_date)::date AS month FROM new_rows) touched;
+        END IF;
+        
+        IF employee_ids IS NOT NULL THEN
+            PERFORM refresh_report_rollups(employee_ids, months);
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    
+    CREATE TRIGGER trg_report_rollups_insert
+        AFTER INSERT ON daily_reports REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION report_rollups_daily_reports();
+    CREATE TRIGGER trg_report_rollups_update
+        AFTER UPDATE ON daily_reports REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION report_rollups_daily_reports();
+    CREATE TRIGGER trg_report_rollups_delete
+        AFTER DELETE ON daily_reports REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION report_rollups_daily_reports();
+    
+    CREATE OR REPLACE FUNCTION report_rollups_employee_branch() RETURNS TRIGGER
+    LANGUAGE plpgsql
+    AS $$
+    DECLARE
+        employee_ids INTEGER[];
+        months DATE[];
+    BEGIN
+        IF NEW.branch_id IS NULL THEN
+            -- Employees without a branch have no rollups
+            DELETE FROM report_rollups WHERE employee_id = NEW.id;
+        ELSIF OLD.branch_id IS NULL THEN
+            SELECT array_agg(NEW.id ORDER BY month), array_agg(month ORDER BY month)
+            INTO employee_ids, months
+            FROM (SELECT DISTINCT date_trunc('month', report_date)::date AS month
+                  FROM daily_reports WHERE employee_id = NEW.id) touched;
+            IF employee_ids IS NOT NULL THEN
+                PERFORM refresh_report_rollups(employee_ids, months);
+            END IF;
+        ELSE
+            UPDATE report_rollups
+            SET branch_id = NEW.branch_id,
+                company_id = (SELECT company_id FROM branches WHERE id = NEW.branch_id)
+            WHERE employee_id = NEW.id;
+        END IF;
+        RETURN NULL;
+    END;
+    $$;
+    
+    CREATE TRIGGER trg_report_rollups_employee_branch
+        AFTER UPDATE OF branch_id ON employees
+        FOR EACH ROW
+        WHEN (OLD.branch_id IS DISTINCT FROM NEW.branch_id)
+        EXECUTE FUNCTION report_rollups_employee_branch();
+    
+    -- Initial rows; the migration runs before the app serves requests
+    INSERT INTO report_rollups
+        (employee_id, month, company_id, branch_id, report_count, first_date, last_date, total_chars)
+    SELECT dr.employee_id, date_trunc('month', dr.report_date)::date, b.company_id, e.branch_id,
+           COUNT(*), MIN(dr.report_date), MAX(dr.report_date), SUM(length(dr.report_text))
+    FROM daily_reports dr
+    JOIN employees e ON dr.employee_id = e.id
+    JOIN branches b ON e.branch_id = b.id
+    GROUP BY dr.employee_id, date_trunc('month', dr.report_date), b.company_id, e.branch_id;
+    '''))
@@ -1,4 +1,6 @@
 from sqlalchemy import text
+from database.cache import invalidates
+from database.models import employee_model, report_model
 
 class CompanyModel:
     """Company data operations"""
@@ -34,22 +36,36 @@ class CompanyModel:
         return result.fetchone()
     
     @staticmethod
+    @invalidates("companies", "roles")
     def add_company(conn, company_name, username, password, profile_pic_url):
-        """Add a new company to the database."""
+        """Add a new company to the database along with its default roles."""
         default_pic = "https://www.gravatar.com/avatar/00000000000000000000000000000000?d=mp&f=y"
         
-        conn.execute(text('''
+        result = conn.execute(text('''
         INSERT INTO companies (company_name, username, password, profile_pic_url, is_active)
         VALUES (:company_name, :username, :password, :profile_pic_url, TRUE)
+        RETURNING id
         '''), {
             'company_name': company_name,
             'username': username,
             'password': password,
             'profile_pic_url': profile_pic_url if profile_pic_url else default_pic
         })
+        company_id = result.fetchone()[0]
+        
+        # Default roles used to be seeded by init_db on every run; the schema
+        # is now migrated once, so seed them together with the company
+        conn.execute(text('''
+        INSERT INTO employee_roles (role_name, role_level, company_id)
+        VALUES ('Manager', 1, :company_id),
+               ('Asst. Manager', 2, :company_id),
+               ('General Employee', 3, :company_id)
+        ON CONFLICT (company_id, role_name) DO NOTHING
+        '''), {'company_id': company_id})
         conn.commit()
     
     @staticmethod
+    @invalidates("companies", "branches", "employees")
     def update_company_status(conn, company_id, is_active):
         """Activate or deactivate a company and all its branches and employees."""
         # Update company status
@@ -80,6 +96,7 @@ class CompanyModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("companies")
     def update_profile(conn, company_id, company_name, profile_pic_url):
         """Update company profile information."""
         conn.execute(text('''
@@ -177,6 +194,107 @@ class MessageModel:
                     {'id': message_id})
         conn.commit()
     
+    @staticmethod
+    def mark_conversation_read(conn, receiver_type, receiver_id, up_to_id, sender_type=None, sender_id=None):
+        """Mark every unread message to a receiver up to a message ID as read.
+        
+        Args:
+            conn: Database connection
+            receiver_type: 'admin' or 'company'
+            receiver_id: ID of the receiver (0 for admin)
+            up_to_id: Newest message ID the receiver has seen
+            sender_type: Optional sender type, to mark one sender's messages only
+            sender_id: Optional sender ID, used with sender_type
+        
+        Returns:
+            int: Number of messages marked as read
+        """
+        query = '''
+        UPDATE messages SET is_read = TRUE
+        WHERE receiver_type = :receiver_type AND receiver_id = :receiver_id
+          AND id <= :up_to_id AND is_read = FALSE
+        '''
+        params = {'receiver_type': receiver_type, 'receiver_id': receiver_id, 'up_to_id': up_to_id}
+        
+        if sender_type:
+            query += ' AND sender_type = :sender_type AND sender_id = :sender_id'
+            params.update({'sender_type': sender_type, 'sender_id': sender_id})
+        
+        result = conn.execute(text(query), params)
+        conn.commit()
+        return result.rowcount
+    
+    @staticmethod
+    def get_admin_messages_page(conn, before_id=None, limit=50):
+        """Get the latest messages to admin, newest first, one page at a time.
+        
+        Args:
+            conn: Database connection
+            before_id: Cursor returned with the previous page, None for the latest
+            limit: Maximum number of messages on the page
+        
+        Returns:
+            Tuple of (messages, cursor for older messages or None)
+        """
+        messages = conn.execute(text('''
+        SELECT m.id, m.sender_type, m.sender_id, m.message_text, m.is_read, m.created_at,
+               CASE WHEN m.sender_type = 'company' THEN c.company_name ELSE 'Admin' END as sender_name
+        FROM messages m
+        LEFT JOIN companies c ON m.sender_type = 'company' AND m.sender_id = c.id
+        WHERE m.receiver_type = 'admin' AND m.receiver_id = 0
+          AND m.id < COALESCE(:before_id, 2147483647)
+        ORDER BY m.id DESC
+        LIMIT :limit
+        '''), {'before_id': before_id, 'limit': limit + 1}).fetchall()
+        
+        if len(messages) <= limit:
+            return messages, None
+        messages = messages[:limit]
+        return messages, messages[-1][0]
+    
+    @staticmethod
+    def get_company_conversation(conn, company_id, before_id=None, limit=50):
+        """Get the latest messages to and from a company, newest first.
+        
+        Received and sent messages are read from their own indexes and
+        merged, instead of one OR predicate that neither index can serve.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            before_id: Cursor returned with the previous page, None for the latest
+            limit: Maximum number of messages on the page
+        
+        Returns:
+            Tuple of (messages, cursor for older messages or None)
+        """
+        messages = conn.execute(text('''
+        WITH conversation AS (
+            (SELECT * FROM messages
+             WHERE receiver_type = 'company' AND receiver_id = :company_id
+               AND id < COALESCE(:before_id, 2147483647)
+             ORDER BY id DESC
+             LIMIT :limit)
+            UNION ALL
+            (SELECT * FROM messages
+             WHERE sender_type = 'company' AND sender_id = :company_id
+               AND id < COALESCE(:before_id, 2147483647)
+             ORDER BY id DESC
+             LIMIT :limit)
+        )
+        SELECT m.id, m.sender_type, m.sender_id, m.message_text, m.is_read, m.created_at,
+               CASE WHEN m.sender_type = 'admin' THEN 'Admin' ELSE c.company_name END as sender_name
+        FROM conversation m
+        LEFT JOIN companies c ON m.sender_type = 'company' AND m.sender_id = c.id
+        ORDER BY m.id DESC
+        LIMIT :limit
+        '''), {'company_id': company_id, 'before_id': before_id, 'limit': limit + 1}).fetchall()
+        
+        if len(messages) <= limit:
+            return messages, None
+        messages = messages[:limit]
+        return messages, messages[-1][0]
+    
     @staticmethod
     def get_messages_for_admin(conn):
         """Get all messages for admin."""
@@ -247,6 +365,20 @@ class EmployeeModel:
         '''))
         return result.fetchall()
     
+    @staticmethod
+    def get_employees_page(conn, company_id=None, branch_id=None, role_level=None, after=None, limit=50):
+        """Get one page of employees (see employee_model.EmployeeModel.get_employees_page)."""
+        return employee_model.EmployeeModel.get_employees_page(
+            conn, company_id=company_id, branch_id=branch_id, role_level=role_level, after=after, limit=limit
+        )
+    
+    @staticmethod
+    def estimate_employee_count(conn, company_id=None, branch_id=None, role_level=None):
+        """Estimate how many employees match the filters (see employee_model.EmployeeModel)."""
+        return employee_model.EmployeeModel.estimate_employee_count(
+            conn, company_id=company_id, branch_id=branch_id, role_level=role_level
+        )
+    
     @staticmethod
     def get_employee_by_id(conn, employee_id):
         """Get employee data by ID."""
@@ -258,13 +390,29 @@ class EmployeeModel:
         return result.fetchone()
     
     @staticmethod
+    @invalidates("employees")
     def add_employee(conn, branch_id, username, password, full_name, profile_pic_url):
-        """Add a new employee to the database."""
+        """Add a new employee with their company's General Employee role.
+        
+        Raises:
+            ValueError: If the branch doesn't exist or its company has no
+                General Employee role
+        """
         default_pic = "https://www.gravatar.com/avatar/00000000000000000000000000000000?d=mp&f=y"
         
-        conn.execute(text('''
-        INSERT INTO employees (branch_id, username, password, full_name, profile_pic_url, is_active)
-        VALUES (:branch_id, :username, :password, :full_name, :profile_pic_url, TRUE)
+        # Employees without a role cannot log in
+        result = conn.execute(text('''
+        INSERT INTO employees (branch_id, role_id, username, password, full_name, profile_pic_url, is_active)
+        SELECT b.id, r.id, :username, :password, :full_name, :profile_pic_url, TRUE
+        FROM branches b
+        JOIN LATERAL (
+            SELECT id FROM employee_roles
+            WHERE company_id = b.company_id AND role_level = 3
+            ORDER BY id
+            LIMIT 1
+        ) r ON TRUE
+        WHERE b.id = :branch_id
+        RETURNING id
         '''), {
             'branch_id': branch_id,
             'username': username,
@@ -272,9 +420,14 @@ class EmployeeModel:
             'full_name': full_name,
             'profile_pic_url': profile_pic_url if profile_pic_url else default_pic
         })
+        
+        if result.fetchone() is None:
+            conn.rollback()
+            raise ValueError("The branch doesn't exist or its company has no General Employee role")
         conn.commit()
     
     @staticmethod
+    @invalidates("employees")
     def update_employee_status(conn, employee_id, is_active):
         """Activate or deactivate an employee."""
         conn.execute(text('UPDATE employees SET is_active = :is_active WHERE id = :id'), 
@@ -289,6 +442,7 @@ class EmployeeModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("employees")
     def update_profile(conn, employee_id, full_name, profile_pic_url):
         """Update employee profile information."""
         conn.execute(text('''
@@ -349,32 +503,43 @@ class ReportModel:
         result = conn.execute(text(query), params)
         return result.fetchall()
     
+    @staticmethod
+    def get_reports_version(conn, start_date, end_date, employee_name=None):
+        """Get the data version of get_all_reports' rows, for cache keys.
+        
+        Returns (report count, sum of row xmins, employee version sum);
+        any added, removed or edited report, or a renamed employee,
+        changes it.
+        """
+        query = '''
+        SELECT COUNT(*), SUM(dr.xmin::text::bigint), SUM(e.version)
+        FROM daily_reports dr
+        JOIN employees e ON dr.employee_id = e.id
+        WHERE dr.report_date BETWEEN :start_date AND :end_date
+        '''
+        
+        params = {'start_date': start_date, 'end_date': end_date}
+        
+        if employee_name and employee_name != "All Employees":
+            query += ' AND e.full_name = :employee_name'
+            params['employee_name'] = employee_name
+        
+        return tuple(conn.execute(text(query), params).fetchone())
+    
     @staticmethod
     def add_report(conn, employee_id, report_date, report_text):
-        """Add a new report."""
-        conn.execute(text('''
-        INSERT INTO daily_reports (employee_id, report_date, report_text)
-        VALUES (:employee_id, :report_date, :report_text)
-        '''), {
-            'employee_id': employee_id,
-            'report_date': report_date,
-            'report_text': report_text
-        })
-        conn.commit()
+        """Add a new report (see report_model.ReportModel.add_report)."""
+        report_model.ReportModel.add_report(conn, employee_id, report_date, report_text)
     
     @staticmethod
     def update_report(conn, report_id, report_date, report_text):
-        """Update an existing report."""
-        conn.execute(text('''
-        UPDATE daily_reports 
-        SET report_text = :report_text, report_date = :report_date, created_at = CURRENT_TIMESTAMP
-        WHERE id = :id
-        '''), {
-            'report_text': report_text,
-            'report_date': report_date,
-            'id': report_id
-        })
-        conn.commit()
+        """Update an existing report (see report_model.ReportModel.update_report)."""
+        report_model.ReportModel.update_report(conn, report_id, report_date, report_text)
+    
+    @staticmethod
+    def upsert_report(conn, employee_id, report_date, report_text):
+        """Create or replace a report for a date; returns (id, inserted)."""
+        return report_model.ReportModel.upsert_report(conn, employee_id, report_date, report_text)
     
     @staticmethod
     def check_report_exists(conn, employee_id, report_date):
@@ -1,9 +1,59 @@
+from typing import NamedTuple
 from sqlalchemy import text
+from database.cache import cached_query, invalidates
+
+# Recursive CTE walking down from :branch_id. "path" guards against cycles
+# in existing data; "name_path" orders the tree depth first by name.
+SUBTREE_CTE = '''
+subtree AS (
+    SELECT id, branch_name, parent_branch_id, is_active, 0 AS depth,
+           ARRAY[id] AS path, ARRAY[branch_name]::VARCHAR[] AS name_path
+    FROM branches
+    WHERE id = :branch_id
+    UNION ALL
+    SELECT b.id, b.branch_name, b.parent_branch_id, b.is_active, s.depth + 1,
+           s.path || b.id, s.name_path || b.branch_name
+    FROM subtree s
+    JOIN branches b ON b.parent_branch_id = s.id
+    WHERE NOT b.id = ANY(s.path)
+)
+'''
+
+# Figures of a single branch "s", before rolling up. Tasks assigned to an
+# employee count towards the employee's branch.
+OWN_FIGURES_SQL = '''
+SELECT (SELECT COUNT(*) FROM employees e
+        WHERE e.branch_id = s.id AND e.is_active = TRUE) AS employees,
+       (SELECT COUNT(*) FROM tasks t
+        WHERE t.branch_id = s.id AND t.is_completed = FALSE)
+       + (SELECT COUNT(*) FROM tasks t
+          JOIN employees e ON t.employee_id = e.id
+          WHERE e.branch_id = s.id AND t.branch_id IS NULL AND t.is_completed = FALSE) AS pending_tasks,
+       (SELECT COUNT(*) FROM daily_reports dr
+        JOIN employees e ON dr.employee_id = e.id
+        WHERE e.branch_id = s.id AND e.is_active = TRUE
+          AND dr.report_date = :report_date) AS reports_submitted
+'''
+
+class BranchRollup(NamedTuple):
+    """Figures of a branch together with every branch below it"""
+    branches: int
+    employees: int               # active employees
+    pending_tasks: int
+    reports_submitted: int       # active employees who reported on the day
+    
+    @property
+    def report_compliance(self):
+        """Percentage of active employees who reported, rounded to a whole number."""
+        if not self.employees:
+            return 0
+        return round((self.reports_submitted / self.employees) * 100)
 
 class BranchModel:
     """Branch data operations"""
     
     @staticmethod
+    @cached_query("branches", "companies")
     def get_all_branches(conn):
         """Get all branches with company information."""
         result = conn.execute(text('''
@@ -18,6 +68,7 @@ class BranchModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("branches")
     def get_company_branches(conn, company_id):
         """Get all branches for a specific company."""
         result = conn.execute(text('''
@@ -32,6 +83,7 @@ class BranchModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("branches")
     def get_branch_by_id(conn, branch_id):
         """Get branch details by ID."""
         result = conn.execute(text('''
@@ -45,6 +97,7 @@ class BranchModel:
         return result.fetchone()
     
     @staticmethod
+    @cached_query("branches")
     def get_parent_branches(conn, company_id, exclude_branch_id=None):
         """Get all possible parent branches for a company (for creating sub-branches)."""
         query = '''
@@ -65,6 +118,137 @@ class BranchModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("branches")
+    def get_subtree(conn, branch_id):
+        """Get a branch and every branch below it, at any depth.
+        
+        Args:
+            conn: Database connection
+            branch_id: ID of the subtree's root branch
+        
+        Returns:
+            List of (id, branch_name, parent_branch_id, depth, is_active),
+            depth first with siblings in name order; the root has depth 0
+        """
+        result = conn.execute(text(f'''
+        WITH RECURSIVE {SUBTREE_CTE}
+        SELECT id, branch_name, parent_branch_id, depth, is_active
+        FROM subtree
+        ORDER BY name_path
+        '''), {'branch_id': branch_id})
+        return result.fetchall()
+    
+    @staticmethod
+    @cached_query("branches")
+    def get_ancestors(conn, branch_id):
+        """Get the chain of parent branches above a branch.
+        
+        Args:
+            conn: Database connection
+            branch_id: ID of the branch
+        
+        Returns:
+            List of (id, branch_name) from the top-level branch down to the
+            branch's direct parent; empty for a top-level branch
+        """
+        result = conn.execute(text('''
+        WITH RECURSIVE ancestors AS (
+            SELECT p.id, p.branch_name, p.parent_branch_id, 1 AS height, ARRAY[b.id, p.id] AS path
+            FROM branches b
+            JOIN branches p ON b.parent_branch_id = p.id
+            WHERE b.id = :branch_id
+            UNION ALL
+            SELECT p.id, p.branch_name, p.parent_branch_id, a.height + 1, a.path || p.id
+            FROM ancestors a
+            JOIN branches p ON a.parent_branch_id = p.id
+            WHERE NOT p.id = ANY(a.path)
+        )
+        SELECT id, branch_name
+        FROM ancestors
+        ORDER BY height DESC
+        '''), {'branch_id': branch_id})
+        return result.fetchall()
+    
+    @staticmethod
+    def get_subtree_rollup(conn, branch_id, report_date):
+        """Roll employee, task and report figures up over a branch's subtree.
+        
+        Args:
+            conn: Database connection
+            branch_id: ID of the subtree's root branch
+            report_date: Day whose report compliance is measured
+        
+        Returns:
+            BranchRollup
+        """
+        row = conn.execute(text(f'''
+        WITH RECURSIVE {SUBTREE_CTE}
+        SELECT COUNT(*),
+               COALESCE(SUM(own.employees), 0),
+               COALESCE(SUM(own.pending_tasks), 0),
+               COALESCE(SUM(own.reports_submitted), 0)
+        FROM subtree s
+        CROSS JOIN LATERAL ({OWN_FIGURES_SQL}) own
+        '''), {'branch_id': branch_id, 'report_date': report_date}).fetchone()
+        
+        return BranchRollup(branches=row[0], employees=int(row[1]), pending_tasks=int(row[2]),
+                            reports_submitted=int(row[3]))
+    
+    @staticmethod
+    def get_company_tree(conn, company_id, report_date):
+        """Get a company's branch tree with figures rolled up per subtree.
+        
+        Every branch comes with the totals of itself and all branches below
+        it, so each level of the tree can be shown without further queries.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            report_date: Day whose report compliance is measured
+        
+        Returns:
+            List of (id, branch_name, location, branch_head, is_active,
+            is_main_branch, parent_branch_id, depth, ancestor names,
+            BranchRollup), depth first with siblings in name order
+        """
+        result = conn.execute(text(f'''
+        WITH RECURSIVE tree AS (
+            SELECT id, parent_branch_id, 0 AS depth, ARRAY[id] AS path,
+                   ARRAY[]::VARCHAR[] AS ancestor_names, ARRAY[branch_name]::VARCHAR[] AS name_path
+            FROM branches
+            WHERE company_id = :company_id AND parent_branch_id IS NULL
+            UNION ALL
+            SELECT b.id, b.parent_branch_id, t.depth + 1, t.path || b.id,
+                   t.name_path, t.name_path || b.branch_name
+            FROM tree t
+            JOIN branches b ON b.parent_branch_id = t.id
+            WHERE NOT b.id = ANY(t.path)
+        ),
+        -- Materialized so each branch's figures are computed once, not once
+        -- per ancestor they roll up into
+        own AS MATERIALIZED (
+            SELECT s.id, s.path, figures.*
+            FROM tree s
+            CROSS JOIN LATERAL ({OWN_FIGURES_SQL}) figures
+        )
+        SELECT b.id, b.branch_name, b.location, b.branch_head, b.is_active,
+               b.is_main_branch, b.parent_branch_id, t.depth, t.ancestor_names,
+               COUNT(*), SUM(d.employees), SUM(d.pending_tasks), SUM(d.reports_submitted)
+        FROM tree t
+        JOIN branches b ON b.id = t.id
+        JOIN own d ON t.id = ANY(d.path)
+        GROUP BY b.id, t.depth, t.ancestor_names, t.name_path
+        ORDER BY t.name_path
+        '''), {'company_id': company_id, 'report_date': report_date})
+        
+        return [
+            tuple(row[:9]) + (BranchRollup(branches=row[9], employees=int(row[10]),
+                                           pending_tasks=int(row[11]), reports_submitted=int(row[12])),)
+            for row in result.fetchall()
+        ]
+    
+    @staticmethod
+    @cached_query("branches", "companies")
     def get_active_branches(conn, company_id=None):
         """Get all active branches, optionally filtered by company."""
         query = '''
@@ -85,6 +269,7 @@ class BranchModel:
         return result.fetchall()
     
     @staticmethod
+    @invalidates("branches")
     def create_main_branch(conn, company_id, branch_name, location, branch_head):
         """Create a main branch for a company."""
         conn.execute(text('''
@@ -99,6 +284,7 @@ class BranchModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("branches")
     def create_sub_branch(conn, company_id, parent_branch_id, branch_name, location, branch_head):
         """Create a sub-branch under a parent branch."""
         conn.execute(text('''
@@ -114,8 +300,18 @@ class BranchModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("branches")
     def update_branch(conn, branch_id, branch_name, location, branch_head, parent_branch_id=None):
-        """Update branch details."""
+        """Update branch details.
+        
+        A sub-branch can be moved under another branch of the same company,
+        but not under itself or one of its own descendants. The company's
+        branches are locked while the move is checked, so two concurrent
+        moves can't combine into a cycle.
+        
+        Raises:
+            ValueError: If the new parent would break the hierarchy
+        """
         query = '''
         UPDATE branches 
         SET branch_name = :branch_name, location = :location, branch_head = :branch_head
@@ -128,22 +324,36 @@ class BranchModel:
             'branch_head': branch_head
         }
         
-        # Only update parent_branch_id if provided and branch is not a main branch
-        if parent_branch_id is not None:
-            result = conn.execute(text('SELECT is_main_branch FROM branches WHERE id = :branch_id'), 
-                                 {'branch_id': branch_id})
-            is_main_branch = result.fetchone()[0]
+        with conn.begin():
+            # Only update parent_branch_id if provided and branch is not a main branch
+            if parent_branch_id is not None:
+                result = conn.execute(text('''
+                SELECT id, company_id, is_main_branch
+                FROM branches
+                WHERE company_id = (SELECT company_id FROM branches WHERE id = :branch_id)
+                ORDER BY id
+                FOR UPDATE
+                '''), {'branch_id': branch_id})
+                company_branches = {row[0]: row for row in result.fetchall()}
+                is_main_branch = company_branches[branch_id][2]
+                
+                if not is_main_branch:
+                    if parent_branch_id not in company_branches:
+                        raise ValueError("The parent branch must belong to the same company")
+                    
+                    subtree_ids = {row[0] for row in BranchModel.get_subtree.uncached(conn, branch_id)}
+                    if parent_branch_id in subtree_ids:
+                        raise ValueError("A branch can't be moved under itself or one of its sub-branches")
+                    
+                    query += ', parent_branch_id = :parent_branch_id'
+                    params['parent_branch_id'] = parent_branch_id
             
-            if not is_main_branch:
-                query += ', parent_branch_id = :parent_branch_id'
-                params['parent_branch_id'] = parent_branch_id
-        
-        query += ' WHERE id = :branch_id'
-        
-        conn.execute(text(query), params)
-        conn.commit()
+            query += ' WHERE id = :branch_id'
+            
+            conn.execute(text(query), params)
     
     @staticmethod
+    @invalidates("branches", "employees")
     def update_branch_status(conn, branch_id, is_active):
         """Update branch active status and update related employees status too."""
         with conn.begin():
@@ -162,6 +372,7 @@ class BranchModel:
             '''), {'branch_id': branch_id, 'is_active': is_active})
         
     @staticmethod
+    @cached_query("employees", "roles")
     def get_branch_employees(conn, branch_id):
         """Get all employees for a specific branch."""
         result = conn.execute(text('''
@@ -174,6 +385,7 @@ class BranchModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("branches", "employees")
     def get_employee_count_by_branch(conn, company_id):
         """Get employee count for each branch of a company."""
         result = conn.execute(text('''
@@ -187,6 +399,7 @@ class BranchModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("branches")
     def get_subbranches(conn, parent_branch_id):
         """Get all sub-branches of a branch."""
         result = conn.execute(text('''
@@ -0,0 +1,113 @@
+import datetime
+from typing import NamedTuple
+from sqlalchemy import text
+
+class CompanyOverview(NamedTuple):
+    """Aggregates shown on the company dashboard overview"""
+    total_branches: int
+    main_branches: int
+    sub_branches: int
+    total_employees: int
+    employees_by_role: list      # (role_name, count) ordered by role level; role-less employees aren't listed
+    unread_messages: int
+    active_tasks: int
+    branch_tasks_completed: int
+    branch_tasks_total: int
+    recent_reports: list         # (full_name, report_date, report_text, branch_name)
+    
+    @property
+    def branch_task_completion(self):
+        """Percentage of branch tasks completed, rounded to a whole number."""
+        if not self.branch_tasks_total:
+            return 0
+        return round((self.branch_tasks_completed / self.branch_tasks_total) * 100)
+
+class CompanyStatsModel:
+    """Company-wide aggregate queries"""
+    
+    @staticmethod
+    def get_overview(conn, company_id, recent_report_limit=5):
+        """Get all dashboard overview figures for a company in one query.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            recent_report_limit: Number of recent reports to include
+        
+        Returns:
+            CompanyOverview
+        """
+        row = conn.execute(text('''
+        WITH branch_stats AS (
+            SELECT COUNT(*) FILTER (WHERE is_active) AS total,
+                   COUNT(*) FILTER (WHERE is_active AND is_main_branch) AS main,
+                   COUNT(*) FILTER (WHERE is_active AND NOT is_main_branch) AS sub
+            FROM branches
+            WHERE company_id = :company_id
+        ),
+        employee_stats AS (
+            -- Counted directly, so employees without a role are included
+            SELECT COUNT(*) FILTER (WHERE e.is_active) AS active
+            FROM employees e
+            JOIN branches b ON e.branch_id = b.id
+            WHERE b.company_id = :company_id
+        ),
+        role_counts AS (
+            SELECT r.role_name, MIN(r.role_level) AS role_level, COUNT(*) AS employees
+            FROM employees e
+            JOIN branches b ON e.branch_id = b.id
+            JOIN employee_roles r ON e.role_id = r.id
+            WHERE b.company_id = :company_id AND e.is_active = TRUE
+            GROUP BY r.role_name
+        ),
+        task_stats AS (
+            SELECT COUNT(*) FILTER (WHERE NOT is_completed) AS active,
+                   COUNT(*) FILTER (WHERE branch_id IS NOT NULL AND is_completed) AS branch_completed,
+                   COUNT(*) FILTER (WHERE branch_id IS NOT NULL) AS branch_total
+            FROM tasks
+            WHERE company_id = :company_id
+        ),
+        recent AS (
+            -- Newest few per employee first, so large companies don't sort
+            -- their whole report history
+            SELECT e.full_name, dr.report_date, dr.report_text, b.branch_name, dr.created_at
+            FROM branches b
+            JOIN employees e ON e.branch_id = b.id
+            CROSS JOIN LATERAL (
+                SELECT report_date, report_text, created_at
+                FROM daily_reports
+                WHERE employee_id = e.id
+                ORDER BY created_at DESC
+                LIMIT :recent_limit
+            ) dr
+            WHERE b.company_id = :company_id
+            ORDER BY dr.created_at DESC
+            LIMIT :recent_limit
+        )
+        SELECT bs.total, bs.main, bs.sub, es.active,
+               (SELECT COALESCE(json_agg(json_build_array(role_name, employees) ORDER BY role_level), '[]')
+                FROM role_counts),
+               (SELECT COUNT(*) FROM messages
+                WHERE receiver_type = 'company' AND receiver_id = :company_id AND is_read = FALSE),
+               ts.active, ts.branch_completed, ts.branch_total,
+               (SELECT COALESCE(json_agg(json_build_array(full_name, report_date, report_text, branch_name)
+                                 ORDER BY created_at DESC), '[]')
+                FROM recent)
+        FROM branch_stats bs, employee_stats es, task_stats ts
+        '''), {'company_id': company_id, 'recent_limit': recent_report_limit}).fetchone()
+        
+        return CompanyOverview(
+            total_branches=row[0],
+            main_branches=row[1],
+            sub_branches=row[2],
+            total_employees=int(row[3]),
+            employees_by_role=[tuple(role) for role in row[4]],
+            unread_messages=row[5],
+            active_tasks=row[6],
+            branch_tasks_completed=row[7],
+            branch_tasks_total=row[8],
+            recent_reports=[
+                (name, datetime.date.fromisoformat(report_date), report_text, branch_name)
+                for name, report_date, report_text, branch_name in row[9]
+            ]
+        )
@@ -1,9 +1,51 @@
+import csv
+import json
+from typing import NamedTuple
 from sqlalchemy import text
+from database.cache import cached_query, invalidates
+
+DEFAULT_PROFILE_PIC = "https://www.gravatar.com/avatar/00000000000000000000000000000000?d=mp&f=y"
+
+# Columns of an employee import CSV, with the header names accepted for
+# each (the first one is shown in messages)
+IMPORT_COLUMNS = {
+    'full_name': ('full_name', 'name'),
+    'username': ('username',),
+    'password': ('password',),
+    'branch_name': ('branch', 'branch_name'),
+    'role_name': ('role', 'role_name'),
+    'profile_pic_url': ('profile_pic_url', 'profile_picture_url', 'profile_pic')
+}
+OPTIONAL_IMPORT_COLUMNS = {'profile_pic_url'}
+
+class ImportResult(NamedTuple):
+    """Outcome of EmployeeModel.import_employees"""
+    created: int             # 0 whenever there are errors
+    errors: list             # (row number in the file, username, list of messages) per invalid row
+
+# Sort position of employees without a role, after every role level
+NO_ROLE_SORT_LEVEL = 99
+
+def _employee_filters(company_id, branch_id, role_level):
+    """Build the WHERE conditions shared by the paged employee queries."""
+    conditions = []
+    params = {}
+    if company_id:
+        conditions.append('b.company_id = :company_id')
+        params['company_id'] = company_id
+    if branch_id:
+        conditions.append('e.branch_id = :branch_id')
+        params['branch_id'] = branch_id
+    if role_level:
+        conditions.append('r.role_level = :role_level')
+        params['role_level'] = role_level
+    return conditions, params
 
 class EmployeeModel:
     """Employee data operations"""
     
     @staticmethod
+    @cached_query("employees", "branches", "companies", "roles")
     def get_all_employees(conn, company_id=None):
         """Get all employees with optional company filter.
         
@@ -34,6 +76,7 @@ class EmployeeModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("employees", "roles")
     def get_branch_employees(conn, branch_id):
         """Get all employees for a specific branch.
         
@@ -55,6 +98,7 @@ class EmployeeModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("employees", "branches", "companies", "roles")
     def get_active_employees(conn, company_id=None, branch_id=None, role_level=None):
         """Get active employees with optional filters.
         
@@ -97,6 +141,96 @@ class EmployeeModel:
         result = conn.execute(text(query), params)
         return result.fetchall()
     
+    @staticmethod
+    @cached_query("employees", "branches", "companies", "roles")
+    def get_employees_page(conn, company_id=None, branch_id=None, role_level=None, after=None, limit=50):
+        """Get one page of employees using keyset pagination.
+        
+        Employees are ordered by company name, branch name, role level
+        (employees without a role last), full name and id. The next page
+        starts after the sort key of the last row, so only one page is
+        read and sent however deep it is. The key spans the joined tables,
+        so each page still top-N sorts every employee matching the filters
+        (one company or branch on the company and employee pages).
+        
+        Args:
+            conn: Database connection
+            company_id: Optional company ID filter
+            branch_id: Optional branch ID filter
+            role_level: Optional role level filter
+            after: Cursor returned with the previous page, None for the first
+            limit: Maximum number of employees on the page
+        
+        Returns:
+            Tuple of (employees with branch and role info, cursor for the
+            next page or None if this is the last page)
+        """
+        conditions, params = _employee_filters(company_id, branch_id, role_level)
+        sort_level = f'COALESCE(r.role_level, {NO_ROLE_SORT_LEVEL})'
+        if after:
+            conditions.append(f'(c.company_name, b.branch_name, {sort_level}, e.full_name, e.id) '
+                              '> (:after_company, :after_branch, :after_level, :after_name, :after_id)')
+            params.update(zip(('after_company', 'after_branch', 'after_level', 'after_name', 'after_id'), after))
+        
+        query = '''
+        SELECT e.id, e.username, e.full_name, e.profile_pic_url, e.is_active,
+               b.branch_name, c.company_name, r.role_name, r.role_level, b.id as branch_id
+        FROM employees e
+        JOIN branches b ON e.branch_id = b.id
+        JOIN companies c ON b.company_id = c.id
+        LEFT JOIN employee_roles r ON e.role_id = r.id
+        '''
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        
+        # One extra row tells whether there is a next page
+        query += f' ORDER BY c.company_name, b.branch_name, {sort_level}, e.full_name, e.id LIMIT :limit'
+        params['limit'] = limit + 1
+        
+        employees = conn.execute(text(query), params).fetchall()
+        if len(employees) <= limit:
+            return employees, None
+        
+        employees = employees[:limit]
+        last = employees[-1]
+        last_level = last[8] if last[8] is not None else NO_ROLE_SORT_LEVEL
+        return employees, (last[6], last[5], last_level, last[2], last[0])
+    
+    @staticmethod
+    @cached_query("employees", "branches", "companies", "roles")
+    def estimate_employee_count(conn, company_id=None, branch_id=None, role_level=None):
+        """Estimate how many employees match the filters.
+        
+        Reads the planner's row estimate instead of counting, so the cost
+        doesn't grow with the number of employees. Accurate to within the
+        table statistics, which autovacuum keeps current.
+        
+        Args:
+            conn: Database connection
+            company_id: Optional company ID filter
+            branch_id: Optional branch ID filter
+            role_level: Optional role level filter
+        
+        Returns:
+            int: Estimated number of employees
+        """
+        conditions, params = _employee_filters(company_id, branch_id, role_level)
+        query = '''
+        EXPLAIN (FORMAT JSON)
+        SELECT 1
+        FROM employees e
+        JOIN branches b ON e.branch_id = b.id
+        JOIN companies c ON b.company_id = c.id
+        LEFT JOIN employee_roles r ON e.role_id = r.id
+        '''
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        
+        plan = conn.execute(text(query), params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    
     @staticmethod
     def get_employee_by_id(conn, employee_id):
         """Get detailed employee data by ID.
@@ -121,6 +255,7 @@ class EmployeeModel:
         return result.fetchone()
     
     @staticmethod
+    @invalidates("employees")
     def add_employee(conn, branch_id, role_id, username, password, full_name, profile_pic_url):
         """Add a new employee.
         
@@ -133,8 +268,6 @@ class EmployeeModel:
             full_name: Full name of employee
             profile_pic_url: URL to profile picture
         """
-        default_pic = "https://www.gravatar.com/avatar/00000000000000000000000000000000?d=mp&f=y"
-        
         conn.execute(text('''
         INSERT INTO employees (branch_id, role_id, username, password, full_name, profile_pic_url, is_active)
         VALUES (:branch_id, :role_id, :username, :password, :full_name, :profile_pic_url, TRUE)
@@ -144,11 +277,12 @@ class EmployeeModel:
             'username': username,
             'password': password,
             'full_name': full_name,
-            'profile_pic_url': profile_pic_url if profile_pic_url else default_pic
+            'profile_pic_url': profile_pic_url if profile_pic_url else DEFAULT_PROFILE_PIC
         })
         conn.commit()
     
     @staticmethod
+    @invalidates("employees")
     def update_employee_status(conn, employee_id, is_active):
         """Activate or deactivate an employee.
         
@@ -162,6 +296,7 @@ class EmployeeModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("employees")
     def update_employee_role(conn, employee_id, role_id):
         """Update employee's role.
         
@@ -181,6 +316,7 @@ class EmployeeModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("employees")
     def update_employee_branch(conn, employee_id, branch_id):
         """Transfer employee to different branch.
         
@@ -213,6 +349,7 @@ class EmployeeModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("employees")
     def update_profile(conn, employee_id, full_name, profile_pic_url):
         """Update employee profile information.
         
@@ -251,3 +388,115 @@ class EmployeeModel:
         WHERE id = :employee_id AND password = :current_password
         '''), {'employee_id': employee_id, 'current_password': current_password})
         return result.fetchone()[0] > 0
+    
+    @staticmethod
+    @invalidates("employees")
+    def import_employees(conn, company_id, csv_file):
+        """Create employees in bulk from a CSV file, all or nothing.
+        
+        The file is loaded with COPY into a temporary staging table. Branch
+        and role names are resolved against the company's active branches
+        and roles, and every row is checked (required fields, lengths,
+        usernames taken by any account or repeated in the file) in one
+        set-based query. Only when no row has an error are the employees
+        inserted, with one INSERT ... SELECT; otherwise nothing is written.
+        
+        The header line names the columns, in any order: full_name,
+        username, password, branch (or branch_name), role (or role_name)
+        and optionally profile_pic_url.
+        
+        Args:
+            conn: Database connection (not inside a transaction)
+            company_id: ID of the company the employees join
+            csv_file: Binary file object with UTF-8 CSV, positioned at the start
+        
+        Returns:
+            ImportResult
+        
+        Raises:
+            ValueError: If the header is missing required columns or has unknown ones
+        """
+        header = csv_file.readline().decode('utf-8-sig')
+        csv_file.seek(0)
+        
+        aliases = {alias: column for column, names in IMPORT_COLUMNS.items() for alias in names}
+        columns = []
+        for name in next(csv.reader([header]), []):
+            key = name.strip().lower().replace(' ', '_')
+            if key not in aliases:
+                raise ValueError(f"Unknown column '{name.strip()}'")
+            columns.append(aliases[key])
+        
+        missing = [names[0] for column, names in IMPORT_COLUMNS.items()
+                   if column not in columns and column not in OPTIONAL_IMPORT_COLUMNS]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        if len(set(columns)) < len(columns):
+            raise ValueError("A column appears more than once in the header")
+        
+        with conn.begin():
+            # Rows are numbered as a spreadsheet shows them, the header being row 1
+            conn.execute(text('''
+            CREATE TEMPORARY TABLE employee_import (
+                row_number INTEGER GENERATED ALWAYS AS IDENTITY (START WITH 2),
+                full_name TEXT,
+                username TEXT,
+                password TEXT,
+                branch_name TEXT,
+                role_name TEXT,
+                profile_pic_url TEXT
+            ) ON COMMIT DROP
+            '''))
+            
+            # COPY through the connection's own cursor, inside the same transaction
+            with conn.connection.dbapi_connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f"COPY employee_import ({', '.join(columns)}) FROM STDIN "
+                    "WITH (FORMAT csv, HEADER true, ENCODING 'UTF8')",
+                    csv_file
+                )
+            
+            invalid = conn.execute(text('''
+            WITH checked AS (
+                SELECT s.row_number, s.username, ARRAY[
+                    CASE WHEN COALESCE(btrim(s.full_name), '') = '' THEN 'Full name is required'
+                         WHEN length(btrim(s.full_name)) > 100 THEN 'Full name is longer than 100 characters' END,
+                    CASE WHEN COALESCE(btrim(s.username), '') = '' THEN 'Username is required'
+                         WHEN length(btrim(s.username)) > 50 THEN 'Username is longer than 50 characters'
+                         WHEN EXISTS (SELECT 1 FROM employees e WHERE e.username = btrim(s.username))
+                              OR EXISTS (SELECT 1 FROM companies c WHERE c.username = btrim(s.username))
+                             THEN 'Username already exists'
+                         WHEN COUNT(*) OVER (PARTITION BY btrim(s.username)) > 1
+                             THEN 'Username appears more than once in the file' END,
+                    CASE WHEN COALESCE(s.password, '') = '' THEN 'Password is required'
+                         WHEN length(s.password) > 255 THEN 'Password is longer than 255 characters' END,
+                    CASE WHEN COALESCE(btrim(s.branch_name), '') = '' THEN 'Branch is required'
+                         WHEN b.id IS NULL THEN 'Unknown or inactive branch "' || btrim(s.branch_name) || '"' END,
+                    CASE WHEN COALESCE(btrim(s.role_name), '') = '' THEN 'Role is required'
+                         WHEN r.id IS NULL THEN 'Unknown role "' || btrim(s.role_name) || '"' END
+                ] AS errors
+                FROM employee_import s
+                LEFT JOIN branches b ON b.company_id = :company_id AND b.is_active = TRUE
+                    AND b.branch_name = btrim(s.branch_name)
+                LEFT JOIN employee_roles r ON r.company_id = :company_id AND r.role_name = btrim(s.role_name)
+            )
+            SELECT row_number, username, array_remove(errors, NULL)
+            FROM checked
+            WHERE array_remove(errors, NULL) <> '{}'
+            ORDER BY row_number
+            '''), {'company_id': company_id}).fetchall()
+            
+            if invalid:
+                return ImportResult(0, [tuple(row) for row in invalid])
+            
+            created = conn.execute(text('''
+            INSERT INTO employees (branch_id, role_id, username, password, full_name, profile_pic_url, is_active)
+            SELECT b.id, r.id, btrim(s.username), s.password, btrim(s.full_name),
+                   COALESCE(NULLIF(btrim(s.profile_pic_url), ''), :default_pic), TRUE
+            FROM employee_import s
+            JOIN branches b ON b.company_id = :company_id AND b.branch_name = btrim(s.branch_name)
+            JOIN employee_roles r ON r.company_id = :company_id AND r.role_name = btrim(s.role_name)
+            ORDER BY s.row_number
+            '''), {'company_id': company_id, 'default_pic': DEFAULT_PROFILE_PIC}).rowcount
+        
+        return ImportResult(created, [])
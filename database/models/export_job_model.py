@@ -0,0 +1,272 @@
+import json
+from typing import NamedTuple
+from sqlalchemy import text
+
+# Arbitrary application-wide key for the export job advisory locks
+EXPORT_JOBS_LOCK_KEY = 724190512
+
+class ExportJob(NamedTuple):
+    """A requested background export (see migration 0011)"""
+    id: int
+    company_id: int
+    company_name: str
+    kind: str
+    params: dict
+    title: str
+    status: str          # queued, running, done or failed
+    file_path: str
+    file_size: int
+    error: str
+    created_at: object
+    started_at: object
+    finished_at: object
+
+_JOB_COLUMNS = '''
+    j.id, j.company_id, c.company_name, j.kind, j.params, j.title, j.status,
+    j.file_path, j.file_size, j.error, j.created_at, j.started_at, j.finished_at
+'''
+
+class ExportJobModel:
+    """Export job queue operations"""
+    
+    @staticmethod
+    def create_job(conn, company_id, requested_by_type, requested_by_id, kind, params, title,
+                   max_active_per_company):
+        """Queue an export job, within the company's limit of unfinished jobs.
+        
+        Args:
+            conn: Database connection
+            company_id: Company the export belongs to (None for admin-wide exports)
+            requested_by_type: 'admin', 'company' or 'employee'
+            requested_by_id: ID of the requester
+            kind: What to render, e.g. 'company' or 'branch'
+            params: JSON-serializable render parameters (dates become ISO strings)
+            title: Human readable description of the export
+            max_active_per_company: Most queued or running jobs a company may have
+        
+        Returns:
+            int: ID of the new job
+        
+        Raises:
+            ValueError: If the company already has too many unfinished jobs
+        """
+        with conn.begin():
+            # Serialize submissions per company so the limit can't be overrun
+            conn.execute(text('SELECT pg_advisory_xact_lock(:key, :company_id)'),
+                         {'key': EXPORT_JOBS_LOCK_KEY, 'company_id': company_id or 0})
+            
+            active = conn.execute(text('''
+            SELECT COUNT(*) FROM export_jobs
+            WHERE company_id IS NOT DISTINCT FROM :company_id
+              AND status IN ('queued', 'running')
+            '''), {'company_id': company_id}).scalar()
+            
+            if active >= max_active_per_company:
+                raise ValueError(
+                    f"There are already {active} exports queued or running; "
+                    f"wait for one to finish before starting another."
+                )
+            
+            return conn.execute(text('''
+            INSERT INTO export_jobs (company_id, requested_by_type, requested_by_id, kind, params, title)
+            VALUES (:company_id, :requested_by_type, :requested_by_id, :kind, CAST(:params AS JSONB), :title)
+            RETURNING id
+            '''), {
+                'company_id': company_id,
+                'requested_by_type': requested_by_type,
+                'requested_by_id': requested_by_id,
+                'kind': kind,
+                'params': json.dumps(params, default=str),
+                'title': title
+            }).scalar()
+    
+    @staticmethod
+    def claim_jobs(conn, slots, per_company):
+        """Move the oldest claimable queued jobs to running.
+        
+        A job is claimable while its company has fewer than per_company
+        jobs running, counting the ones claimed in the same call. Claims
+        are serialized across processes with an advisory lock.
+        
+        Args:
+            conn: Database connection
+            slots: Most jobs to claim
+            per_company: Most jobs a company may have running at once
+        
+        Returns:
+            List of ExportJob
+        """
+        if slots <= 0:
+            return []
+        
+        with conn.begin():
+            conn.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': EXPORT_JOBS_LOCK_KEY})
+            
+            claimed = conn.execute(text('''
+            WITH running AS (
+                SELECT company_id, COUNT(*) AS jobs
+                FROM export_jobs
+                WHERE status = 'running'
+                GROUP BY company_id
+            ),
+            candidates AS (
+                SELECT q.id,
+                       COALESCE(r.jobs, 0)
+                           + ROW_NUMBER() OVER (PARTITION BY q.company_id ORDER BY q.id) AS would_run
+                FROM export_jobs q
+                LEFT JOIN running r ON r.company_id IS NOT DISTINCT FROM q.company_id
+                WHERE q.status = 'queued'
+            )
+            UPDATE export_jobs
+            SET status = 'running', started_at = CURRENT_TIMESTAMP
+            WHERE id IN (
+                SELECT id FROM candidates
+                WHERE would_run <= :per_company
+                ORDER BY id
+                LIMIT :slots
+            )
+            RETURNING id
+            '''), {'slots': slots, 'per_company': per_company}).scalars().all()
+            
+            if not claimed:
+                return []
+            
+            rows = conn.execute(text(f'''
+            SELECT {_JOB_COLUMNS}
+            FROM export_jobs j
+            LEFT JOIN companies c ON j.company_id = c.id
+            WHERE j.id = ANY(:ids)
+            ORDER BY j.id
+            '''), {'ids': list(claimed)}).fetchall()
+            return [ExportJob(*row) for row in rows]
+    
+    @staticmethod
+    def finish_job(conn, job_id, file_path, file_size):
+        """Mark a running job done.
+        
+        Args:
+            conn: Database connection
+            job_id: ID of the job
+            file_path: Path of the rendered file
+            file_size: Size of the rendered file in bytes
+        """
+        conn.execute(text('''
+        UPDATE export_jobs
+        SET status = 'done', file_path = :file_path, file_size = :file_size,
+            finished_at = CURRENT_TIMESTAMP
+        WHERE id = :id
+        '''), {'id': job_id, 'file_path': file_path, 'file_size': file_size})
+        conn.commit()
+    
+    @staticmethod
+    def fail_job(conn, job_id, error):
+        """Mark a job failed.
+        
+        Args:
+            conn: Database connection
+            job_id: ID of the job
+            error: Message shown to the requester
+        """
+        conn.execute(text('''
+        UPDATE export_jobs
+        SET status = 'failed', error = :error, finished_at = CURRENT_TIMESTAMP
+        WHERE id = :id
+        '''), {'id': job_id, 'error': error[:1000]})
+        conn.commit()
+    
+    @staticmethod
+    def fail_stale_jobs(conn, timeout_minutes):
+        """Fail running jobs that have been running for too long.
+        
+        Jobs whose app process died (restart, crash) would otherwise stay
+        running forever and hold their company's concurrency slot.
+        
+        Args:
+            conn: Database connection
+            timeout_minutes: Running time after which a job is given up
+        
+        Returns:
+            int: Number of jobs failed
+        """
+        result = conn.execute(text('''
+        UPDATE export_jobs
+        SET status = 'failed', error = 'Export timed out or was interrupted',
+            finished_at = CURRENT_TIMESTAMP
+        WHERE status = 'running'
+          AND started_at < CURRENT_TIMESTAMP - make_interval(mins => :timeout_minutes)
+        '''), {'timeout_minutes': timeout_minutes})
+        conn.commit()
+        return result.rowcount
+    
+    @staticmethod
+    def get_jobs(conn, company_id=None, limit=20):
+        """Get the most recent export jobs, newest first.
+        
+        Args:
+            conn: Database connection
+            company_id: Optional company ID; None returns every company's jobs
+            limit: Most jobs to return
+        
+        Returns:
+            List of ExportJob
+        """
+        query = f'''
+        SELECT {_JOB_COLUMNS}
+        FROM export_jobs j
+        LEFT JOIN companies c ON j.company_id = c.id
+        '''
+        params = {'limit': limit}
+        
+        if company_id:
+            query += ' WHERE j.company_id = :company_id'
+            params['company_id'] = company_id
+        
+        query += ' ORDER BY j.id DESC LIMIT :limit'
+        
+        return [ExportJob(*row) for row in conn.execute(text(query), params).fetchall()]
+    
+    @staticmethod
+    def delete_job(conn, job_id, company_id=None):
+        """Delete a finished or failed job.
+        
+        Args:
+            conn: Database connection
+            job_id: ID of the job
+            company_id: Optional company ID the job must belong to
+        
+        Returns:
+            Path of the job's file to remove, or None
+        """
+        query = '''
+        DELETE FROM export_jobs
+        WHERE id = :id AND status IN ('done', 'failed')
+        '''
+        params = {'id': job_id}
+        
+        if company_id:
+            query += ' AND company_id = :company_id'
+            params['company_id'] = company_id
+        
+        file_path = conn.execute(text(query + ' RETURNING file_path'), params).scalar()
+        conn.commit()
+        return file_path
+    
+    @staticmethod
+    def delete_expired_jobs(conn, retention_hours):
+        """Delete finished and failed jobs older than the retention period.
+        
+        Args:
+            conn: Database connection
+            retention_hours: Hours a finished job is kept
+        
+        Returns:
+            List of file paths to remove
+        """
+        paths = conn.execute(text('''
+        DELETE FROM export_jobs
+        WHERE status IN ('done', 'failed')
+          AND finished_at < CURRENT_TIMESTAMP - make_interval(hours => :retention_hours)
+        RETURNING file_path
+        '''), {'retention_hours': retention_hours}).scalars().all()
+        conn.commit()
+        return [path for path in paths if path]
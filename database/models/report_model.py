@@ -1,4 +1,111 @@
+import datetime
+from typing import NamedTuple
 from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from database.cache import QUERY_CACHE, cached_query
+from database.pdf_cache import PDF_CACHE
+
+# Marks around the matched words in search snippets; control characters,
+# so they can't clash with report text and survive HTML escaping
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+
+# websearch syntax: "quoted phrases", or, -excluded
+_SEARCH_QUERY = "websearch_to_tsquery('english', :query)"
+
+# Newest matches ranked by ReportModel.search; older ones follow by date
+SEARCH_MAX_RANKED = 1000
+
+# Names and snippets of a search page, given a "page" CTE of matches
+_SEARCH_PAGE = f'''
+        SELECT page.id, e.full_name, r.role_name, b.branch_name, page.report_date, page.rank, page.ranked,
+               page.window_date, page.window_id,
+               ts_headline('english', page.report_text, {_SEARCH_QUERY},
+                           'StartSel=' || chr(2) || ', StopSel=' || chr(3) || ', '
+                           'MaxFragments=2, MinWords=5, MaxWords=20, FragmentDelimiter=" ... "') AS snippet
+        FROM page
+        JOIN employees e ON page.employee_id = e.id
+        JOIN branches b ON e.branch_id = b.id
+        LEFT JOIN employee_roles r ON e.role_id = r.id
+'''
+
+# One rollup row per employee and month, computed from daily_reports
+_ROLLUP_SOURCE = '''
+    SELECT dr.employee_id, date_trunc('month', dr.report_date)::date AS month, b.company_id, e.branch_id,
+           COUNT(*) AS report_count, MIN(dr.report_date) AS first_date, MAX(dr.report_date) AS last_date,
+           SUM(length(dr.report_text)) AS total_chars
+    FROM daily_reports dr
+    JOIN employees e ON dr.employee_id = e.id
+    JOIN branches b ON e.branch_id = b.id
+    GROUP BY dr.employee_id, date_trunc('month', dr.report_date), b.company_id, e.branch_id
+'''
+
+def _company_reports_query(company_id, start_date, end_date, branch_id, role_id):
+    """Build the query shared by get_company_reports and stream_company_reports.
+    
+    Returns:
+        Tuple of (SELECT without ORDER BY, params)
+    """
+    query = '''
+    SELECT dr.id, e.full_name, r.role_name, b.branch_name, dr.report_date, dr.report_text, dr.created_at
+    FROM daily_reports dr
+    JOIN employees e ON dr.employee_id = e.id
+    JOIN branches b ON e.branch_id = b.id
+    JOIN employee_roles r ON e.role_id = r.id
+    WHERE b.company_id = :company_id
+    AND dr.report_date BETWEEN :start_date AND :end_date
+    '''
+    
+    params = {
+        'company_id': company_id,
+        'start_date': start_date,
+        'end_date': end_date
+    }
+    
+    if branch_id:
+        query += ' AND e.branch_id = :branch_id'
+        params['branch_id'] = branch_id
+    
+    if role_id:
+        query += ' AND e.role_id = :role_id'
+        params['role_id'] = role_id
+    
+    return query, params
+
+class ReportStats(NamedTuple):
+    """Report statistics of a date range (see ReportModel.get_report_stats)"""
+    reports: int
+    employees: int
+    branches: int
+    first_date: object       # None when there are no reports
+    last_date: object
+    total_chars: int
+    by_employee: list        # rows of employee_id, full_name, role_name, branch_id, branch_name,
+                             # reports, first_date, last_date, total_chars
+
+def _split_months(start_date, end_date):
+    """Split a date range into whole months and the partial months at its ends.
+    
+    Returns:
+        Tuple of (first whole month, first month after the whole months,
+        list of (start, end) ranges outside the whole months)
+    """
+    full_start = start_date.replace(day=1)
+    if full_start < start_date:
+        full_start = (full_start + datetime.timedelta(days=32)).replace(day=1)
+    
+    after_end = end_date + datetime.timedelta(days=1)
+    full_end = after_end.replace(day=1)
+    
+    if full_start >= full_end:
+        return full_start, full_start, [(start_date, end_date)]
+    
+    partial = []
+    if start_date < full_start:
+        partial.append((start_date, full_start - datetime.timedelta(days=1)))
+    if end_date >= full_end:
+        partial.append((full_end, end_date))
+    return full_start, full_end, partial
 
 class ReportModel:
     """Daily report data operations with advanced filtering"""
@@ -78,34 +185,68 @@ class ReportModel:
         Returns:
             List of reports with employee and branch info
         """
-        query = '''
-        SELECT dr.id, e.full_name, r.role_name, b.branch_name, dr.report_date, dr.report_text, dr.created_at
+        query, params = _company_reports_query(company_id, start_date, end_date, branch_id, role_id)
+        query += ' ORDER BY dr.report_date DESC, b.branch_name, r.role_level, e.full_name'
+        
+        result = conn.execute(text(query), params)
+        return result.fetchall()
+    
+    @staticmethod
+    def stream_branch_reports(conn, branch_id, start_date, end_date, batch_size=500):
+        """Stream a branch's reports grouped by employee, for PDF export.
+        
+        Rows come from a server-side cursor in batches, ordered by role
+        level, employee and newest date first, so they can be rendered
+        as they arrive. Consume the iterator before closing conn.
+        
+        Args:
+            conn: Database connection
+            branch_id: ID of the branch
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            batch_size: Rows fetched per round trip
+        
+        Returns:
+            Iterator of (id, full_name, role_name, report_date, report_text, created_at)
+        """
+        result = conn.execution_options(yield_per=batch_size).execute(text('''
+        SELECT dr.id, e.full_name, r.role_name, dr.report_date, dr.report_text, dr.created_at
         FROM daily_reports dr
         JOIN employees e ON dr.employee_id = e.id
-        JOIN branches b ON e.branch_id = b.id
         JOIN employee_roles r ON e.role_id = r.id
-        WHERE b.company_id = :company_id
+        WHERE e.branch_id = :branch_id
         AND dr.report_date BETWEEN :start_date AND :end_date
-        '''
-        
-        params = {
-            'company_id': company_id, 
-            'start_date': start_date, 
-            'end_date': end_date
-        }
+        ORDER BY r.role_level, e.full_name, r.role_name, dr.report_date DESC
+        '''), {'branch_id': branch_id, 'start_date': start_date, 'end_date': end_date})
+        return iter(result)
+    
+    @staticmethod
+    def stream_company_reports(conn, company_id, start_date, end_date, branch_id=None, role_id=None,
+                               batch_size=500):
+        """Stream a company's reports grouped by branch and employee, for PDF export.
         
-        if branch_id:
-            query += ' AND e.branch_id = :branch_id'
-            params['branch_id'] = branch_id
+        Like get_company_reports, but rows come from a server-side cursor
+        in batches and are ordered by branch, role level, employee and
+        newest date first, so they can be rendered as they arrive.
+        Consume the iterator before closing conn.
         
-        if role_id:
-            query += ' AND e.role_id = :role_id'
-            params['role_id'] = role_id
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            branch_id: Optional branch ID for filtering
+            role_id: Optional role ID for filtering
+            batch_size: Rows fetched per round trip
         
-        query += ' ORDER BY dr.report_date DESC, b.branch_name, r.role_level, e.full_name'
+        Returns:
+            Iterator of (id, full_name, role_name, branch_name, report_date, report_text, created_at)
+        """
+        query, params = _company_reports_query(company_id, start_date, end_date, branch_id, role_id)
+        query += ' ORDER BY b.branch_name, r.role_level, e.full_name, r.role_name, dr.report_date DESC'
         
-        result = conn.execute(text(query), params)
-        return result.fetchall()
+        result = conn.execution_options(yield_per=batch_size).execute(text(query), params)
+        return iter(result)
     
     @staticmethod
     def get_all_reports(conn, start_date, end_date, employee_name=None):
@@ -138,6 +279,458 @@ class ReportModel:
         result = conn.execute(text(query), params)
         return result.fetchall()
     
+    @staticmethod
+    def get_reports_version(conn, start_date, end_date, company_id=None, branch_id=None, role_id=None,
+                            employee_id=None):
+        """Get the data version of the reports in a scope, for cache keys.
+        
+        The version changes whenever a report in scope is added, removed
+        or edited (every write gives the row a new xmin), and when an
+        employee in scope is renamed or moves branch or role
+        (employees.version).
+        
+        Args:
+            conn: Database connection
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            company_id: Optional company ID for filtering
+            branch_id: Optional branch ID for filtering
+            role_id: Optional role ID for filtering
+            employee_id: Optional employee ID for filtering
+        
+        Returns:
+            Tuple of (report count, sum of row xmins, employee version sum)
+        """
+        query = '''
+        SELECT COUNT(*), SUM(dr.xmin::text::bigint), SUM(e.version)
+        FROM daily_reports dr
+        JOIN employees e ON dr.employee_id = e.id
+        JOIN branches b ON e.branch_id = b.id
+        WHERE dr.report_date BETWEEN :start_date AND :end_date
+        '''
+        
+        params = {'start_date': start_date, 'end_date': end_date}
+        
+        if company_id:
+            query += ' AND b.company_id = :company_id'
+            params['company_id'] = company_id
+        
+        if branch_id:
+            query += ' AND e.branch_id = :branch_id'
+            params['branch_id'] = branch_id
+        
+        if role_id:
+            query += ' AND e.role_id = :role_id'
+            params['role_id'] = role_id
+        
+        if employee_id:
+            query += ' AND dr.employee_id = :employee_id'
+            params['employee_id'] = employee_id
+        
+        return tuple(conn.execute(text(query), params).fetchone())
+    
+    @staticmethod
+    @cached_query("reports")
+    def get_report_span(conn, company_id=None, branch_id=None, employee_id=None):
+        """Get the dates of the first and last report in a scope.
+        
+        Read from the monthly rollups, so "All Time" ranges can start at
+        the first report instead of scanning from a fixed early date.
+        
+        Args:
+            conn: Database connection
+            company_id: Optional company ID for filtering
+            branch_id: Optional branch ID for filtering
+            employee_id: Optional employee ID for filtering
+        
+        Returns:
+            Tuple of (first date, last date), (None, None) without reports
+        """
+        query = 'SELECT MIN(first_date), MAX(last_date) FROM report_rollups ru WHERE TRUE'
+        params = {}
+        
+        if company_id:
+            query += ' AND ru.company_id = :company_id'
+            params['company_id'] = company_id
+        
+        if branch_id:
+            query += ' AND ru.branch_id = :branch_id'
+            params['branch_id'] = branch_id
+        
+        if employee_id:
+            query += ' AND ru.employee_id = :employee_id'
+            params['employee_id'] = employee_id
+        
+        return tuple(conn.execute(text(query), params).fetchone())
+    
+    @staticmethod
+    def get_reports_chunk(conn, start_date, end_date, company_id=None, branch_id=None, role_id=None,
+                          employee_id=None, before=None, limit=100):
+        """Get the newest reports of a scope, one chunk at a time.
+        
+        Chunks are ordered by date, newest first; pass the returned cursor
+        as before to load the next, older chunk. The monthly rollups tell
+        how far back the chunk reaches, so the report query only reads
+        the months it needs instead of the whole range.
+        
+        Args:
+            conn: Database connection
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            company_id: Optional company ID for filtering
+            branch_id: Optional branch ID for filtering
+            role_id: Optional role ID for filtering
+            employee_id: Optional employee ID for filtering
+            before: Cursor returned with the previous chunk, None for the newest
+            limit: Maximum number of reports in the chunk
+        
+        Returns:
+            Tuple of (reports, cursor for older reports or None); reports are
+            (id, full_name, role_name, branch_name, report_date, report_text, created_at)
+        """
+        rollup_scope = ''
+        report_scope = ''
+        params = {}
+        
+        if company_id:
+            rollup_scope += ' AND ru.company_id = :company_id'
+            report_scope += ' AND b.company_id = :company_id'
+            params['company_id'] = company_id
+        
+        if branch_id:
+            rollup_scope += ' AND ru.branch_id = :branch_id'
+            report_scope += ' AND e.branch_id = :branch_id'
+            params['branch_id'] = branch_id
+        
+        if employee_id:
+            rollup_scope += ' AND ru.employee_id = :employee_id'
+            report_scope += ' AND dr.employee_id = :employee_id'
+            params['employee_id'] = employee_id
+        
+        if role_id:
+            rollup_scope += ' AND ru.employee_id IN (SELECT id FROM employees WHERE role_id = :role_id)'
+            report_scope += ' AND e.role_id = :role_id'
+            params['role_id'] = role_id
+        
+        reports = []
+        while True:
+            until = end_date if before is None else min(end_date, before[0])
+            
+            # Reach back whole months until they hold more than a chunk; the
+            # month of the cursor is always included, however much of it is
+            # already shown
+            months = conn.execute(text(f'''
+            SELECT ru.month, SUM(ru.report_count)
+            FROM report_rollups ru
+            WHERE ru.month >= :start_month AND ru.month < :until_month
+            {rollup_scope}
+            GROUP BY ru.month
+            ORDER BY ru.month DESC
+            '''), dict(params, start_month=start_date.replace(day=1), until_month=until.replace(day=1))).fetchall()
+            
+            since = until.replace(day=1)
+            reached = 0
+            for month, count in months:
+                since = month
+                reached += count
+                if reached > limit - len(reports):
+                    break
+            else:
+                since = start_date
+            
+            query = f'''
+            SELECT dr.id, e.full_name, r.role_name, b.branch_name, dr.report_date, dr.report_text, dr.created_at
+            FROM daily_reports dr
+            JOIN employees e ON dr.employee_id = e.id
+            JOIN branches b ON e.branch_id = b.id
+            JOIN employee_roles r ON e.role_id = r.id
+            WHERE dr.report_date BETWEEN :since AND :until
+            {report_scope}
+            '''
+            params.update({'since': max(since, start_date), 'until': until, 'limit': limit + 1 - len(reports)})
+            
+            if before is not None:
+                query += ' AND (dr.report_date, dr.id) < (:before_date, :before_id)'
+                params.update({'before_date': before[0], 'before_id': before[1]})
+            
+            # Within a scope the rollups already bound the window, and sorting
+            # its reports beats walking the date index through every other
+            # company's reports; "+ 0" keeps the planner off that index
+            order = 'dr.report_date + 0' if report_scope else 'dr.report_date'
+            query += f' ORDER BY {order} DESC, dr.id DESC LIMIT :limit'
+            
+            reports += conn.execute(text(query), params).fetchall()
+            if len(reports) > limit:
+                reports = reports[:limit]
+                return reports, (reports[-1].report_date, reports[-1].id)
+            if since <= start_date:
+                return reports, None
+            
+            # The rollups also count employees without a role, whom the
+            # join on employee_roles drops, so the window can fall short of
+            # a chunk; read on from the start of the window
+            before = (since, 0)
+    
+    @staticmethod
+    def get_report_stats(conn, company_id, start_date, end_date, branch_id=None, role_id=None):
+        """Get report statistics of a date range without reading every report.
+        
+        Whole months come from report_rollups (migration 0013); only the
+        partial months at the ends of the range are counted from
+        daily_reports. Ranges starting on the 1st (This Month, This Year,
+        All Reports) read just the current month's reports.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            start_date: Start date for filtering
+            end_date: End date for filtering
+            branch_id: Optional branch ID for filtering
+            role_id: Optional role ID for filtering
+        
+        Returns:
+            ReportStats; by_employee is ordered by branch, role level and name
+        """
+        full_start, full_end, partial = _split_months(start_date, end_date)
+        params = {'company_id': company_id, 'full_start': full_start, 'full_end': full_end}
+        
+        partial_conditions = []
+        for index, (range_start, range_end) in enumerate(partial):
+            partial_conditions.append(f'dr.report_date BETWEEN :start_{index} AND :end_{index}')
+            params[f'start_{index}'] = range_start
+            params[f'end_{index}'] = range_end
+        
+        rollup_filter = ''
+        partial_filter = ''
+        outer_filter = ''
+        if branch_id:
+            rollup_filter = ' AND ru.branch_id = :branch_id'
+            partial_filter = ' AND e.branch_id = :branch_id'
+            params['branch_id'] = branch_id
+        
+        if role_id:
+            outer_filter = 'WHERE e.role_id = :role_id'
+            params['role_id'] = role_id
+        
+        rows = conn.execute(text(f'''
+        WITH totals AS (
+            SELECT ru.employee_id, ru.report_count, ru.first_date, ru.last_date, ru.total_chars
+            FROM report_rollups ru
+            WHERE ru.company_id = :company_id
+            AND ru.month >= :full_start AND ru.month < :full_end{rollup_filter}
+            
+            UNION ALL
+            
+            SELECT dr.employee_id, 1, dr.report_date, dr.report_date, length(dr.report_text)
+            FROM daily_reports dr
+            JOIN employees e ON dr.employee_id = e.id
+            JOIN branches b ON e.branch_id = b.id
+            WHERE b.company_id = :company_id
+            AND ({' OR '.join(partial_conditions) or 'FALSE'}){partial_filter}
+        )
+        SELECT e.id AS employee_id, e.full_name, r.role_name, b.id AS branch_id, b.branch_name,
+               SUM(t.report_count) AS reports, MIN(t.first_date) AS first_date,
+               MAX(t.last_date) AS last_date, SUM(t.total_chars) AS total_chars
+        FROM totals t
+        JOIN employees e ON t.employee_id = e.id
+        JOIN branches b ON e.branch_id = b.id
+        JOIN employee_roles r ON e.role_id = r.id
+        {outer_filter}
+        GROUP BY e.id, e.full_name, r.role_name, r.role_level, b.id, b.branch_name
+        ORDER BY b.branch_name, r.role_level, e.full_name
+        '''), params).fetchall()
+        
+        return ReportStats(
+            reports=sum(row.reports for row in rows),
+            employees=len(rows),
+            branches=len({row.branch_id for row in rows}),
+            first_date=min((row.first_date for row in rows), default=None),
+            last_date=max((row.last_date for row in rows), default=None),
+            total_chars=sum(row.total_chars for row in rows),
+            by_employee=rows
+        )
+    
+    @staticmethod
+    def rebuild_rollups(conn):
+        """Rebuild report_rollups from daily_reports.
+        
+        The rollups are kept current by triggers; this repairs them after
+        maintenance that bypassed the triggers. Reports and employees are
+        locked against writes meanwhile.
+        
+        Args:
+            conn: Database connection
+        
+        Returns:
+            Tuple of (rollup rows, rows that were missing, stale or extra)
+        """
+        with conn.begin():
+            conn.execute(text('LOCK TABLE daily_reports, employees IN SHARE MODE'))
+            conn.execute(text(f'''
+            CREATE TEMPORARY TABLE fresh_rollups ON COMMIT DROP AS {_ROLLUP_SOURCE}
+            '''))
+            
+            drifted = conn.execute(text('''
+            SELECT COUNT(DISTINCT (employee_id, month)) FROM (
+                (SELECT * FROM fresh_rollups
+                 EXCEPT
+                 SELECT employee_id, month, company_id, branch_id, report_count,
+                        first_date, last_date, total_chars
+                 FROM report_rollups)
+                UNION ALL
+                (SELECT employee_id, month, company_id, branch_id, report_count,
+                        first_date, last_date, total_chars
+                 FROM report_rollups
+                 EXCEPT
+                 SELECT * FROM fresh_rollups)
+            ) drift
+            ''')).scalar()
+            
+            if drifted:
+                conn.execute(text('''
+                DELETE FROM report_rollups;
+                INSERT INTO report_rollups
+                    (employee_id, month, company_id, branch_id, report_count, first_date, last_date, total_chars)
+                SELECT * FROM fresh_rollups;
+                '''))
+            
+            rows = conn.execute(text('SELECT COUNT(*) FROM fresh_rollups')).scalar()
+        
+        if drifted:
+            QUERY_CACHE.invalidate("reports")
+        return rows, drifted
+    
+    @staticmethod
+    def search(conn, company_id, query, filters=None, cursor=None, limit=20, max_ranked=SEARCH_MAX_RANKED):
+        """Search a company's reports, best matches first, one page at a time.
+        
+        Matches come from the search_vector GIN index (migration 0012).
+        Ranking reads every match, so only the newest max_ranked matches
+        are ranked: a rare term ranks all its reports, a term found in
+        most reports ranks the recent ones instead of scanning the whole
+        history. Ranked results are ordered by rank, then newest first;
+        once they are used up, the older matches follow newest first, so
+        every match can be reached. The next page starts after the last
+        result's (rank, date, id), with rank None past the ranked ones.
+        Names and snippets are only fetched for the rows on the page.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            query: Search text in web search syntax, e.g.
+                ``warehouse audit -Chittagong`` or ``"stock count"``
+            filters: Optional dict with branch_id, role_id, employee_id,
+                start_date and end_date
+            cursor: Cursor returned with the previous page, None for the first
+            limit: Maximum number of results on the page
+            max_ranked: Most recent matches to rank
+        
+        Returns:
+            Tuple of (results with employee, role, branch, date, rank,
+            ranked (False for the older matches in date order) and
+            snippet, cursor for the next page or None if this is the last
+            page). Matched words in snippets are wrapped in
+            HIGHLIGHT_START and HIGHLIGHT_STOP.
+        """
+        if not query or not query.strip():
+            return [], None
+        
+        filters = filters or {}
+        params = {'company_id': company_id, 'query': query, 'limit': limit + 1, 'max_ranked': max_ranked}
+        conditions = []
+        
+        for column, name in (('e.branch_id', 'branch_id'), ('e.role_id', 'role_id'),
+                             ('dr.employee_id', 'employee_id')):
+            if filters.get(name):
+                conditions.append(f'{column} = :{name}')
+                params[name] = filters[name]
+        
+        if filters.get('start_date'):
+            conditions.append('dr.report_date >= :start_date')
+            params['start_date'] = filters['start_date']
+        
+        if filters.get('end_date'):
+            conditions.append('dr.report_date <= :end_date')
+            params['end_date'] = filters['end_date']
+        
+        extra = ''.join(f' AND {condition}' for condition in conditions)
+        matches = f'''
+            FROM daily_reports dr
+            JOIN employees e ON dr.employee_id = e.id
+            JOIN branches b ON e.branch_id = b.id
+            WHERE dr.search_vector @@ {_SEARCH_QUERY}
+            AND b.company_id = :company_id{extra}
+        '''
+        
+        results = []
+        if cursor is None or cursor[0] is not None:
+            after = ''
+            if cursor:
+                after = ('WHERE (rank, candidates.report_date, candidates.id) '
+                         '< (CAST(:after_rank AS real), :after_date, :after_id)')
+                params.update(zip(('after_rank', 'after_date', 'after_id'), cursor))
+            
+            # window_end is the oldest ranked match when older ones may exist
+            results = conn.execute(text(f'''
+            WITH candidates AS (
+                SELECT dr.id, dr.employee_id, dr.report_date, dr.report_text,
+                       ts_rank_cd(dr.search_vector, {_SEARCH_QUERY}) AS rank, TRUE AS ranked
+                {matches}
+                ORDER BY dr.report_date DESC, dr.id DESC
+                LIMIT :max_ranked
+            ),
+            window_end AS (
+                SELECT report_date, id FROM candidates
+                WHERE (SELECT COUNT(*) FROM candidates) = :max_ranked
+                ORDER BY report_date, id
+                LIMIT 1
+            ),
+            page AS (
+                SELECT candidates.*, window_end.report_date AS window_date, window_end.id AS window_id
+                FROM candidates
+                LEFT JOIN window_end ON TRUE
+                {after}
+                ORDER BY rank DESC, candidates.report_date DESC, candidates.id DESC
+                LIMIT :limit
+            )
+            {_SEARCH_PAGE}
+            ORDER BY page.rank DESC, page.report_date DESC, page.id DESC
+            '''), params).fetchall()
+            
+            # One extra row tells whether there is a next page
+            if len(results) > limit:
+                results = results[:limit]
+                last = results[-1]
+                return results, (last.rank, last.report_date, last.id)
+            
+            # The ranked window is used up; older matches start below its oldest row
+            if not results or results[-1].window_id is None:
+                return results, None
+            cursor = (None, results[-1].window_date, results[-1].window_id)
+        
+        params.update({'after_date': cursor[1], 'after_id': cursor[2], 'limit': limit - len(results) + 1})
+        older = conn.execute(text(f'''
+        WITH page AS (
+            SELECT dr.id, dr.employee_id, dr.report_date, dr.report_text,
+                   ts_rank_cd(dr.search_vector, {_SEARCH_QUERY}) AS rank, FALSE AS ranked,
+                   NULL::date AS window_date, NULL::integer AS window_id
+            {matches}
+            AND (dr.report_date, dr.id) < (:after_date, :after_id)
+            ORDER BY dr.report_date DESC, dr.id DESC
+            LIMIT :limit
+        )
+        {_SEARCH_PAGE}
+        ORDER BY page.report_date DESC, page.id DESC
+        '''), params).fetchall()
+        
+        if len(older) < params['limit']:
+            return results + older, None
+        
+        older = older[:-1]
+        if older:
+            cursor = (None, older[-1].report_date, older[-1].id)
+        return results + older, cursor
+    
     @staticmethod
     def add_report(conn, employee_id, report_date, report_text):
         """Add a new report.
@@ -148,15 +741,24 @@ class ReportModel:
             report_date: Date of the report
             report_text: Content of the report
         """
-        conn.execute(text('''
-        INSERT INTO daily_reports (employee_id, report_date, report_text)
-        VALUES (:employee_id, :report_date, :report_text)
+        company_id = conn.execute(text('''
+        WITH added AS (
+            INSERT INTO daily_reports (employee_id, report_date, report_text)
+            VALUES (:employee_id, :report_date, :report_text)
+            RETURNING employee_id
+        )
+        SELECT b.company_id
+        FROM added a
+        JOIN employees e ON a.employee_id = e.id
+        LEFT JOIN branches b ON e.branch_id = b.id
         '''), {
             'employee_id': employee_id,
             'report_date': report_date,
             'report_text': report_text
-        })
+        }).scalar()
         conn.commit()
+        PDF_CACHE.invalidate(tenant=company_id, report_date=report_date)
+        QUERY_CACHE.invalidate("reports", tenant=company_id)
     
     @staticmethod
     def update_report(conn, report_id, report_date, report_text):
@@ -167,17 +769,74 @@ class ReportModel:
             report_id: ID of the report
             report_date: New date for the report
             report_text: New content for the report
+        
+        Raises:
+            ValueError: If the employee already has another report for the new date
         """
-        conn.execute(text('''
-        UPDATE daily_reports 
-        SET report_text = :report_text, report_date = :report_date, created_at = CURRENT_TIMESTAMP
-        WHERE id = :id
+        try:
+            company_id = conn.execute(text('''
+            UPDATE daily_reports dr
+            SET report_text = :report_text, report_date = :report_date, created_at = CURRENT_TIMESTAMP
+            WHERE dr.id = :id
+            RETURNING (
+                SELECT b.company_id
+                FROM employees e
+                JOIN branches b ON e.branch_id = b.id
+                WHERE e.id = dr.employee_id
+            )
+            '''), {
+                'report_text': report_text,
+                'report_date': report_date,
+                'id': report_id
+            }).scalar()
+        except IntegrityError as e:
+            conn.rollback()
+            if getattr(e.orig.diag, 'constraint_name', None) == 'uq_daily_reports_employee_date':
+                raise ValueError(
+                    f"You already have a report for {report_date.strftime('%d %b, %Y')}. "
+                    "Edit that report instead."
+                ) from e
+            raise
+        conn.commit()
+        # The report may have moved from another date; None (no branch) drops every company
+        PDF_CACHE.invalidate(tenant=company_id)
+        QUERY_CACHE.invalidate("reports", tenant=company_id)
+    
+    @staticmethod
+    def upsert_report(conn, employee_id, report_date, report_text):
+        """Create or replace an employee's report for a date in one statement.
+        
+        Args:
+            conn: Database connection
+            employee_id: ID of the employee
+            report_date: Date of the report
+            report_text: Content of the report
+        
+        Returns:
+            Tuple of (report ID, True if a new report was created)
+        """
+        result = conn.execute(text('''
+        WITH written AS (
+            INSERT INTO daily_reports (employee_id, report_date, report_text)
+            VALUES (:employee_id, :report_date, :report_text)
+            ON CONFLICT (employee_id, report_date)
+            DO UPDATE SET report_text = EXCLUDED.report_text, created_at = CURRENT_TIMESTAMP
+            RETURNING id, employee_id, (xmax = 0) AS inserted
+        )
+        SELECT w.id, w.inserted, b.company_id
+        FROM written w
+        JOIN employees e ON w.employee_id = e.id
+        LEFT JOIN branches b ON e.branch_id = b.id
         '''), {
-            'report_text': report_text,
+            'employee_id': employee_id,
             'report_date': report_date,
-            'id': report_id
+            'report_text': report_text
         })
+        report_id, inserted, company_id = result.fetchone()
         conn.commit()
+        PDF_CACHE.invalidate(tenant=company_id, report_date=report_date)
+        QUERY_CACHE.invalidate("reports", tenant=company_id)
+        return report_id, inserted
     
     @staticmethod
     def check_report_exists(conn, employee_id, report_date):
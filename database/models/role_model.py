@@ -1,9 +1,11 @@
 from sqlalchemy import text
+from database.cache import cached_query, invalidates
 
 class RoleModel:
     """Employee role data operations"""
     
     @staticmethod
+    @cached_query("roles")
     def get_all_roles(conn, company_id):
         """Get all roles for a company.
         
@@ -23,6 +25,7 @@ class RoleModel:
         return result.fetchall()
     
     @staticmethod
+    @cached_query("roles")
     def get_role_by_id(conn, role_id):
         """Get role details by ID.
         
@@ -41,6 +44,7 @@ class RoleModel:
         return result.fetchone()
     
     @staticmethod
+    @invalidates("roles")
     def create_role(conn, company_id, role_name, role_level):
         """Create a new role.
         
@@ -61,6 +65,7 @@ class RoleModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("roles")
     def update_role(conn, role_id, role_name, role_level):
         """Update role details.
         
@@ -82,6 +87,7 @@ class RoleModel:
         conn.commit()
     
     @staticmethod
+    @invalidates("roles", "employees")
     def delete_role(conn, role_id, replacement_role_id):
         """Delete a role and reassign employees to another role.
         
@@ -108,6 +114,7 @@ class RoleModel:
             '''), {'role_id': role_id})
     
     @staticmethod
+    @cached_query("roles")
     def get_manager_roles(conn, company_id):
         """Get roles that are considered management (Manager and Asst. Manager).
         
@@ -126,6 +133,7 @@ class RoleModel:
         return [row[0] for row in result.fetchall()]
     
     @staticmethod
+    @invalidates("roles")
     def initialize_default_roles(conn, company_id):
         """Initialize default roles for a new company.
         
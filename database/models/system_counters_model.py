@@ -0,0 +1,73 @@
+from typing import NamedTuple
+from sqlalchemy import text
+
+class SystemCounters(NamedTuple):
+    """Global figures shown on the admin overview"""
+    active_companies: int
+    active_branches: int
+    active_employees: int
+    total_reports: int
+    total_tasks: int
+    completed_tasks: int
+    unread_admin_messages: int
+    updated_at: object
+
+# Counted columns, in SystemCounters order
+COUNTER_COLUMNS = SystemCounters._fields[:-1]
+
+class SystemCountersModel:
+    """Trigger-maintained global counters (see migration 0006)"""
+    
+    @staticmethod
+    def get_counters(conn):
+        """Read all global counters by summing their shards.
+        
+        Args:
+            conn: Database connection
+        
+        Returns:
+            SystemCounters
+        """
+        row = conn.execute(text(f'''
+        SELECT {", ".join(f"SUM({column})::bigint" for column in COUNTER_COLUMNS)},
+               MAX(updated_at)
+        FROM system_counter_shards
+        ''')).fetchone()
+        return SystemCounters(*row)
+    
+    @staticmethod
+    def recount(conn):
+        """Rebuild the counters from the underlying tables.
+        
+        The counted tables are locked against writes while recounting, so
+        no trigger delta can be lost or applied twice. The recounted values
+        go to shard 0 and the other shards are reset.
+        
+        Args:
+            conn: Database connection
+        
+        Returns:
+            dict: (stored value, recounted value) per counter
+        """
+        with conn.begin():
+            conn.execute(text('''
+            LOCK TABLE companies, branches, employees, daily_reports, tasks, messages
+            IN SHARE MODE
+            '''))
+            
+            stored = SystemCountersModel.get_counters(conn)
+            recounted = conn.execute(text(f'''
+            SELECT {", ".join(COUNTER_COLUMNS)} FROM system_counters_recount
+            ''')).fetchone()
+            
+            conn.execute(text(f'''
+            UPDATE system_counter_shards
+            SET {", ".join(f"{column} = CASE WHEN shard = 0 THEN :{column} ELSE 0 END"
+                           for column in COUNTER_COLUMNS)},
+                updated_at = CURRENT_TIMESTAMP
+            '''), dict(zip(COUNTER_COLUMNS, recounted)))
+        
+        return {
+            column: (stored[i], recounted[i])
+            for i, column in enumerate(COUNTER_COLUMNS)
+        }
@@ -1,6 +1,44 @@
 from sqlalchemy import text
 import datetime
 
+def _company_tasks_query(company_id, status_filter):
+    """Build the query shared by get_tasks_for_company and stream_tasks_for_company.
+    
+    Returns:
+        Tuple of (SELECT with ORDER BY, params)
+    """
+    query = '''
+    SELECT t.id, t.task_description, t.due_date, t.is_completed, 
+           t.completed_at, t.created_at, t.branch_id, t.employee_id,
+           CASE 
+               WHEN t.branch_id IS NOT NULL THEN b.branch_name 
+               WHEN t.employee_id IS NOT NULL THEN e.full_name
+               ELSE 'Unassigned'
+           END as assignee_name,
+           CASE
+               WHEN t.branch_id IS NOT NULL THEN 'branch'
+               WHEN t.employee_id IS NOT NULL THEN 'employee'
+               ELSE 'unassigned'
+           END as assignee_type,
+           ce.full_name as completed_by_name
+    FROM tasks t
+    LEFT JOIN branches b ON t.branch_id = b.id
+    LEFT JOIN employees e ON t.employee_id = e.id
+    LEFT JOIN employees ce ON t.completed_by_id = ce.id
+    WHERE t.company_id = :company_id
+    '''
+    
+    params = {'company_id': company_id}
+    
+    if status_filter == "Pending":
+        query += ' AND t.is_completed = FALSE'
+    elif status_filter == "Completed":
+        query += ' AND t.is_completed = TRUE'
+    
+    query += ' ORDER BY t.due_date ASC NULLS LAST, t.created_at DESC'
+    
+    return query, params
+
 class TaskModel:
     """Task data operations with branch and employee assignment support"""
     
@@ -35,26 +73,64 @@ class TaskModel:
             
             task_id = result.fetchone()[0]
             
-            # If assigned to a branch, create assignments for all branch employees
+            # If assigned to a branch, create assignments for all active branch
+            # employees in one statement
             if branch_id and not employee_id:
-                # Get all active employees in the branch
-                employees = conn.execute(text('''
-                SELECT id FROM employees
+                conn.execute(text('''
+                INSERT INTO task_assignments (task_id, employee_id, is_completed)
+                SELECT :task_id, id, FALSE
+                FROM employees
                 WHERE branch_id = :branch_id AND is_active = TRUE
-                '''), {'branch_id': branch_id}).fetchall()
-                
-                # Create task assignments for each employee
-                for emp in employees:
-                    conn.execute(text('''
-                    INSERT INTO task_assignments (task_id, employee_id, is_completed)
-                    VALUES (:task_id, :employee_id, FALSE)
-                    '''), {
-                        'task_id': task_id,
-                        'employee_id': emp[0]
-                    })
+                '''), {
+                    'task_id': task_id,
+                    'branch_id': branch_id
+                })
             
             return task_id
     
+    @staticmethod
+    def create_branch_tasks(conn, company_id, task_description, due_date, branch_ids):
+        """Assign one task to several branches at once.
+        
+        Creates a task per branch and the assignments for every active
+        employee of those branches in a single statement. Branches that do
+        not belong to the company are ignored.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company creating the tasks
+            task_description: Description of the task
+            due_date: Due date for the task
+            branch_ids: IDs of the branches to assign the task to
+        
+        Returns:
+            dict: Created task ID for each branch ID
+        """
+        with conn.begin():
+            result = conn.execute(text('''
+            WITH new_tasks AS (
+                INSERT INTO tasks (company_id, branch_id, task_description, due_date, is_completed)
+                SELECT :company_id, b.id, :task_description, :due_date, FALSE
+                FROM branches b
+                WHERE b.company_id = :company_id AND b.id = ANY(:branch_ids)
+                RETURNING id, branch_id
+            ),
+            new_assignments AS (
+                INSERT INTO task_assignments (task_id, employee_id, is_completed)
+                SELECT t.id, e.id, FALSE
+                FROM new_tasks t
+                JOIN employees e ON e.branch_id = t.branch_id AND e.is_active = TRUE
+            )
+            SELECT branch_id, id FROM new_tasks
+            '''), {
+                'company_id': company_id,
+                'task_description': task_description,
+                'due_date': due_date,
+                'branch_ids': list(branch_ids)
+            })
+            
+            return {row[0]: row[1] for row in result.fetchall()}
+    
     @staticmethod
     def get_tasks_for_company(conn, company_id, status_filter=None):
         """Get all tasks for a company with optional status filter.
@@ -67,38 +143,32 @@ class TaskModel:
         Returns:
             List of tasks with branch and employee info
         """
-        query = '''
-        SELECT t.id, t.task_description, t.due_date, t.is_completed, 
-               t.completed_at, t.created_at, t.branch_id, t.employee_id,
-               CASE 
-                   WHEN t.branch_id IS NOT NULL THEN b.branch_name 
-                   WHEN t.employee_id IS NOT NULL THEN e.full_name
-                   ELSE 'Unassigned'
-               END as assignee_name,
-               CASE
-                   WHEN t.branch_id IS NOT NULL THEN 'branch'
-                   WHEN t.employee_id IS NOT NULL THEN 'employee'
-                   ELSE 'unassigned'
-               END as assignee_type,
-               ce.full_name as completed_by_name
-        FROM tasks t
-        LEFT JOIN branches b ON t.branch_id = b.id
-        LEFT JOIN employees e ON t.employee_id = e.id
-        LEFT JOIN employees ce ON t.completed_by_id = ce.id
-        WHERE t.company_id = :company_id
-        '''
+        query, params = _company_tasks_query(company_id, status_filter)
         
-        params = {'company_id': company_id}
+        result = conn.execute(text(query), params)
+        return result.fetchall()
+    
+    @staticmethod
+    def stream_tasks_for_company(conn, company_id, status_filter=None, batch_size=500):
+        """Stream a company's tasks, for data export.
         
-        if status_filter == "Pending":
-            query += ' AND t.is_completed = FALSE'
-        elif status_filter == "Completed":
-            query += ' AND t.is_completed = TRUE'
+        Same rows and order as get_tasks_for_company, but read from a
+        server-side cursor in batches. Consume the iterator before
+        closing conn.
+        
+        Args:
+            conn: Database connection
+            company_id: ID of the company
+            status_filter: Optional status filter ('All', 'Pending', 'Completed')
+            batch_size: Rows fetched per round trip
         
-        query += ' ORDER BY t.due_date ASC NULLS LAST, t.created_at DESC'
+        Returns:
+            Iterator of task rows with branch and employee info
+        """
+        query, params = _company_tasks_query(company_id, status_filter)
         
-        result = conn.execute(text(query), params)
-        return result.fetchall()
+        result = conn.execution_options(yield_per=batch_size).execute(text(query), params)
+        return iter(result)
     
     @staticmethod
     def get_branch_task_progress(conn, task_id):
@@ -149,8 +219,10 @@ class TaskModel:
     def mark_task_completed(conn, task_id, employee_id):
         """Mark a task as completed by an employee.
         
-        For branch tasks, this marks the employee's assignment as completed.
-        For individual tasks, this marks the entire task as completed.
+        For branch tasks, this marks the employee's assignment as completed
+        and closes the task when a manager or assistant manager completes it
+        or when no assignments are left open. For individual tasks, this
+        marks the entire task as completed.
         
         Args:
             conn: Database connection
@@ -160,94 +232,18 @@ class TaskModel:
         Returns:
             bool: True if entire task is now complete, False otherwise
         """
-        now = datetime.datetime.now()
-        
+        # complete_task (migration 0004) locks the task row and applies the
+        # whole transition, including the manager-closes-task rule
         with conn.begin():
-            # Get task information
-            task = conn.execute(text('''
-            SELECT branch_id, employee_id, is_completed 
-            FROM tasks 
-            WHERE id = :task_id
-            '''), {'task_id': task_id}).fetchone()
-            
-            if not task:
-                return False
-            
-            # If already completed, do nothing
-            if task[2]:
-                return True
-            
-            # If branch task, update the employee's assignment
-            if task[0]:  # branch_id is not None
-                # Update the assignment
-                conn.execute(text('''
-                UPDATE task_assignments
-                SET is_completed = TRUE, completed_at = :now
-                WHERE task_id = :task_id AND employee_id = :employee_id
-                '''), {
-                    'task_id': task_id,
-                    'employee_id': employee_id,
-                    'now': now
-                })
-                
-                # Check employee role level
-                employee_role = conn.execute(text('''
-                SELECT r.role_level 
-                FROM employees e
-                JOIN employee_roles r ON e.role_id = r.id
-                WHERE e.id = :employee_id
-                '''), {'employee_id': employee_id}).fetchone()
-                
-                is_manager = employee_role and employee_role[0] <= 2  # Manager or Asst. Manager
-                
-                # If employee is a manager or assistant manager, complete the entire task
-                if is_manager:
-                    conn.execute(text('''
-                    UPDATE tasks
-                    SET is_completed = TRUE, completed_at = :now, completed_by_id = :employee_id
-                    WHERE id = :task_id
-                    '''), {
-                        'task_id': task_id,
-                        'employee_id': employee_id,
-                        'now': now
-                    })
-                    return True
-                
-                # Otherwise, check if all assignments are complete
-                all_complete = conn.execute(text('''
-                SELECT COUNT(*) = 0
-                FROM task_assignments
-                WHERE task_id = :task_id AND is_completed = FALSE
-                '''), {'task_id': task_id}).fetchone()[0]
-                
-                if all_complete:
-                    conn.execute(text('''
-                    UPDATE tasks
-                    SET is_completed = TRUE, completed_at = :now, completed_by_id = :employee_id
-                    WHERE id = :task_id
-                    '''), {
-                        'task_id': task_id,
-                        'employee_id': employee_id,
-                        'now': now
-                    })
-                    return True
-                
-                return False
-                
-            # If direct employee task, complete it
-            elif task[1] == employee_id:  # task assigned directly to this employee
-                conn.execute(text('''
-                UPDATE tasks
-                SET is_completed = TRUE, completed_at = :now, completed_by_id = :employee_id
-                WHERE id = :task_id
-                '''), {
-                    'task_id': task_id,
-                    'employee_id': employee_id,
-                    'now': now
-                })
-                return True
+            result = conn.execute(text('''
+            SELECT complete_task(:task_id, :employee_id, :now)
+            '''), {
+                'task_id': task_id,
+                'employee_id': employee_id,
+                'now': datetime.datetime.now()
+            })
             
-            return False
+            return result.fetchone()[0]
     
     @staticmethod
     def get_tasks_for_employee(conn, employee_id, status_filter=None):
@@ -0,0 +1,256 @@
+"""Process-wide on-disk cache for generated report PDFs.
+
+Rendering a report PDF takes seconds to minutes while the reports behind
+it rarely change between downloads, so finished PDFs are kept as files
+and served again as long as their inputs are the same. An entry's key is
+a digest of the report scope, the filters that shape the document, the
+date range and the data version of the daily_reports rows in scope (see
+ReportModel.get_reports_version), so a changed report can never be
+served from a stale file.
+
+ReportModel writes call ``PDF_CACHE.invalidate`` for the company and date
+they touch, which frees the files that can no longer be hit. Total size
+is bounded; the least recently used files are evicted first.
+
+Settings come from the optional ``[pdf_cache]`` secrets section:
+``directory`` (default: a fresh directory under the system temp dir)
+and ``max_mb`` (default 256).
+"""
+import atexit
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_MB = 256
+
+class PdfCache:
+    """Thread-safe, size-bounded LRU of PDF files with tenant/date invalidation"""
+    
+    def __init__(self, directory=None, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.directory = None
+        self.configure(directory, max_bytes)
+        self.reset_stats()
+    
+    def configure(self, directory=None, max_bytes=None):
+        """Point the cache at a directory and/or change its size limit.
+        
+        Switching directories drops the current entries.
+        
+        Args:
+            directory: Directory for the PDF files; None keeps the current
+                one (by default a temporary one, created on first use and
+                removed at exit)
+            max_bytes: Size limit of all cached files together
+        """
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = int(max_bytes)
+            
+            if directory is not None and directory != self.directory:
+                os.makedirs(directory, exist_ok=True)
+                self._drop(list(self._entries))
+                self.directory = directory
+            
+            self._evict()
+    
+    def _ensure_directory(self):
+        """Get the cache directory, creating the default one on first use."""
+        with self._lock:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix="akhand-pdf-")
+                atexit.register(shutil.rmtree, self.directory, True)
+            return self.directory
+    
+    def reset_stats(self):
+        """Clear the hit/miss counters."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.invalidations = 0
+    
+    @staticmethod
+    def key(scope, filters, start_date, end_date, version):
+        """Build the cache key of a report PDF.
+        
+        Args:
+            scope: Tuple naming what the PDF covers, e.g. ("branch", 12)
+            filters: Mapping of everything else that changes the document
+                (titles, role filters, ...)
+            start_date: First date of the range
+            end_date: Last date of the range
+            version: Data version of the reports in scope
+        
+        Returns:
+            str: Hex digest
+        """
+        material = repr((scope, sorted(filters.items()), start_date, end_date, tuple(version)))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    def open(self, key):
+        """Open a cached PDF.
+        
+        The file is opened under the lock, so a concurrent eviction can
+        remove it from the cache without breaking this reader.
+        
+        Returns:
+            Binary file object, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                try:
+                    pdf = open(entry['path'], 'rb')
+                except OSError:
+                    # Removed behind our back; forget it
+                    self._drop([key])
+                    entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pdf
+    
+    def put(self, key, source, tenant=None, start_date=None, end_date=None):
+        """Store a rendered PDF and open the stored copy.
+        
+        Args:
+            key: Cache key from PdfCache.key
+            source: Binary file object positioned at the start of the PDF
+            tenant: Company the PDF belongs to, None for cross-company PDFs
+            start_date: First date of the reports it covers
+            end_date: Last date of the reports it covers
+        
+        Returns:
+            Binary file object of the stored PDF
+        """
+        directory = self._ensure_directory()
+        path = os.path.join(directory, f"{key}.pdf")
+        # Copy outside the lock under a private name, then publish atomically
+        handle, partial_path = tempfile.mkstemp(suffix=".partial", dir=directory)
+        with os.fdopen(handle, 'wb') as partial:
+            shutil.copyfileobj(source, partial)
+        os.replace(partial_path, path)
+        
+        with self._lock:
+            self._entries[key] = {
+                'path': path,
+                'size': os.path.getsize(path),
+                'tenant': tenant,
+                'start_date': start_date,
+                'end_date': end_date
+            }
+            self._entries.move_to_end(key)
+            pdf = open(path, 'rb')
+            self._evict()
+        return pdf
+    
+    def get_or_render(self, key, render, tenant=None, start_date=None, end_date=None):
+        """Open a cached PDF, rendering and storing it on a miss.
+        
+        Args:
+            key: Cache key from PdfCache.key
+            render: Callable returning a binary file object holding the PDF
+            tenant: Company the PDF belongs to, None for cross-company PDFs
+            start_date: First date of the reports it covers
+            end_date: Last date of the reports it covers
+        
+        Returns:
+            Binary file object of the PDF; close it when done
+        """
+        pdf = self.open(key)
+        if pdf is not None:
+            return pdf
+        
+        with render() as rendered:
+            return self.put(key, rendered, tenant, start_date, end_date)
+    
+    def invalidate(self, tenant=None, report_date=None):
+        """Drop the PDFs a changed report may appear in.
+        
+        Args:
+            tenant: Company of the changed report. PDFs of other companies
+                are kept; cross-company PDFs are always dropped. None drops
+                every company.
+            report_date: Date of the changed report; None drops every date
+        
+        Returns:
+            int: Number of PDFs dropped
+        """
+        with self._lock:
+            stale = [
+                key for key, entry in self._entries.items()
+                if (tenant is None or entry['tenant'] is None or entry['tenant'] == tenant)
+                and (report_date is None or entry['start_date'] is None
+                     or entry['start_date'] <= report_date <= entry['end_date'])
+            ]
+            self._drop(stale)
+            self.invalidations += len(stale)
+        return len(stale)
+    
+    def clear(self):
+        """Drop all PDFs."""
+        with self._lock:
+            self._drop(list(self._entries))
+    
+    def snapshot(self):
+        """Get the current statistics.
+        
+        Returns:
+            dict: Entry count, size, limits and hit/miss counters
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': sum(entry['size'] for entry in self._entries.values()),
+                'max_bytes': self.max_bytes,
+                'directory': self.directory,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+    
+    def _evict(self):
+        """Drop least recently used PDFs until under the size limit (lock held)."""
+        total = sum(entry['size'] for entry in self._entries.values())
+        while total > self.max_bytes and self._entries:
+            key, entry = next(iter(self._entries.items()))
+            total -= entry['size']
+            self._drop([key])
+            self.evictions += 1
+    
+    def _drop(self, keys):
+        """Forget entries and delete their files (lock held)."""
+        for key in keys:
+            entry = self._entries.pop(key)
+            try:
+                os.remove(entry['path'])
+            except FileNotFoundError:
+                pass
+
+
+PDF_CACHE = PdfCache()
+
+
+def configure_pdf_cache(settings=None):
+    """Apply the [pdf_cache] settings to the process-wide cache.
+    
+    Args:
+        settings: Optional mapping with directory and max_mb
+    """
+    settings = settings or {}
+    PDF_CACHE.configure(
+        settings.get("directory"),
+        float(settings.get("max_mb", DEFAULT_MAX_MB)) * 1024 * 1024
+    )
@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Upper bounds (ms) of the checkout wait-time histogram buckets
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+class PoolStats:
+    """Process-wide connection pool telemetry"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Clear all counters."""
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.peak_checked_out = 0
+            self.wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+            self.started_at = time.time()
+    
+    def record_checkout(self, wait_ms, checked_out):
+        """Record a successful checkout.
+        
+        Args:
+            wait_ms: Time spent waiting for the connection in milliseconds
+            checked_out: Number of connections checked out after this one
+        """
+        bucket = len(WAIT_BUCKETS_MS)
+        for i, upper in enumerate(WAIT_BUCKETS_MS):
+            if wait_ms <= upper:
+                bucket = i
+                break
+        
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.wait_histogram[bucket] += 1
+    
+    def record_timeout(self):
+        """Record a checkout that gave up after pool_timeout."""
+        with self._lock:
+            self.timeouts += 1
+    
+    def snapshot(self, pool=None):
+        """Get a consistent copy of the current statistics.
+        
+        Args:
+            pool: Optional pool to include live size/checked-out figures from
+        
+        Returns:
+            dict: Statistics suitable for display or export
+        """
+        with self._lock:
+            data = {
+                'captured_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'uptime_seconds': round(time.time() - self.started_at),
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'avg_wait_ms': round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait_ms, 3),
+                'peak_checked_out': self.peak_checked_out,
+                'wait_histogram': [
+                    {'le_ms': upper, 'count': count}
+                    for upper, count in zip(list(WAIT_BUCKETS_MS) + ['inf'], self.wait_histogram)
+                ]
+            }
+        
+        if pool is not None and isinstance(pool, QueuePool):
+            data.update({
+                'pool_size': pool.size(),
+                'checked_out': pool.checkedout(),
+                'checked_in': pool.checkedin(),
+                'overflow': max(pool.overflow(), 0),
+                'max_overflow': pool._max_overflow,
+                'pool_timeout': pool.timeout()
+            })
+        
+        return data
+    
+    def export_json(self, pool=None):
+        """Serialize a snapshot as JSON."""
+        return json.dumps(self.snapshot(pool), indent=2)
+
+
+POOL_STATS = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports checkout wait times to POOL_STATS.
+    
+    The measured wait covers everything between asking the pool for a
+    connection and getting one back, i.e. queueing for a free slot plus
+    opening a new connection when the pool has to grow.
+    """
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            POOL_STATS.record_timeout()
+            raise
+        
+        POOL_STATS.record_checkout((time.perf_counter() - start) * 1000, self.checkedout())
+        return conn
@@ -1,5 +1,6 @@
 import streamlit as st
 from sqlalchemy import text
+from database.models.system_counters_model import SystemCountersModel
 from pages.common.components import (
     display_profile_header, display_stats_card, 
     display_report_item, display_task_item
@@ -9,6 +10,7 @@ from pages.admin.messaging import manage_messages
 from pages.admin.employees import manage_employees
 from pages.admin.reports import view_all_reports
 from pages.admin.tasks import manage_tasks
+from pages.admin.system import system_status
 from utils.auth import logout
 from utils.helpers import calculate_completion_rate
 
@@ -38,6 +40,8 @@ def admin_dashboard(engine):
         view_all_reports(engine)
     elif selected == "Tasks":
         manage_tasks(engine)
+    elif selected == "System":
+        system_status(engine)
     elif selected == "Logout":
         logout()
 
@@ -49,7 +53,7 @@ def admin_navigation():
     """
     return st.sidebar.radio(
         "Navigation",
-        ["Dashboard", "Companies", "Messages", "Employees", "Reports", "Tasks", "Logout"],
+        ["Dashboard", "Companies", "Messages", "Employees", "Reports", "Tasks", "System", "Logout"],
         index=0
     )
 
@@ -63,36 +67,8 @@ def display_admin_dashboard_overview(engine):
     
     # Statistics
     with engine.connect() as conn:
-        # Total companies
-        result = conn.execute(text('SELECT COUNT(*) FROM companies WHERE is_active = TRUE'))
-        total_companies = result.fetchone()[0]
-        
-        # Total branches
-        result = conn.execute(text('SELECT COUNT(*) FROM branches WHERE is_active = TRUE'))
-        total_branches = result.fetchone()[0]
-        
-        # Total employees
-        result = conn.execute(text('SELECT COUNT(*) FROM employees WHERE is_active = TRUE'))
-        total_employees = result.fetchone()[0]
-        
-        # Total reports
-        result = conn.execute(text('SELECT COUNT(*) FROM daily_reports'))
-        total_reports = result.fetchone()[0]
-        
-        # Total tasks
-        result = conn.execute(text('SELECT COUNT(*) FROM tasks'))
-        total_tasks = result.fetchone()[0]
-        
-        # Completed tasks
-        result = conn.execute(text('SELECT COUNT(*) FROM tasks WHERE is_completed = TRUE'))
-        completed_tasks = result.fetchone()[0]
-        
-        # Unread messages
-        result = conn.execute(text('''
-        SELECT COUNT(*) FROM messages 
-        WHERE receiver_type = 'admin' AND is_read = FALSE
-        '''))
-        unread_messages = result.fetchone()[0]
+        # Global figures, kept current by triggers (one row read)
+        counters = SystemCountersModel.get_counters(conn)
         
         # Recent company additions
         result = conn.execute(text('''
@@ -119,28 +95,28 @@ def display_admin_dashboard_overview(engine):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        display_stats_card(total_companies, "Active Companies")
+        display_stats_card(counters.active_companies, "Active Companies")
     
     with col2:
-        display_stats_card(total_branches, "Active Branches")
+        display_stats_card(counters.active_branches, "Active Branches")
     
     with col3:
-        display_stats_card(total_employees, "Active Employees")
+        display_stats_card(counters.active_employees, "Active Employees")
     
     with col4:
-        display_stats_card(unread_messages, "Unread Messages")
+        display_stats_card(counters.unread_admin_messages, "Unread Messages")
     
     # Second row of stats
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        display_stats_card(total_reports, "Total Reports")
+        display_stats_card(counters.total_reports, "Total Reports")
     
     with col2:
-        display_stats_card(total_tasks, "Total Tasks")
+        display_stats_card(counters.total_tasks, "Total Tasks")
     
     with col3:
-        completion_rate = calculate_completion_rate(total_tasks, completed_tasks)
+        completion_rate = calculate_completion_rate(counters.total_tasks, counters.completed_tasks)
         display_stats_card(f"{completion_rate}%", "Task Completion")
     
     # Recent activities
@@ -1,6 +1,7 @@
 import streamlit as st
 from sqlalchemy import text
-from database.models import EmployeeModel
+from database.models import BranchModel, EmployeeModel
+from pages.common.pagination import current_cursor, display_page_controls, display_page_size
 
 def manage_employees(engine):
     """Manage employees - listing, adding, activating/deactivating.
@@ -24,14 +25,19 @@ def display_employee_list(engine):
     Args:
         engine: SQLAlchemy database engine
     """
-    # Fetch and display all employees
+    page_size = display_page_size("admin_employees", "Employees per page")
+    
+    # Fetch and display one page of employees
     with engine.connect() as conn:
-        employees = EmployeeModel.get_all_employees(conn)
+        employees, next_cursor = EmployeeModel.get_employees_page(
+            conn, after=current_cursor("admin_employees"), limit=page_size
+        )
+        total_estimate = EmployeeModel.estimate_employee_count(conn)
     
     if not employees:
         st.info("No employees found. Add employees using the 'Add New Employee' tab.")
     else:
-        st.write(f"Total employees: {len(employees)}")
+        st.write(f"Total employees: about {total_estimate:,}")
         
         for i, employee in enumerate(employees):
             with st.expander(f"{employee[2]} ({employee[1]})", expanded=False):
@@ -70,6 +76,8 @@ def display_employee_list(engine):
                             with engine.connect() as conn:
                                 EmployeeModel.reset_password(conn, employee[0], new_password)
                             st.success(f"Password reset to '{new_password}' for {employee[2]}")
+    
+    display_page_controls("admin_employees", len(employees), next_cursor, total_estimate)
 
 def add_new_employee(engine):
     """Form to add a new employee.
@@ -77,8 +85,18 @@ def add_new_employee(engine):
     Args:
         engine: SQLAlchemy database engine
     """
+    with engine.connect() as conn:
+        branches = BranchModel.get_active_branches(conn)
+    
+    if not branches:
+        st.warning("No active branches found. Create a branch first.")
+        return
+    
+    branch_options = {f"{branch[2]} - {branch[1]}": branch[0] for branch in branches}
+    
     # Form to add new employee
     with st.form("add_employee_form"):
+        selected_branch = st.selectbox("Branch", list(branch_options.keys()))
         username = st.text_input("Username", help="Username for employee login")
         password = st.text_input("Password", type="password", help="Initial password")
         full_name = st.text_input("Full Name")
@@ -100,7 +118,8 @@ def add_new_employee(engine):
                     else:
                         # Insert new employee
                         try:
-                            EmployeeModel.add_employee(conn, username, password, full_name, profile_pic_url)
-                            st.success(f"Successfully added employee: {full_name}")
+                            EmployeeModel.add_employee(conn, branch_options[selected_branch], username, password,
+                                                       full_name, profile_pic_url)
+                            st.success(f"Successfully added employee: {full_name} (General Employee)")
                         except Exception as e:
                             st.error(f"Error adding employee: {e}")
@@ -1,6 +1,7 @@
 import streamlit as st
 import datetime
 from database.models import MessageModel, CompanyModel
+from pages.common.pagination import current_cursor, display_page_controls, display_page_size
 
 def manage_messages(engine):
     """Admin message management - send and view messages to/from companies.
@@ -24,26 +25,42 @@ def view_messages(engine):
     Args:
         engine: SQLAlchemy database engine
     """
-    # Fetch all messages for admin
+    page_size = display_page_size("admin_messages", "Messages per page")
+    
+    # Fetch the latest page of messages for admin
     with engine.connect() as conn:
-        messages = MessageModel.get_messages_for_admin(conn)
+        messages, older_cursor = MessageModel.get_admin_messages_page(
+            conn, before_id=current_cursor("admin_messages"), limit=page_size
+        )
     
     if not messages:
         st.info("No messages found.")
     else:
-        st.write(f"Total messages: {len(messages)}")
-        
         # Group messages by sender
         messages_by_sender = {}
         for message in messages:
-            sender_name = message[6]  # sender_name from query
-            if sender_name not in messages_by_sender:
-                messages_by_sender[sender_name] = []
-            messages_by_sender[sender_name].append(message)
+            sender_key = (message[1], message[2], message[6])  # sender type, id and name
+            if sender_key not in messages_by_sender:
+                messages_by_sender[sender_key] = []
+            messages_by_sender[sender_key].append(message)
         
         # Display messages by sender
-        for sender_name, sender_messages in messages_by_sender.items():
-            with st.expander(f"Messages from {sender_name} ({len(sender_messages)})", expanded=False):
+        for (sender_type, sender_id, sender_name), sender_messages in messages_by_sender.items():
+            unread = sum(1 for message in sender_messages if not message[4])
+            label = f"Messages from {sender_name} ({len(sender_messages)}"
+            label += f", {unread} unread)" if unread else ")"
+            
+            with st.expander(label, expanded=False):
+                if unread and st.button("Mark All as Read", key=f"mark_all_read_{sender_type}_{sender_id}"):
+                    # Newest message of this sender on the page; older unread ones are included
+                    with engine.connect() as conn:
+                        MessageModel.mark_conversation_read(
+                            conn, "admin", 0, up_to_id=sender_messages[0][0],
+                            sender_type=sender_type, sender_id=sender_id
+                        )
+                    st.success(f"Messages from {sender_name} marked as read")
+                    st.rerun()
+                
                 for message in sender_messages:
                     message_id = message[0]
                     message_text = message[3]
@@ -72,6 +89,9 @@ def view_messages(engine):
                                 MessageModel.mark_as_read(conn, message_id)
                             st.success("Message marked as read")
                             st.rerun()
+    
+    display_page_controls("admin_messages", len(messages), older_cursor,
+                          previous_label="Newer", next_label="Older")
 
 def send_message(engine):
     """Send a message to a company.
@@ -1,6 +1,10 @@
 import streamlit as st
 import datetime
-from database.models import ReportModel, EmployeeModel
+from database.models.employee_model import EmployeeModel
+from database.models.report_model import ReportModel
+from database.pdf_cache import PDF_CACHE
+from pages.common.export_jobs import display_export_jobs
+from pages.common.pagination import display_load_older, load_chunks
 from utils.pdf_generator import create_employee_report_pdf
 from utils.helpers import get_date_range_from_filter
 
@@ -12,6 +16,10 @@ def view_all_reports(engine):
     """
     st.markdown('<h2 class="sub-header">Employee Reports</h2>', unsafe_allow_html=True)
     
+    # Background exports of every company
+    with st.expander("Export Jobs", expanded=False):
+        display_export_jobs(engine, key="admin_export_jobs")
+    
     # Filters
     col1, col2, col3 = st.columns(3)
     
@@ -20,8 +28,10 @@ def view_all_reports(engine):
         with engine.connect() as conn:
             employees = EmployeeModel.get_active_employees(conn)
         
-        employee_options = ["All Employees"] + [emp[1] for emp in employees]
+        employee_ids = {emp[1]: emp[0] for emp in employees}
+        employee_options = ["All Employees"] + list(employee_ids.keys())
         employee_filter = st.selectbox("Select Employee", employee_options, key="reports_employee_filter")
+        employee_id = employee_ids.get(employee_filter)
     
     with col2:
         # Date range filter
@@ -42,56 +52,69 @@ def view_all_reports(engine):
             start_date = st.date_input("Start Date", today - datetime.timedelta(days=30))
             end_date = st.date_input("End Date", today)
         else:
-            # Set default dates based on filter
-            start_date, end_date = get_date_range_from_filter(date_filter)
+            # Set default dates based on filter; "All Time" starts at the first report
+            first_date = None
+            if date_filter == "All Time":
+                with engine.connect() as conn:
+                    first_date, _ = ReportModel.get_report_span(conn, employee_id=employee_id)
+            start_date, end_date = get_date_range_from_filter(date_filter, first_date)
+    
+    # Newest reports first, older ones on demand
+    def fetch(cursor):
+        with engine.connect() as conn:
+            return ReportModel.get_reports_chunk(conn, start_date, end_date, employee_id=employee_id, before=cursor)
     
-    # Fetch reports based on filters
-    with engine.connect() as conn:
-        reports = ReportModel.get_all_reports(conn, start_date, end_date, employee_name=employee_filter)
+    reports, next_cursor = load_chunks("admin_reports", (employee_id, start_date, end_date), fetch)
     
     # Display reports
     if not reports:
         st.info("No reports found for the selected criteria")
-    else:
+        return
+    
+    if next_cursor is None:
         st.write(f"Found {len(reports)} reports")
-        
-        # Group by employee for export
-        employee_reports = {}
-        for report in reports:
-            if report[0] not in employee_reports:
-                employee_reports[report[0]] = []
-            employee_reports[report[0]].append(report)
-        
-        # Export options
-        col1, col2 = st.columns([3, 1])
-        with col2:
-            if employee_filter != "All Employees" and len(employee_reports) == 1:
-                if st.button("Export as PDF"):
-                    pdf = create_employee_report_pdf(reports, employee_filter)
+    else:
+        st.write(f"Showing the newest {len(reports)} reports")
+    
+    # Export options
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        if employee_id is not None:
+            if st.button("Export as PDF"):
+                def render():
+                    with engine.connect() as conn:
+                        all_reports = ReportModel.get_employee_reports(conn, employee_id, start_date, end_date)
+                    return create_employee_report_pdf(all_reports, employee_filter)
+                
+                with engine.connect() as conn:
+                    version = ReportModel.get_reports_version(conn, start_date, end_date, employee_id=employee_id)
+                pdf = PDF_CACHE.get_or_render(
+                    PDF_CACHE.key(("employee_name", employee_filter), {}, start_date, end_date, version),
+                    render,
+                    start_date=start_date, end_date=end_date
+                )
+                with pdf:
                     st.download_button(
                         label="Download PDF",
                         data=pdf,
                         file_name=f"{employee_filter}_reports_{start_date}_to_{end_date}.pdf",
                         mime="application/pdf"
                     )
-        
-        # Display reports
-        for employee_name, emp_reports in employee_reports.items():
-            with st.expander(f"Reports by {employee_name} ({len(emp_reports)})", expanded=True):
-                # Group by month/year for better organization
-                reports_by_period = {}
-                for report in emp_reports:
-                    period = report[1].strftime('%B %Y')
-                    if period not in reports_by_period:
-                        reports_by_period[period] = []
-                    reports_by_period[period].append(report)
-                
-                for period, period_reports in reports_by_period.items():
-                    st.markdown(f"##### {period}")
-                    for report in period_reports:
-                        st.markdown(f'''
-                        <div class="report-item">
-                            <span style="color: #777;">{report[1].strftime('%A, %d %b %Y')}</span>
-                            <p>{report[2]}</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
+    
+    # Group by month/year for better organization
+    reports_by_period = {}
+    for report in reports:
+        reports_by_period.setdefault(report.report_date.strftime('%B %Y'), []).append(report)
+    
+    for period, period_reports in reports_by_period.items():
+        st.markdown(f"##### {period}")
+        for report in period_reports:
+            st.markdown(f'''
+            <div class="report-item">
+                <strong>{report.full_name}</strong>
+                <span style="color: #777;">{report.report_date.strftime('%A, %d %b %Y')}</span>
+                <p>{report.report_text}</p>
+            </div>
+            ''', unsafe_allow_html=True)
+    
+    display_load_older("admin_reports", next_cursor)
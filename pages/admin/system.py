@@ -0,0 +1,236 @@
+import streamlit as st
+import pandas as pd
+import time
+from pages.common.components import display_stats_card
+from database.cache import QUERY_CACHE
+from database.instrumentation import QUERY_STATS
+from database.pdf_cache import PDF_CACHE
+from database.pool_stats import POOL_STATS
+from database.models.report_model import ReportModel
+from database.models.system_counters_model import SystemCountersModel
+
+def system_status(engine):
+    """Display system health information for administrators.
+    
+    Args:
+        engine: SQLAlchemy database engine
+    """
+    st.markdown('<h2 class="sub-header">System Status</h2>', unsafe_allow_html=True)
+    
+    display_pool_stats(engine)
+    
+    display_query_stats()
+    
+    display_cache_stats()
+    
+    display_pdf_cache_stats()
+    
+    display_counters(engine)
+
+def display_pool_stats(engine):
+    """Display connection pool telemetry with export options.
+    
+    Args:
+        engine: SQLAlchemy database engine
+    """
+    st.markdown("### Connection Pool")
+    
+    stats = POOL_STATS.snapshot(engine.pool)
+    
+    if "pool_size" not in stats:
+        st.info("Live pool figures are only available for queue-based pools.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        
+        with col1:
+            display_stats_card(f"{stats['checked_out']}/{stats['pool_size']}", "Checked Out")
+        
+        with col2:
+            display_stats_card(f"{stats['overflow']}/{stats['max_overflow']}", "Overflow In Use")
+        
+        with col3:
+            display_stats_card(stats['peak_checked_out'], "Peak Checked Out")
+        
+        with col4:
+            display_stats_card(stats['timeouts'], "Checkout Timeouts")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        display_stats_card(stats['checkouts'], "Checkouts")
+    
+    with col2:
+        display_stats_card(f"{stats['avg_wait_ms']} ms", "Avg Wait")
+    
+    with col3:
+        display_stats_card(f"{stats['max_wait_ms']} ms", "Max Wait")
+    
+    # Wait-time histogram
+    st.markdown("#### Checkout Wait Time")
+    histogram = pd.DataFrame(stats['wait_histogram'])
+    # Zero-padded labels keep the buckets in order on the chart axis
+    histogram['bucket'] = histogram['le_ms'].apply(lambda upper: f"≤ {upper:04d} ms" if upper != 'inf' else "≤ ∞")
+    st.bar_chart(histogram.set_index('bucket')['count'])
+    
+    st.caption(f"Collected over {stats['uptime_seconds']} seconds in this server process.")
+    
+    # Export and reset
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.download_button(
+            label="Export Pool Stats (JSON)",
+            data=POOL_STATS.export_json(engine.pool),
+            file_name=f"pool_stats_{stats['captured_at'].replace(' ', '_').replace(':', '')}.json",
+            mime="application/json"
+        )
+    
+    with col2:
+        if st.button("Reset Counters", key="reset_pool_stats"):
+            POOL_STATS.reset()
+            st.rerun()
+
+def display_query_stats():
+    """Display per-page SQL rollups and recent slow queries."""
+    st.markdown("### SQL by Page")
+    
+    summary = QUERY_STATS.summary()
+    
+    if not summary:
+        st.info("No statements recorded yet in this server process.")
+    else:
+        df = pd.DataFrame(summary).rename(columns={
+            'page': 'Page Function',
+            'reruns': 'Reruns',
+            'avg_queries': 'Avg Queries',
+            'max_queries': 'Max Queries',
+            'avg_db_ms': 'Avg DB ms',
+            'max_db_ms': 'Max DB ms',
+            'max_repeats': 'Max Repeats'
+        })
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        st.caption(
+            f"Rolling window of the last reruns per page. 'Max Repeats' is the most times one "
+            f"statement ran in a single rerun; high values usually mean a query inside a loop. "
+            f"{QUERY_STATS.statements} statements recorded since "
+            f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(QUERY_STATS.started_at))}."
+        )
+    
+    st.markdown(f"#### Slow Queries (≥ {QUERY_STATS.slow_query_ms:g} ms)")
+    
+    if QUERY_STATS.slow_queries:
+        st.dataframe(pd.DataFrame(list(QUERY_STATS.slow_queries)), use_container_width=True, hide_index=True)
+    else:
+        st.info("No slow queries recorded")
+    
+    if st.button("Reset SQL Stats", key="reset_query_stats"):
+        QUERY_STATS.reset()
+        st.rerun()
+
+def display_cache_stats():
+    """Display query result cache statistics with clear/reset actions."""
+    st.markdown("### Query Cache")
+    
+    stats = QUERY_CACHE.snapshot()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        display_stats_card(f"{stats['entries']}/{stats['max_entries']}", "Entries")
+    
+    with col2:
+        display_stats_card(f"{stats['hit_rate']}%", "Hit Rate")
+    
+    with col3:
+        display_stats_card(f"{stats['hits']}/{stats['misses']}", "Hits / Misses")
+    
+    with col4:
+        display_stats_card(stats['invalidations'], "Invalidated")
+    
+    if stats['entries_by_namespace']:
+        st.bar_chart(pd.Series(stats['entries_by_namespace'], name="entries"))
+    
+    st.caption(f"Entries expire after {stats['ttl_seconds']} seconds; {stats['evictions']} evicted by the size limit.")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("Clear Cache", key="clear_query_cache"):
+            QUERY_CACHE.clear()
+            st.rerun()
+    
+    with col2:
+        if st.button("Reset Counters", key="reset_cache_stats"):
+            QUERY_CACHE.reset_stats()
+            st.rerun()
+
+def display_pdf_cache_stats():
+    """Display report PDF cache statistics with clear/reset actions."""
+    st.markdown("### Report PDF Cache")
+    
+    stats = PDF_CACHE.snapshot()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        display_stats_card(stats['entries'], "PDFs")
+    
+    with col2:
+        display_stats_card(f"{stats['bytes'] / 2**20:.1f}/{stats['max_bytes'] / 2**20:.0f} MB", "Disk Used")
+    
+    with col3:
+        display_stats_card(f"{stats['hit_rate']}%", "Hit Rate")
+    
+    with col4:
+        display_stats_card(stats['invalidations'], "Invalidated")
+    
+    st.caption(
+        f"{stats['hits']} hits, {stats['misses']} misses, {stats['evictions']} evicted by the size limit. "
+        f"Stored in {stats['directory'] or 'a temporary directory (created on first use)'}."
+    )
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if st.button("Clear Cache", key="clear_pdf_cache"):
+            PDF_CACHE.clear()
+            st.rerun()
+    
+    with col2:
+        if st.button("Reset Counters", key="reset_pdf_cache_stats"):
+            PDF_CACHE.reset_stats()
+            st.rerun()
+
+def display_counters(engine):
+    """Display the trigger-maintained overview counters with a recount action.
+    
+    Args:
+        engine: SQLAlchemy database engine
+    """
+    st.markdown("### Overview Counters")
+    
+    with engine.connect() as conn:
+        counters = SystemCountersModel.get_counters(conn)
+    
+    st.caption(f"Last changed: {counters.updated_at.strftime('%Y-%m-%d %H:%M:%S') if counters.updated_at else 'Never'}")
+    
+    if st.button("Recount From Tables", key="recount_system_counters"):
+        with engine.connect() as conn:
+            result = SystemCountersModel.recount(conn)
+        
+        drifted = {column: values for column, values in result.items() if values[0] != values[1]}
+        if drifted:
+            st.warning("Repaired: " + ", ".join(
+                f"{column} {stored} → {recounted}" for column, (stored, recounted) in drifted.items()
+            ))
+        else:
+            st.success("All counters were accurate")
+    
+    if st.button("Rebuild Report Rollups", key="rebuild_report_rollups"):
+        with engine.connect() as conn:
+            rows, drifted = ReportModel.rebuild_rollups(conn)
+        
+        if drifted:
+            st.warning(f"Repaired {drifted} of {rows} monthly report rollups")
+        else:
+            st.success(f"All {rows} monthly report rollups were accurate")
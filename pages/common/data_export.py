@@ -0,0 +1,51 @@
+import os
+import streamlit as st
+from utils.data_export import FORMATS, available_formats, export_rows
+
+def display_data_export(engine, stream, columns, file_name, key):
+    """Offer a raw data export (CSV or Parquet) of streamed rows.
+    
+    Rows are read through a server-side cursor and written in batches to
+    a temporary file, so the export does not hold the result set in
+    memory while it is built.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        stream: Callable taking a connection and returning a row iterator,
+            e.g. a model stream_* method
+        columns: List of utils.data_export.ExportColumn in row order
+        file_name: File name without extension
+        key: Unique widget key prefix
+    """
+    col1, col2 = st.columns([1, 1])
+    
+    with col1:
+        file_format = st.selectbox("Data format", available_formats(), key=f"{key}_format")
+    
+    with col2:
+        st.write("")
+        export_clicked = st.button("Export Data", key=f"{key}_export")
+    
+    if not export_clicked:
+        return
+    
+    with st.spinner("Exporting..."):
+        with engine.connect() as conn:
+            path, count = export_rows(stream(conn), columns, file_format)
+    
+    try:
+        if not count:
+            st.info("Nothing to export.")
+            return
+        
+        extension, mime = FORMATS[file_format]
+        with open(path, 'rb') as data:
+            st.download_button(
+                label=f"Download {file_format} ({count} rows)",
+                data=data,
+                file_name=f"{file_name}.{extension}",
+                mime=mime,
+                key=f"{key}_download"
+            )
+    finally:
+        os.remove(path)
@@ -0,0 +1,98 @@
+import streamlit as st
+from database.models.export_job_model import ExportJobModel
+from utils.export_jobs import EXPORT_JOBS, configure_export_jobs
+
+STATUS_LABELS = {
+    'queued': "⏳ Queued",
+    'running': "⚙️ Rendering",
+    'done': "✅ Ready",
+    'failed': "❌ Failed"
+}
+
+@st.cache_resource
+def init_export_jobs():
+    """Apply the [export_jobs] secrets to the job runner once per process."""
+    configure_export_jobs(st.secrets.get("export_jobs", {}))
+
+def submit_export(engine, company_id, kind, params, title):
+    """Queue a background export for the logged-in user and report the outcome.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        company_id: Company the export belongs to (None for admin-wide exports)
+        kind: Export kind (see utils.export_jobs.RENDERERS)
+        params: Render parameters for the kind
+        title: Human readable description of the export
+    """
+    init_export_jobs()
+    user = st.session_state.user
+    try:
+        EXPORT_JOBS.submit(engine, company_id, user["user_type"], user.get("id", 0), kind, params, title)
+    except ValueError as e:
+        st.error(str(e))
+    else:
+        st.success(f"Export queued: {title}. It will appear under Exports when ready.")
+
+def display_export_jobs(engine, company_id=None, key="export_jobs"):
+    """Display recent export jobs with download and delete actions.
+    
+    While any job is queued or rendering, the panel refreshes itself
+    every few seconds without rerunning the rest of the page.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        company_id: Company whose jobs to show; None shows every company's
+        key: Unique key prefix for the panel's widgets
+    """
+    init_export_jobs()
+    
+    @st.fragment(run_every=3 if st.session_state.get(f"{key}_active") else None)
+    def panel():
+        EXPORT_JOBS.dispatch(engine)
+        with engine.connect() as conn:
+            jobs = ExportJobModel.get_jobs(conn, company_id)
+        
+        active = any(job.status in ('queued', 'running') for job in jobs)
+        if active != st.session_state.get(f"{key}_active", False):
+            # Switch auto-refresh on or off
+            st.session_state[f"{key}_active"] = active
+            st.rerun()
+        
+        st.markdown("#### Exports")
+        if not jobs:
+            st.info("No exports yet. Large PDFs are rendered in the background and listed here.")
+            return
+        
+        for job in jobs:
+            cols = st.columns([4, 2, 2, 1])
+            with cols[0]:
+                title = job.title if company_id else f"{job.company_name or 'All companies'} · {job.title}"
+                st.write(title)
+                st.caption(f"Requested {job.created_at.strftime('%d %b %Y %H:%M')}")
+            with cols[1]:
+                st.write(STATUS_LABELS.get(job.status, job.status))
+                if job.status == 'done' and job.started_at:
+                    st.caption(f"{(job.finished_at - job.started_at).total_seconds():.0f}s · "
+                               f"{job.file_size / 1024:,.0f} KB")
+                elif job.status == 'failed' and job.error:
+                    st.caption(job.error)
+            with cols[2]:
+                if job.status == 'done':
+                    try:
+                        with open(job.file_path, 'rb') as pdf:
+                            st.download_button(
+                                label="Download PDF",
+                                data=pdf,
+                                file_name=f"{job.title}.pdf",
+                                mime="application/pdf",
+                                key=f"{key}_download_{job.id}"
+                            )
+                    except OSError:
+                        st.caption("File no longer available")
+            with cols[3]:
+                if job.status in ('done', 'failed'):
+                    if st.button("Delete", key=f"{key}_delete_{job.id}"):
+                        EXPORT_JOBS.delete(engine, job.id, company_id)
+                        st.rerun()
+    
+    panel()
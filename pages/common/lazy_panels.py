@@ -0,0 +1,44 @@
+import time
+import streamlit as st
+from database.instrumentation import QUERY_STATS, panel_logger
+
+def display_lazy_panels(key, panels):
+    """Display a tab-like panel selector that only runs the active panel.
+    
+    Unlike st.tabs, which executes every tab body on each rerun, only the
+    selected panel's loader is called. Widget state of the other panels
+    is carried over until they are reopened, so switching back finds
+    checkboxes, inputs and selections as they were left. The queries the
+    active panel ran are written to the panel log (see
+    database.instrumentation).
+    
+    Args:
+        key: Unique key for this panel set
+        panels: List of (label, loader) pairs; loaders take no arguments
+    """
+    labels = [label for label, _ in panels]
+    active = st.radio(key, labels, key=key, horizontal=True, label_visibility="collapsed")
+    
+    # Streamlit drops the state of widgets that aren't rendered in a run;
+    # re-assigning the keys owned by the hidden panels keeps it
+    owned_keys = st.session_state.setdefault(f"{key}__owned_keys", {})
+    for label, panel_keys in owned_keys.items():
+        if label != active:
+            for widget_key in panel_keys:
+                if widget_key in st.session_state:
+                    st.session_state[widget_key] = st.session_state[widget_key]
+    
+    existing_keys = set(st.session_state.keys())
+    mark = QUERY_STATS.mark()
+    start = time.perf_counter()
+    
+    dict(panels)[active]()
+    
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    queries, db_ms = QUERY_STATS.since(mark)
+    owned_keys.setdefault(active, set()).update(set(st.session_state.keys()) - existing_keys)
+    
+    panel_logger.info(
+        "panel=%s/%s queries=%d db_ms=%.1f total_ms=%.1f",
+        key, active, queries, db_ms, elapsed_ms
+    )
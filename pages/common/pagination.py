@@ -0,0 +1,109 @@
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100]
+
+def display_page_size(key, label="Rows per page"):
+    """Display the page size selector of a keyset-paginated list.
+    
+    Changing the size goes back to the first page.
+    
+    Args:
+        key: Unique key of the paginated list
+        label: Selector label
+    
+    Returns:
+        int: Selected page size
+    """
+    state = st.session_state.setdefault(f"{key}_pages", {'cursors': [None], 'page_size': PAGE_SIZES[0]})
+    page_size = st.selectbox(label, PAGE_SIZES, index=PAGE_SIZES.index(state['page_size']),
+                             key=f"{key}_page_size")
+    if page_size != state['page_size']:
+        state['page_size'] = page_size
+        state['cursors'] = [None]
+    return page_size
+
+def reset_pages(key):
+    """Go back to the first page, e.g. after the list's filters changed."""
+    st.session_state[f"{key}_pages"]['cursors'] = [None]
+
+def current_cursor(key):
+    """Get the cursor the current page starts after (None on the first page)."""
+    return st.session_state[f"{key}_pages"]['cursors'][-1]
+
+def display_page_controls(key, rows_on_page, next_cursor, total_estimate=None,
+                          previous_label="Previous", next_label="Next"):
+    """Display previous/next buttons and the position in the list.
+    
+    Args:
+        key: Unique key of the paginated list
+        rows_on_page: Number of rows shown on the current page
+        next_cursor: Cursor returned with the current page, None on the last page
+        total_estimate: Optional estimated total number of rows
+        previous_label: Label of the button going back a page
+        next_label: Label of the button going forward a page
+    """
+    state = st.session_state[f"{key}_pages"]
+    page_number = len(state['cursors'])
+    first_row = (page_number - 1) * state['page_size'] + 1
+    last_row = first_row + rows_on_page - 1
+    
+    position = f"Showing {first_row:,}-{last_row:,}" if rows_on_page else "No rows"
+    if total_estimate is not None:
+        # The estimate can lag behind; never show fewer than already seen
+        position += f" of about {max(total_estimate, last_row):,}"
+    
+    cols = st.columns([1, 3, 1])
+    with cols[0]:
+        if st.button(previous_label, key=f"{key}_previous", disabled=page_number == 1):
+            state['cursors'].pop()
+            st.rerun()
+    with cols[1]:
+        st.write(f"Page {page_number} · {position}")
+    with cols[2]:
+        if st.button(next_label, key=f"{key}_next", disabled=next_cursor is None):
+            state['cursors'].append(next_cursor)
+            st.rerun()
+
+def load_chunks(key, filters, fetch):
+    """Load every chunk shown so far of a "load older" list.
+    
+    Only the cursors are kept in the session; each run reloads the chunks
+    shown so far, which are cheap keyset reads. Changing the filters
+    goes back to the newest chunk.
+    
+    Args:
+        key: Unique key of the list
+        filters: Hashable description of the list's filters
+        fetch: Callable taking a cursor (None for the newest chunk) and
+            returning (rows, cursor of the next older chunk or None)
+    
+    Returns:
+        Tuple of (rows of the loaded chunks, cursor of the next older chunk or None)
+    """
+    state = st.session_state.setdefault(f"{key}_chunks", {'filters': filters, 'cursors': [None]})
+    if state['filters'] != filters:
+        state['filters'] = filters
+        state['cursors'] = [None]
+    
+    rows = []
+    next_cursor = None
+    for cursor in state['cursors']:
+        chunk, next_cursor = fetch(cursor)
+        rows.extend(chunk)
+        if next_cursor is None:
+            break
+    return rows, next_cursor
+
+def display_load_older(key, next_cursor, label="Load older"):
+    """Display the button loading the next older chunk of a list.
+    
+    Args:
+        key: Unique key of the list (as given to load_chunks)
+        next_cursor: Cursor returned by load_chunks, None when all is loaded
+        label: Button label
+    """
+    if next_cursor is None:
+        return
+    if st.button(label, key=f"{key}_load_older"):
+        st.session_state[f"{key}_chunks"]['cursors'].append(next_cursor)
+        st.rerun()
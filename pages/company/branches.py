@@ -1,6 +1,7 @@
 import streamlit as st
+import datetime
 from sqlalchemy import text
-from database.models import BranchModel
+from database.models.branch_model import BranchModel
 
 def manage_branches(engine):
     """Manage branches including sub-branches.
@@ -30,44 +31,27 @@ def display_branch_list(engine, company_id):
         engine: SQLAlchemy database engine
         company_id: ID of the current company
     """
-    # Fetch all branches
+    # Fetch the whole tree with per-subtree figures in one query
     with engine.connect() as conn:
-        branches = BranchModel.get_company_branches(conn, company_id)
+        branches = BranchModel.get_company_tree(conn, company_id, datetime.date.today())
     
     if not branches:
         st.info("No branches found. Please create a main branch first.")
         return
     
-    # Group branches by parent
-    main_branches = []
-    sub_branches = {}
-    
-    for branch in branches:
-        branch_id = branch[0]
-        is_main = branch[5]
-        parent_id = branch[6]
-        
-        if is_main:
-            main_branches.append(branch)
-        elif parent_id:
-            if parent_id not in sub_branches:
-                sub_branches[parent_id] = []
-            sub_branches[parent_id].append(branch)
-    
     # Display branches hierarchically
     st.write(f"Total branches: {len(branches)}")
     
-    # Display main branches first
-    for main_branch in main_branches:
-        display_branch_with_subbranches(engine, main_branch, sub_branches)
+    # Branches arrive depth first, so each sub-branch follows its parent
+    for branch in branches:
+        display_branch(engine, branch)
 
-def display_branch_with_subbranches(engine, branch, sub_branches):
-    """Display a branch and its sub-branches recursively.
+def display_branch(engine, branch):
+    """Display a branch with the figures of its whole subtree.
     
     Args:
         engine: SQLAlchemy database engine
-        branch: Branch data tuple
-        sub_branches: Dictionary of sub-branches by parent ID
+        branch: Branch row from BranchModel.get_company_tree
     """
     branch_id = branch[0]
     branch_name = branch[1]
@@ -75,14 +59,30 @@ def display_branch_with_subbranches(engine, branch, sub_branches):
     branch_head = branch[3] or "No head assigned"
     is_active = branch[4]
     is_main = branch[5]
+    depth = branch[7]
+    ancestor_names = branch[8]
+    rollup = branch[9]
     
     # Branch header with indentation based on level
-    prefix = "📍 Main Branch: " if is_main else "└─ "
+    prefix = "📍 Main Branch: " if is_main else "\u2003" * depth + "└─ "
     with st.expander(f"{prefix}{branch_name}", expanded=False):
+        if ancestor_names:
+            st.write(f"**Part of:** {' › '.join(ancestor_names)}")
         st.write(f"**Location:** {location}")
         st.write(f"**Branch Head:** {branch_head}")
         st.write(f"**Status:** {'Active' if is_active else 'Inactive'}")
         
+        # Figures for this branch and everything below it
+        scope = "this branch" if rollup.branches == 1 else f"this branch and {rollup.branches - 1} sub-branches"
+        st.caption(f"Including {scope}")
+        stat_cols = st.columns(3)
+        with stat_cols[0]:
+            st.metric("Active Employees", rollup.employees)
+        with stat_cols[1]:
+            st.metric("Pending Tasks", rollup.pending_tasks)
+        with stat_cols[2]:
+            st.metric("Reported Today", f"{rollup.report_compliance}%")
+        
         # Action buttons
         col1, col2, col3 = st.columns(3)
         
@@ -120,24 +120,6 @@ def display_branch_with_subbranches(engine, branch, sub_branches):
         # Show employees if requested
         if hasattr(st.session_state, 'view_branch_employees') and st.session_state.view_branch_employees == branch_id:
             display_branch_employees(engine, branch_id, branch_name)
-        
-        # Display sub-branches if any
-        if branch_id in sub_branches:
-            st.markdown("#### Sub-branches:")
-            for sub_branch in sub_branches[branch_id]:
-                with st.container():
-                    st.markdown(f"**{sub_branch[1]}**")
-                    cols = st.columns(4)
-                    with cols[0]:
-                        st.write(f"Location: {sub_branch[2] or 'N/A'}")
-                    with cols[1]:
-                        st.write(f"Head: {sub_branch[3] or 'N/A'}")
-                    with cols[2]:
-                        st.write(f"Status: {'Active' if sub_branch[4] else 'Inactive'}")
-                    with cols[3]:
-                        if st.button(f"Details", key=f"detail_sub_{sub_branch[0]}"):
-                            # Recursively display sub-branches
-                            display_branch_with_subbranches(engine, sub_branch, sub_branches)
 
 def display_branch_employees(engine, branch_id, branch_name):
     """Display employees for a specific branch.
@@ -301,9 +283,14 @@ def edit_branch(engine):
         # Parent branch selection (only for sub-branches)
         parent_id = None
         if not is_main:
-            # Get available parent branches (excluding this branch to prevent circular references)
+            # Get available parent branches, excluding this branch and its own
+            # sub-branches to prevent circular references
             with engine.connect() as conn:
-                parent_branches = BranchModel.get_parent_branches(conn, company_id, exclude_branch_id=branch_id)
+                subtree_ids = {row[0] for row in BranchModel.get_subtree(conn, branch_id)}
+                parent_branches = [
+                    branch for branch in BranchModel.get_parent_branches(conn, company_id)
+                    if branch[0] not in subtree_ids
+                ]
                 
                 if parent_branches:
                     # Get current parent branch
@@ -0,0 +1,83 @@
+import streamlit as st
+import csv
+import io
+import pandas as pd
+from database.models.branch_model import BranchModel
+from database.models.employee_model import EmployeeModel
+from database.models.role_model import RoleModel
+
+def import_employees(engine, company_id):
+    """Bulk import employees from an uploaded CSV file.
+    
+    The whole file is imported or, if any row has an error, nothing is;
+    the errors are listed per row so the file can be fixed and uploaded
+    again.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        company_id: ID of the current company
+    """
+    st.markdown("### Import Employees")
+    
+    with engine.connect() as conn:
+        branches = BranchModel.get_active_branches(conn, company_id)
+        roles = RoleModel.get_all_roles(conn, company_id)
+    
+    if not branches:
+        st.warning("No active branches found. Please add and activate branches first.")
+        return
+    
+    if not roles:
+        st.warning("No roles defined. Please contact your administrator.")
+        return
+    
+    st.write("Upload a CSV file with one employee per row and a header line naming the columns: "
+             "full_name, username, password, branch, role and optionally profile_pic_url. "
+             "Branch and role must match the names below exactly.")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Branches: " + ", ".join(branch[1] for branch in branches))
+    with col2:
+        st.caption("Roles: " + ", ".join(role[1] for role in roles))
+    
+    # Template with the header and one example row
+    template = io.StringIO()
+    writer = csv.writer(template)
+    writer.writerow(["full_name", "username", "password", "branch", "role", "profile_pic_url"])
+    writer.writerow(["Jane Doe", "jane.doe", "change-me", branches[0][1], roles[-1][1], ""])
+    st.download_button(
+        label="Download Template",
+        data=template.getvalue(),
+        file_name="employee_import_template.csv",
+        mime="text/csv"
+    )
+    
+    uploaded = st.file_uploader("Employee CSV", type=["csv"], key="employee_import_file")
+    if uploaded is None:
+        return
+    
+    if not st.button("Import Employees", key="import_employees"):
+        return
+    
+    try:
+        with engine.connect() as conn:
+            result = EmployeeModel.import_employees(conn, company_id, uploaded)
+    except ValueError as e:
+        st.error(str(e))
+        return
+    except Exception as e:
+        st.error(f"Error importing employees: {e}")
+        return
+    
+    if not result.errors:
+        st.success(f"Successfully imported {result.created} employees")
+        return
+    
+    st.error(f"No employees were imported: {len(result.errors)} rows have errors. "
+             "Fix them and upload the file again.")
+    st.dataframe(pd.DataFrame([{
+        'Row': row_number,
+        'Username': username,
+        'Errors': "; ".join(messages)
+    } for row_number, username, messages in result.errors]), use_container_width=True, hide_index=True)
@@ -1,6 +1,9 @@
 import streamlit as st
 from sqlalchemy import text
-from database.models import EmployeeModel, BranchModel, RoleModel
+from database.models import EmployeeModel, BranchModel
+from database.models.role_model import RoleModel
+from pages.common.pagination import current_cursor, display_page_controls, display_page_size
+from pages.company.employee_import import import_employees
 
 def manage_employees(engine):
     """Manage employees with role assignment and branch transfers.
@@ -12,18 +15,21 @@ def manage_employees(engine):
     
     company_id = st.session_state.user["id"]
     
-    tabs = st.tabs(["Employee List", "Add New Employee", "Update Role", "Transfer Branch"])
+    tabs = st.tabs(["Employee List", "Add New Employee", "Import Employees", "Update Role", "Transfer Branch"])
     
     with tabs[0]:
         display_employee_list(engine, company_id)
     
     with tabs[1]:
         add_new_employee(engine, company_id)
-        
+    
     with tabs[2]:
-        update_employee_role(engine, company_id)
+        import_employees(engine, company_id)
         
     with tabs[3]:
+        update_employee_role(engine, company_id)
+    
+    with tabs[4]:
         transfer_employee_branch(engine, company_id)
     
     # Handle edit form if an employee is selected
@@ -37,12 +43,18 @@ def display_employee_list(engine, company_id):
         engine: SQLAlchemy database engine
         company_id: ID of the current company
     """
-    # Get all employees for this company
+    page_size = display_page_size("company_employees", "Employees per page")
+    
+    # Get one page of this company's employees, ordered by branch and role
     with engine.connect() as conn:
-        employees = EmployeeModel.get_all_employees(conn, company_id)
+        employees, next_cursor = EmployeeModel.get_employees_page(
+            conn, company_id=company_id, after=current_cursor("company_employees"), limit=page_size
+        )
+        total_estimate = EmployeeModel.estimate_employee_count(conn, company_id=company_id)
     
     if not employees:
         st.info("No employees found. Add employees using the 'Add New Employee' tab.")
+        display_page_controls("company_employees", 0, None, total_estimate)
         return
     
     # Group employees by branch
@@ -53,11 +65,11 @@ def display_employee_list(engine, company_id):
             employees_by_branch[branch_name] = []
         employees_by_branch[branch_name].append(employee)
     
-    st.write(f"Total employees: {len(employees)}")
+    st.write(f"Total employees: about {total_estimate:,}")
     
     # Display employees by branch
     for branch_name, branch_employees in employees_by_branch.items():
-        with st.expander(f"📍 {branch_name} ({len(branch_employees)} employees)", expanded=False):
+        with st.expander(f"📍 {branch_name} ({len(branch_employees)} employees on this page)", expanded=False):
             # Group branch employees by role
             employees_by_role = {}
             for employee in branch_employees:
@@ -67,9 +79,10 @@ def display_employee_list(engine, company_id):
                 employees_by_role[role_name].append(employee)
             
             # Display employees by role
+            # Employees without a role come last
             for role_name, role_employees in sorted(employees_by_role.items(), 
-                                                   key=lambda x: next((e[8] for e in x[1]), 999)):
-                st.markdown(f"**{role_name}s:**")
+                                                   key=lambda x: x[1][0][8] or 999):
+                st.markdown(f"**{role_name}s:**" if role_name else "**Without a role:**")
                 
                 for employee in role_employees:
                     employee_id = employee[0]
@@ -88,7 +101,7 @@ def display_employee_list(engine, company_id):
                     
                     with cols[1]:
                         st.write(f"**{full_name}** (@{username})")
-                        st.write(f"Role: {role_name} | Status: {'Active' if is_active else 'Inactive'}")
+                        st.write(f"Role: {role_name or 'Not assigned'} | Status: {'Active' if is_active else 'Inactive'}")
                     
                     with cols[2]:
                         if st.button("Actions", key=f"actions_{employee_id}"):
@@ -135,6 +148,8 @@ def display_employee_list(engine, company_id):
                             if st.button("Close", key=f"close_{employee_id}"):
                                 del st.session_state.employee_actions
                                 st.rerun()
+    
+    display_page_controls("company_employees", len(employees), next_cursor, total_estimate)
 
 def add_new_employee(engine, company_id):
     """Form to add a new employee with role and branch assignment.
@@ -1,6 +1,7 @@
 import streamlit as st
 import datetime
 from database.models import MessageModel
+from pages.common.pagination import current_cursor, display_page_controls, display_page_size
 
 def view_messages(engine):
     """View and send messages between company and admin.
@@ -32,24 +33,22 @@ def display_message_history(engine, company_id):
     """
     st.subheader("Message History")
     
-    # Fetch all messages for this company
+    page_size = display_page_size("company_messages", "Messages per page")
+    
+    # Fetch the latest page of the conversation with admin
     with engine.connect() as conn:
-        messages = MessageModel.get_messages_for_company(conn, company_id)
+        messages, older_cursor = MessageModel.get_company_conversation(
+            conn, company_id, before_id=current_cursor("company_messages"), limit=page_size
+        )
+        
+        # Admin messages up to the newest one shown are now read; one update
+        # instead of one per message
+        if any(message[1] == "admin" and not message[4] for message in messages):
+            MessageModel.mark_conversation_read(conn, "company", company_id, up_to_id=messages[0][0])
     
     if not messages:
         st.info("No messages yet. Send a message to get started.")
     else:
-        # Mark unread messages as read
-        for message in messages:
-            message_id = message[0]
-            is_from_admin = message[1] == "admin"
-            is_read = message[4]
-            
-            # Mark admin messages as read when viewed
-            if is_from_admin and not is_read:
-                with engine.connect() as conn:
-                    MessageModel.mark_as_read(conn, message_id)
-        
         # Display messages in a chat-like format
         for message in messages:
             message_text = message[3]
@@ -72,6 +71,9 @@ def display_message_history(engine, company_id):
                 </div>
             </div>
             ''', unsafe_allow_html=True)
+    
+    display_page_controls("company_messages", len(messages), older_cursor,
+                          previous_label="Newer", next_label="Older")
 
 def send_message_form(engine, company_id):
     """Form to send a new message to admin.
@@ -1,15 +1,19 @@
 import streamlit as st
 import datetime
-from database.models.report_model import ReportModel
+import html
+import pandas as pd
+from database.models.report_model import HIGHLIGHT_START, HIGHLIGHT_STOP, SEARCH_MAX_RANKED, ReportModel
 from database.models.branch_model import BranchModel
+from database.models.employee_model import EmployeeModel
 from database.models.role_model import RoleModel
+from database.pdf_cache import PDF_CACHE
+from pages.common.data_export import display_data_export
+from pages.common.export_jobs import display_export_jobs, submit_export
+from pages.common.pagination import (current_cursor, display_load_older, display_page_controls, display_page_size,
+                                     load_chunks, reset_pages)
+from utils.data_export import REPORT_COLUMNS
 from utils.helpers import get_date_range_from_filter
-from utils.pdf_generator import (
-    create_employee_report_pdf, 
-    create_branch_report_pdf, 
-    create_company_report_pdf,
-    create_role_report_pdf
-)
+from utils.pdf_generator import create_employee_report_pdf
 
 def manage_reports(engine):
     """View and download reports with various filters.
@@ -22,7 +26,7 @@ def manage_reports(engine):
     company_id = st.session_state.user["id"]
     company_name = st.session_state.user["full_name"]
     
-    tabs = st.tabs(["All Reports", "Branch Reports", "Role Reports", "Employee Reports"])
+    tabs = st.tabs(["All Reports", "Branch Reports", "Role Reports", "Employee Reports", "Search"])
     
     with tabs[0]:
         view_company_reports(engine, company_id, company_name)
@@ -35,6 +39,200 @@ def manage_reports(engine):
         
     with tabs[3]:
         view_employee_reports(engine, company_id)
+    
+    with tabs[4]:
+        search_reports(engine, company_id)
+    
+    display_export_jobs(engine, company_id, key="company_export_jobs")
+
+def report_date_range(engine, date_filter, company_id=None, branch_id=None, employee_id=None):
+    """Resolve a date filter, starting "All Reports" at the scope's first report.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        date_filter: Selected date range option
+        company_id: Optional company ID of the scope
+        branch_id: Optional branch ID of the scope
+        employee_id: Optional employee ID of the scope
+    
+    Returns:
+        tuple: (start_date, end_date)
+    """
+    first_date = None
+    if date_filter == "All Reports":
+        with engine.connect() as conn:
+            first_date, _ = ReportModel.get_report_span(conn, company_id, branch_id, employee_id)
+    return get_date_range_from_filter(date_filter, first_date)
+
+def display_report_chunks(reports, next_cursor, key, show_author=True):
+    """Display loaded reports, newest first, with a "Load older" button.
+    
+    Args:
+        reports: Rows from ReportModel.get_reports_chunk
+        next_cursor: Cursor of the next older chunk, None when all are loaded
+        key: Unique key of the list
+        show_author: Show the employee and role of each report
+    """
+    for report in reports:
+        author = f" - {report.full_name} ({report.role_name})" if show_author else ""
+        st.markdown(f'''
+        <div class="report-item">
+            <strong>{report.report_date.strftime('%A, %d %b %Y')}</strong>{author}
+            <p>{report.report_text}</p>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    display_load_older(key, next_cursor)
+
+def download_or_export(engine, company_id, cache_key, kind, params, title):
+    """Offer a cached PDF for download, or queue a background export of it.
+    
+    The finished export is added to the PDF cache, so the next click on
+    the same download finds it there.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        company_id: ID of the current company
+        cache_key: PDF cache key of the document
+        kind: Export kind (see utils.export_jobs.RENDERERS)
+        params: Render parameters for the kind
+        title: File name without extension, also shown in the jobs panel
+    """
+    pdf = PDF_CACHE.open(cache_key)
+    if pdf is None:
+        submit_export(engine, company_id, kind, dict(params, cache_key=cache_key), title)
+        return
+    
+    with pdf:
+        st.download_button(
+            label="Download PDF",
+            data=pdf,
+            file_name=f"{title}.pdf",
+            mime="application/pdf"
+        )
+
+def search_reports(engine, company_id):
+    """Search the company's reports by their text.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        company_id: ID of the current company
+    """
+    st.markdown("### Search Reports")
+    
+    query = st.text_input(
+        "Search",
+        key="report_search_query",
+        placeholder='e.g. warehouse audit, "stock count", audit -Chittagong'
+    )
+    
+    with engine.connect() as conn:
+        branches = BranchModel.get_active_branches(conn, company_id)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        branch_options = {"All Branches": None}
+        branch_options.update({branch[1]: branch[0] for branch in branches})
+        selected_branch = st.selectbox("Branch", list(branch_options.keys()), key="report_search_branch")
+    
+    with col2:
+        date_options = ["All Reports", "This Week", "This Month", "This Year"]
+        date_filter = st.selectbox("Date Range", date_options, key="report_search_date_filter")
+    
+    filters = {'branch_id': branch_options[selected_branch]}
+    if date_filter != "All Reports":
+        filters['start_date'], filters['end_date'] = get_date_range_from_filter(date_filter)
+    
+    page_size = display_page_size("report_search", "Results per page")
+    
+    # New search text or filters start again from the first page
+    search_state = (query, selected_branch, date_filter)
+    if st.session_state.get("report_search_state") != search_state:
+        st.session_state.report_search_state = search_state
+        reset_pages("report_search")
+    
+    if not query.strip():
+        st.info(f"Enter words to find in report text. Best matches among the newest "
+                f"{SEARCH_MAX_RANKED:,} are shown first, then any older matches by date.")
+        return
+    
+    with engine.connect() as conn:
+        results, next_cursor = ReportModel.search(
+            conn, company_id, query, filters, current_cursor("report_search"), page_size
+        )
+    
+    if not results:
+        st.info("No reports match your search.")
+        return
+    
+    for position, result in enumerate(results):
+        if not result.ranked and (position == 0 or results[position - 1].ranked):
+            st.caption(f"Older matches, beyond the newest {SEARCH_MAX_RANKED:,}, newest first. "
+                       "Narrow the date range to rank them.")
+        
+        snippet = (html.escape(result.snippet)
+                   .replace(HIGHLIGHT_START, "<mark>")
+                   .replace(HIGHLIGHT_STOP, "</mark>"))
+        
+        st.markdown(f'''
+        <div class="report-item">
+            <strong>{html.escape(result.full_name)}</strong> ({html.escape(result.role_name or 'No role')}) ·
+            {html.escape(result.branch_name)} · {result.report_date.strftime('%A, %d %b %Y')}
+            <p>{snippet}</p>
+        </div>
+        ''', unsafe_allow_html=True)
+    
+    display_page_controls("report_search", len(results), next_cursor)
+
+def display_report_breakdown(engine, stats, start_date, end_date, key):
+    """Display report counts per branch and employee, with reports on demand.
+    
+    Only the reports of the employee picked in a branch are fetched,
+    rather than every report of the range up front.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        stats: ReportStats of the range
+        start_date: Start date of the range
+        end_date: End date of the range
+        key: Unique key prefix for the widgets
+    """
+    employees_by_branch = {}
+    for row in stats.by_employee:
+        employees_by_branch.setdefault((row.branch_id, row.branch_name), []).append(row)
+    
+    for (branch_id, branch_name), employees in employees_by_branch.items():
+        branch_reports = sum(row.reports for row in employees)
+        with st.expander(f"Branch: {branch_name} ({branch_reports} reports)", expanded=False):
+            st.dataframe(pd.DataFrame([{
+                'Employee': row.full_name,
+                'Role': row.role_name,
+                'Reports': row.reports,
+                'First': row.first_date,
+                'Last': row.last_date,
+                'Avg. Length': round(row.total_chars / row.reports)
+            } for row in employees]), use_container_width=True, hide_index=True)
+            
+            employee_options = {f"{row.full_name} ({row.role_name})": row.employee_id for row in employees}
+            selected_employee = st.selectbox(
+                "Read reports of",
+                ["Select an employee"] + list(employee_options.keys()),
+                key=f"{key}_{branch_id}_employee"
+            )
+            if selected_employee not in employee_options:
+                continue
+            
+            employee_id = employee_options[selected_employee]
+            
+            def fetch(cursor):
+                with engine.connect() as conn:
+                    return ReportModel.get_reports_chunk(conn, start_date, end_date, employee_id=employee_id,
+                                                         before=cursor)
+            
+            reader_key = f"{key}_{branch_id}_reader"
+            reports, next_cursor = load_chunks(reader_key, (employee_id, start_date, end_date), fetch)
+            display_report_chunks(reports, next_cursor, reader_key, show_author=False)
 
 def view_company_reports(engine, company_id, company_name):
     """View and download reports for the entire company.
@@ -67,75 +265,49 @@ def view_company_reports(engine, company_id, company_name):
             end_date = st.date_input("End Date", today)
         else:
             # Set default dates based on filter
-            start_date, end_date = get_date_range_from_filter(date_filter)
+            start_date, end_date = report_date_range(engine, date_filter, company_id=company_id)
     
-    # Fetch reports
+    # Counts come from the monthly rollups; report text is loaded per employee
     with engine.connect() as conn:
-        reports = ReportModel.get_company_reports(conn, company_id, start_date, end_date)
+        stats = ReportModel.get_report_stats(conn, company_id, start_date, end_date)
     
-    if not reports:
+    if not stats.reports:
         st.info("No reports found for the selected period.")
         return
     
-    # Display report stats
-    total_reports = len(reports)
-    unique_employees = len(set(r[1] for r in reports))  # Unique employee names
-    unique_branches = len(set(r[3] for r in reports))  # Unique branch names
-    
-    st.write(f"Found {total_reports} reports from {unique_employees} employees across {unique_branches} branches.")
+    st.write(f"Found {stats.reports} reports from {stats.employees} employees across {stats.branches} branches.")
     
     # Download button
     if st.button("Download as PDF", key="download_company_reports"):
-        pdf = create_company_report_pdf(reports, company_name)
+        with engine.connect() as conn:
+            version = ReportModel.get_reports_version(conn, start_date, end_date, company_id=company_id)
         
         # Format date range for filename
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        st.download_button(
-            label="Download PDF",
-            data=pdf,
-            file_name=f"{company_name}_reports_{start_str}_to_{end_str}.pdf",
-            mime="application/pdf"
+        download_or_export(
+            engine, company_id,
+            PDF_CACHE.key(("company", company_id), {'company_name': company_name}, start_date, end_date, version),
+            'company',
+            {
+                'company_id': company_id, 'company_name': company_name,
+                'start_date': start_date, 'end_date': end_date,
+                'period_start': stats.first_date, 'period_end': stats.last_date
+            },
+            f"{company_name}_reports_{start_str}_to_{end_str}"
         )
     
-    # Display reports grouped by branch and employee
-    reports_by_branch = {}
-    for report in reports:
-        branch_name = report[3]
-        
-        if branch_name not in reports_by_branch:
-            reports_by_branch[branch_name] = {}
-        
-        employee_name = report[1]
-        if employee_name not in reports_by_branch[branch_name]:
-            reports_by_branch[branch_name][employee_name] = []
-        
-        reports_by_branch[branch_name][employee_name].append(report)
-    
-    # Display branches
-    for branch_name, employees in reports_by_branch.items():
-        with st.expander(f"Branch: {branch_name} ({sum(len(reports) for reports in employees.values())} reports)", expanded=False):
-            # Display employees in this branch
-            for employee_name, emp_reports in employees.items():
-                with st.expander(f"{employee_name} ({len(emp_reports)} reports)", expanded=False):
-                    # Group by date
-                    emp_reports_by_date = {}
-                    for report in emp_reports:
-                        date = report[4]
-                        if date not in emp_reports_by_date:
-                            emp_reports_by_date[date] = report
-                    
-                    # Display each date
-                    for date, report in sorted(emp_reports_by_date.items(), key=lambda x: x[0], reverse=True):
-                        report_text = report[5]
-                        
-                        st.markdown(f'''
-                        <div class="report-item">
-                            <strong>{date.strftime('%A, %d %b %Y')}</strong>
-                            <p>{report_text}</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
+    # Raw rows for spreadsheets and analysis
+    display_data_export(
+        engine,
+        lambda conn: ReportModel.stream_company_reports(conn, company_id, start_date, end_date),
+        REPORT_COLUMNS,
+        f"{company_name}_reports_{start_date:%Y-%m-%d}_to_{end_date:%Y-%m-%d}",
+        "company_reports_data"
+    )
+    
+    display_report_breakdown(engine, stats, start_date, end_date, "company_reports")
 
 def view_branch_reports(engine, company_id, company_name):
     """View and download reports for a specific branch.
@@ -181,63 +353,40 @@ def view_branch_reports(engine, company_id, company_name):
             end_date = st.date_input("End Date", today, key="branch_end_date")
         else:
             # Set default dates based on filter
-            start_date, end_date = get_date_range_from_filter(date_filter)
+            start_date, end_date = report_date_range(engine, date_filter, branch_id=branch_id)
     
-    # Fetch reports
+    # Counts come from the monthly rollups; report text is loaded per employee
     with engine.connect() as conn:
-        reports = ReportModel.get_branch_reports(conn, branch_id, start_date, end_date)
+        stats = ReportModel.get_report_stats(conn, company_id, start_date, end_date, branch_id=branch_id)
     
-    if not reports:
+    if not stats.reports:
         st.info("No reports found for the selected branch and period.")
         return
     
-    # Display report stats
-    total_reports = len(reports)
-    unique_employees = len(set(r[1] for r in reports))  # Unique employee names
-    
-    st.write(f"Found {total_reports} reports from {unique_employees} employees in {selected_branch}.")
+    st.write(f"Found {stats.reports} reports from {stats.employees} employees in {selected_branch}.")
     
     # Download button
     if st.button("Download as PDF", key="download_branch_reports"):
-        pdf = create_branch_report_pdf(reports, selected_branch)
+        with engine.connect() as conn:
+            version = ReportModel.get_reports_version(conn, start_date, end_date, branch_id=branch_id)
         
         # Format date range for filename
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        st.download_button(
-            label="Download PDF",
-            data=pdf,
-            file_name=f"{selected_branch}_reports_{start_str}_to_{end_str}.pdf",
-            mime="application/pdf"
+        download_or_export(
+            engine, company_id,
+            PDF_CACHE.key(("branch", branch_id), {'branch_name': selected_branch}, start_date, end_date, version),
+            'branch',
+            {
+                'branch_id': branch_id, 'branch_name': selected_branch,
+                'start_date': start_date, 'end_date': end_date,
+                'period_start': stats.first_date, 'period_end': stats.last_date
+            },
+            f"{selected_branch}_reports_{start_str}_to_{end_str}"
         )
     
-    # Display reports grouped by employee
-    reports_by_employee = {}
-    for report in reports:
-        employee_name = report[1]
-        role_name = report[2]
-        key = f"{employee_name} ({role_name})"
-        
-        if key not in reports_by_employee:
-            reports_by_employee[key] = []
-        
-        reports_by_employee[key].append(report)
-    
-    # Display employees
-    for employee, emp_reports in reports_by_employee.items():
-        with st.expander(f"{employee} ({len(emp_reports)} reports)", expanded=False):
-            # Display each report
-            for report in sorted(emp_reports, key=lambda x: x[3], reverse=True):
-                report_date = report[3]
-                report_text = report[4]
-                
-                st.markdown(f'''
-                <div class="report-item">
-                    <strong>{report_date.strftime('%A, %d %b %Y')}</strong>
-                    <p>{report_text}</p>
-                </div>
-                ''', unsafe_allow_html=True)
+    display_report_breakdown(engine, stats, start_date, end_date, "branch_reports")
 
 def view_role_reports(engine, company_id, company_name):
     """View and download reports for a specific role.
@@ -283,69 +432,43 @@ def view_role_reports(engine, company_id, company_name):
             end_date = st.date_input("End Date", today, key="role_end_date")
         else:
             # Set default dates based on filter
-            start_date, end_date = get_date_range_from_filter(date_filter)
+            start_date, end_date = report_date_range(engine, date_filter, company_id=company_id)
     
-    # Fetch reports
+    # Counts come from the monthly rollups; report text is loaded per employee
     with engine.connect() as conn:
-        reports = ReportModel.get_company_reports(conn, company_id, start_date, end_date, role_id=role_id)
+        stats = ReportModel.get_report_stats(conn, company_id, start_date, end_date, role_id=role_id)
     
-    if not reports:
+    if not stats.reports:
         st.info(f"No reports found for {selected_role}s in the selected period.")
         return
     
-    # Display report stats
-    total_reports = len(reports)
-    unique_employees = len(set(r[1] for r in reports))  # Unique employee names
-    unique_branches = len(set(r[3] for r in reports))  # Unique branch names
-    
-    st.write(f"Found {total_reports} reports from {unique_employees} {selected_role}s across {unique_branches} branches.")
+    st.write(f"Found {stats.reports} reports from {stats.employees} {selected_role}s across {stats.branches} branches.")
     
     # Download button
     if st.button("Download as PDF", key="download_role_reports"):
-        pdf = create_role_report_pdf(reports, selected_role, company_name)
+        with engine.connect() as conn:
+            version = ReportModel.get_reports_version(conn, start_date, end_date, company_id=company_id,
+                                                      role_id=role_id)
         
         # Format date range for filename
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        st.download_button(
-            label="Download PDF",
-            data=pdf,
-            file_name=f"{selected_role}_reports_{start_str}_to_{end_str}.pdf",
-            mime="application/pdf"
+        download_or_export(
+            engine, company_id,
+            PDF_CACHE.key(("role", company_id, role_id), {'role_name': selected_role, 'company_name': company_name},
+                          start_date, end_date, version),
+            'role',
+            {
+                'company_id': company_id, 'company_name': company_name,
+                'role_id': role_id, 'role_name': selected_role,
+                'start_date': start_date, 'end_date': end_date,
+                'period_start': stats.first_date, 'period_end': stats.last_date
+            },
+            f"{selected_role}_reports_{start_str}_to_{end_str}"
         )
     
-    # Display reports grouped by branch and employee
-    reports_by_branch = {}
-    for report in reports:
-        branch_name = report[3]
-        
-        if branch_name not in reports_by_branch:
-            reports_by_branch[branch_name] = {}
-        
-        employee_name = report[1]
-        if employee_name not in reports_by_branch[branch_name]:
-            reports_by_branch[branch_name][employee_name] = []
-        
-        reports_by_branch[branch_name][employee_name].append(report)
-    
-    # Display branches
-    for branch_name, employees in reports_by_branch.items():
-        with st.expander(f"Branch: {branch_name} ({sum(len(reports) for reports in employees.values())} reports)", expanded=False):
-            # Display employees in this branch
-            for employee_name, emp_reports in employees.items():
-                with st.expander(f"{employee_name} ({len(emp_reports)} reports)", expanded=False):
-                    # Display each report
-                    for report in sorted(emp_reports, key=lambda x: x[4], reverse=True):
-                        report_date = report[4]
-                        report_text = report[5]
-                        
-                        st.markdown(f'''
-                        <div class="report-item">
-                            <strong>{report_date.strftime('%A, %d %b %Y')}</strong>
-                            <p>{report_text}</p>
-                        </div>
-                        ''', unsafe_allow_html=True)
+    display_report_breakdown(engine, stats, start_date, end_date, "role_reports")
 
 def view_employee_reports(engine, company_id):
     """View and download reports for a specific employee.
@@ -395,44 +518,50 @@ def view_employee_reports(engine, company_id):
             end_date = st.date_input("End Date", today, key="emp_end_date")
         else:
             # Set default dates based on filter
-            start_date, end_date = get_date_range_from_filter(date_filter)
+            start_date, end_date = report_date_range(engine, date_filter, employee_id=employee_id)
     
-    # Fetch reports
-    with engine.connect() as conn:
-        reports = ReportModel.get_employee_reports(conn, employee_id, start_date, end_date)
+    # Newest reports first, older ones on demand
+    def fetch(cursor):
+        with engine.connect() as conn:
+            return ReportModel.get_reports_chunk(conn, start_date, end_date, employee_id=employee_id, before=cursor)
+    
+    reports, next_cursor = load_chunks("employee_reports", (employee_id, start_date, end_date), fetch)
     
     if not reports:
         st.info(f"No reports found for {employee_name} in the selected period.")
         return
     
-    # Display report stats
-    total_reports = len(reports)
-    
-    st.write(f"Found {total_reports} reports from {employee_name}.")
+    if next_cursor is None:
+        st.write(f"Found {len(reports)} reports from {employee_name}.")
+    else:
+        st.write(f"Showing the newest {len(reports)} reports from {employee_name}.")
     
     # Download button
     if st.button("Download as PDF", key="download_employee_reports"):
-        pdf = create_employee_report_pdf(reports, employee_name)
+        def render():
+            with engine.connect() as conn:
+                all_reports = ReportModel.get_employee_reports(conn, employee_id, start_date, end_date)
+            return create_employee_report_pdf(all_reports, employee_name)
+        
+        with engine.connect() as conn:
+            version = ReportModel.get_reports_version(conn, start_date, end_date, employee_id=employee_id)
+        pdf = PDF_CACHE.get_or_render(
+            PDF_CACHE.key(("employee", employee_id), {'employee_name': employee_name},
+                          start_date, end_date, version),
+            render,
+            tenant=company_id, start_date=start_date, end_date=end_date
+        )
         
         # Format date range for filename
         start_str = start_date.strftime('%Y-%m-%d')
         end_str = end_date.strftime('%Y-%m-%d')
         
-        st.download_button(
-            label="Download PDF",
-            data=pdf,
-            file_name=f"{employee_name}_reports_{start_str}_to_{end_str}.pdf",
-            mime="application/pdf"
-        )
-    
-    # Display reports
-    for report in sorted(reports, key=lambda x: x[1], reverse=True):
-        report_date = report[1]
-        report_text = report[2]
-        
-        st.markdown(f'''
-        <div class="report-item">
-            <strong>{report_date.strftime('%A, %d %b %Y')}</strong>
-            <p>{report_text}</p>
-        </div>
-        ''', unsafe_allow_html=True)
+        with pdf:
+            st.download_button(
+                label="Download PDF",
+                data=pdf,
+                file_name=f"{employee_name}_reports_{start_str}_to_{end_str}.pdf",
+                mime="application/pdf"
+            )
+    
+    display_report_chunks(reports, next_cursor, "employee_reports", show_author=False)
@@ -4,6 +4,8 @@ from database.models.task_model import TaskModel
 from database.models.branch_model import BranchModel
 from database.models.employee_model import EmployeeModel
 from database.models.role_model import RoleModel
+from pages.common.data_export import display_data_export
+from utils.data_export import TASK_COLUMNS
 
 def manage_tasks(engine):
     """Manage tasks with branch-level or direct employee assignment.
@@ -64,6 +66,15 @@ def view_tasks(engine, company_id):
     
     st.write(f"Found {len(tasks)} tasks")
     
+    # Raw rows of every task with the selected status
+    display_data_export(
+        engine,
+        lambda conn: TaskModel.stream_tasks_for_company(conn, company_id, status_filter),
+        TASK_COLUMNS,
+        f"tasks_{status_filter.lower().replace(' ', '_')}",
+        "company_tasks_data"
+    )
+    
     # Display tasks
     for task in tasks:
         task_id = task[0]
@@ -205,7 +216,7 @@ def assign_task(engine, company_id):
         return
     
     # Assignment options
-    assignment_options = ["Branch", "Individual Employee"]
+    assignment_options = ["Branch", "Multiple Branches", "Individual Employee"]
     assignment_type = st.radio("Assign To", assignment_options)
     
     with st.form("assign_task_form"):
@@ -220,6 +231,11 @@ def assign_task(engine, company_id):
             selected_branch = st.selectbox("Select Branch", list(branch_options.keys()))
             branch_id = branch_options[selected_branch] if selected_branch else None
             employee_id = None
+        elif assignment_type == "Multiple Branches":
+            branch_options = {branch[1]: branch[0] for branch in branches}
+            selected_branches = st.multiselect("Select Branches", list(branch_options.keys()))
+            branch_id = None
+            employee_id = None
         else:
             # Employee selection - first select branch, then employee
             branch_options = {branch[1]: branch[0] for branch in branches}
@@ -263,25 +279,40 @@ def assign_task(engine, company_id):
                 st.error("Please enter a task description")
             elif assignment_type == "Branch" and not branch_id:
                 st.error("Please select a branch")
+            elif assignment_type == "Multiple Branches" and not selected_branches:
+                st.error("Please select at least one branch")
             elif assignment_type == "Individual Employee" and not employee_id:
                 st.error("Please select an employee")
             else:
                 # Create the task
                 try:
-                    with engine.connect() as conn:
-                        task_id = TaskModel.create_task(
-                            conn,
-                            company_id, 
-                            task_description, 
-                            due_date,
-                            branch_id,
-                            employee_id
-                        )
-                    
-                    if branch_id:
-                        st.success(f"Task assigned to branch: {selected_branch}")
+                    if assignment_type == "Multiple Branches":
+                        # One task per branch, created in a single statement
+                        with engine.connect() as conn:
+                            created = TaskModel.create_branch_tasks(
+                                conn,
+                                company_id,
+                                task_description,
+                                due_date,
+                                [branch_options[name] for name in selected_branches]
+                            )
+                        
+                        st.success(f"Task assigned to {len(created)} branches")
                     else:
-                        st.success(f"Task assigned to employee: {selected_employee.split('(')[0].strip()}")
+                        with engine.connect() as conn:
+                            task_id = TaskModel.create_task(
+                                conn,
+                                company_id, 
+                                task_description, 
+                                due_date,
+                                branch_id,
+                                employee_id
+                            )
+                        
+                        if branch_id:
+                            st.success(f"Task assigned to branch: {selected_branch}")
+                        else:
+                            st.success(f"Task assigned to employee: {selected_employee.split('(')[0].strip()}")
                 except Exception as e:
                     st.error(f"Error assigning task: {e}")
 
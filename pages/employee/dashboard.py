@@ -3,6 +3,13 @@ from sqlalchemy import text
 import datetime
 import time
 from datetime import timedelta
+from database.cache import QUERY_CACHE
+from database.models.employee_model import EmployeeModel
+from database.models.report_model import ReportModel
+from pages.common.lazy_panels import display_lazy_panels
+from pages.common.pagination import (current_cursor, display_load_older, display_page_controls, display_page_size,
+                                     load_chunks)
+from utils.employee_context import get_employee_context
 from utils.role_permissions import RolePermissions
 
 def employee_dashboard(engine):
@@ -13,43 +20,23 @@ def employee_dashboard(engine):
     """
     st.title("Employee Dashboard")
     
-    # Get employee info with role
     employee_id = st.session_state.user["id"]
     
-    with engine.connect() as conn:
-        # Fetch employee details including role
-        result = conn.execute(text('''
-        SELECT e.id, e.full_name, e.username, e.profile_pic_url, 
-               b.id as branch_id, b.branch_name, 
-               r.id as role_id, r.role_name, r.role_level
-        FROM employees e
-        JOIN branches b ON e.branch_id = b.id
-        JOIN employee_roles r ON e.role_id = r.id
-        WHERE e.id = :employee_id
-        '''), {'employee_id': employee_id})
-        
-        employee_details = result.fetchone()
+    # Employee details with role, re-read only when they have changed
+    employee = get_employee_context(engine)
     
-    if not employee_details:
+    if not employee:
         st.error("Could not load employee details. Please log out and try again.")
         if st.button("Logout"):
             logout()
         return
     
     # Extract employee details
-    employee_name = employee_details[1]
-    branch_id = employee_details[4]
-    branch_name = employee_details[5]
-    role_name = employee_details[7]
-    role_level = employee_details[8]
-    
-    # Store additional info in session state for use across the app
-    st.session_state.user.update({
-        "branch_id": branch_id,
-        "branch_name": branch_name,
-        "role_name": role_name,
-        "role_level": role_level
-    })
+    employee_name = employee.full_name
+    branch_id = employee.branch_id
+    branch_name = employee.branch_name
+    role_name = employee.role_name
+    role_level = employee.role_level
     
     # Display welcome message with role
     st.write(f"Welcome, {employee_name} ({role_name}) - {branch_name} Branch")
@@ -57,37 +44,21 @@ def employee_dashboard(engine):
     # Role-specific navigation
     if role_level == RolePermissions.MANAGER or role_level == RolePermissions.ASST_MANAGER:
         # Manager and Asst. Manager navigation
-        tabs = st.tabs(["Dashboard", "Employees", "Tasks", "Reports", "Profile"])
-        
-        with tabs[0]:
-            display_role_dashboard(engine, branch_id, role_level)
-        
-        with tabs[1]:
-            manage_branch_employees(engine, branch_id, role_level)
-            
-        with tabs[2]:
-            manage_tasks(engine, branch_id, role_level)
-            
-        with tabs[3]:
-            view_reports(engine, branch_id, role_level)
-            
-        with tabs[4]:
-            edit_profile(engine, employee_id)
+        display_lazy_panels("manager_panels", [
+            ("Dashboard", lambda: display_role_dashboard(engine, branch_id, role_level)),
+            ("Employees", lambda: manage_branch_employees(engine, branch_id, role_level)),
+            ("Tasks", lambda: manage_tasks(engine, branch_id, role_level)),
+            ("Reports", lambda: view_reports(engine, branch_id, role_level)),
+            ("Profile", lambda: edit_profile(engine, employee_id))
+        ])
     else:
         # General Employee navigation
-        tabs = st.tabs(["Dashboard", "Tasks", "My Reports", "Profile"])
-        
-        with tabs[0]:
-            display_role_dashboard(engine, branch_id, role_level)
-            
-        with tabs[1]:
-            view_employee_tasks(engine, employee_id)
-            
-        with tabs[2]:
-            view_my_reports(engine, employee_id)
-            
-        with tabs[3]:
-            edit_profile(engine, employee_id)
+        display_lazy_panels("employee_panels", [
+            ("Dashboard", lambda: display_role_dashboard(engine, branch_id, role_level)),
+            ("Tasks", lambda: view_employee_tasks(engine, employee_id)),
+            ("My Reports", lambda: view_my_reports(engine, employee_id)),
+            ("Profile", lambda: edit_profile(engine, employee_id))
+        ])
     
     # Logout option
     if st.sidebar.button("Logout"):
@@ -122,11 +93,12 @@ def display_role_dashboard(engine, branch_id, role_level):
             result = conn.execute(text('''
             SELECT COUNT(*) FROM tasks 
             WHERE (employee_id IN (
-                SELECT id FROM employees WHERE branch_id = :branch_id AND role_id = (
-                    SELECT id FROM employee_roles WHERE role_level = 3
-                )
+                SELECT e.id FROM employees e
+                JOIN employee_roles r ON e.role_id = r.id
+                WHERE e.branch_id = :branch_id AND r.role_level = :general_level
             ) OR employee_id = :employee_id) AND is_completed = FALSE
-            '''), {'branch_id': branch_id, 'employee_id': employee_id})
+            '''), {'branch_id': branch_id, 'employee_id': employee_id,
+                  'general_level': RolePermissions.GENERAL_EMPLOYEE})
             pending_tasks = result.fetchone()[0]
         else:
             # Get own tasks only
@@ -260,35 +232,7 @@ def display_role_dashboard(engine, branch_id, role_level):
                     st.error("Please enter your report")
                 else:
                     with engine.connect() as conn:
-                        today = datetime.date.today()
-                        
-                        # Check if report already exists
-                        result = conn.execute(text('''
-                        SELECT id FROM daily_reports 
-                        WHERE employee_id = :employee_id AND report_date = :today
-                        '''), {'employee_id': employee_id, 'today': today})
-                        
-                        existing = result.fetchone()
-                        
-                        if existing:
-                            # Update existing report
-                            conn.execute(text('''
-                            UPDATE daily_reports 
-                            SET report_text = :report_text, created_at = CURRENT_TIMESTAMP
-                            WHERE id = :id
-                            '''), {'report_text': report_text, 'id': existing[0]})
-                        else:
-                            # Create new report
-                            conn.execute(text('''
-                            INSERT INTO daily_reports (employee_id, report_date, report_text)
-                            VALUES (:employee_id, :today, :report_text)
-                            '''), {
-                                'employee_id': employee_id,
-                                'today': today,
-                                'report_text': report_text
-                            })
-                        
-                        conn.commit()
+                        ReportModel.upsert_report(conn, employee_id, datetime.date.today(), report_text)
                     
                     st.success("Report submitted successfully")
                     del st.session_state.submit_report
@@ -302,12 +246,12 @@ def display_role_dashboard(engine, branch_id, role_level):
             name = report[0]
             role = report[1]
             date = report[2].strftime('%d %b, %Y') if report[2] else "Unknown"
-            text = report[3]
+            report_body = report[3]
             
             st.markdown(f"""
             <div class="report-item">
                 <div><strong>{name}</strong> ({role}) - {date}</div>
-                <p>{text[:150]}{'...' if len(text) > 150 else ''}</p>
+                <p>{report_body[:150]}{'...' if len(report_body) > 150 else ''}</p>
             </div>
             """, unsafe_allow_html=True)
     else:
@@ -330,33 +274,22 @@ def manage_branch_employees(engine, branch_id, role_level):
         tabs = st.tabs(["General Employees", "Add Employee"])
     
     with tabs[0]:
-        # Fetch employees based on role permissions
+        page_size = display_page_size("branch_employees", "Employees per page")
+        
+        # Managers see everyone in their branch, Asst. Managers only General Employees
+        visible_level = None if role_level == RolePermissions.MANAGER else RolePermissions.GENERAL_EMPLOYEE
+        
         with engine.connect() as conn:
-            if role_level == RolePermissions.MANAGER:
-                # Managers can see all employees in their branch
-                result = conn.execute(text('''
-                SELECT e.id, e.username, e.full_name, e.profile_pic_url, e.is_active,
-                       r.role_name, r.role_level
-                FROM employees e
-                JOIN employee_roles r ON e.role_id = r.id
-                WHERE e.branch_id = :branch_id
-                ORDER BY r.role_level, e.full_name
-                '''), {'branch_id': branch_id})
-            else:
-                # Asst. Managers can only see General Employees
-                result = conn.execute(text('''
-                SELECT e.id, e.username, e.full_name, e.profile_pic_url, e.is_active,
-                       r.role_name, r.role_level
-                FROM employees e
-                JOIN employee_roles r ON e.role_id = r.id
-                WHERE e.branch_id = :branch_id AND r.role_level = :general_level
-                ORDER BY e.full_name
-                '''), {
-                    'branch_id': branch_id,
-                    'general_level': RolePermissions.GENERAL_EMPLOYEE
-                })
-            
-            employees = result.fetchall()
+            page, next_cursor = EmployeeModel.get_employees_page(
+                conn, branch_id=branch_id, role_level=visible_level,
+                after=current_cursor("branch_employees"), limit=page_size
+            )
+            total_estimate = EmployeeModel.estimate_employee_count(
+                conn, branch_id=branch_id, role_level=visible_level
+            )
+        
+        # (id, username, full_name, profile_pic_url, is_active, role_name, role_level)
+        employees = [emp[:5] + (emp[7], emp[8]) for emp in page]
         
         if not employees:
             st.info("No employees found")
@@ -372,11 +305,13 @@ def manage_branch_employees(engine, branch_id, role_level):
                 
                 # Display by role
                 for role, role_employees in employees_by_role.items():
-                    st.subheader(f"{role}s")
+                    st.subheader(f"{role}s" if role else "Without a role")
                     display_employee_list(engine, role_employees, role_level)
             else:
                 # Just display the list for asst. manager
                 display_employee_list(engine, employees, role_level)
+        
+        display_page_controls("branch_employees", len(employees), next_cursor, total_estimate)
     
     with tabs[1]:
         # Add employee form - both can add only General Employees
@@ -428,6 +363,7 @@ def manage_branch_employees(engine, branch_id, role_level):
                                 })
                                 
                                 conn.commit()
+                                QUERY_CACHE.invalidate("employees")
                                 st.success(f"Successfully added {full_name} as General Employee")
                             except Exception as e:
                                 st.error(f"Error adding employee: {e}")
@@ -450,7 +386,8 @@ def display_employee_list(engine, employees, viewer_role_level):
         employee_role_level = employee[6]
         
         # Only show actions if viewer has permission to manage this role
-        can_manage = RolePermissions.can_deactivate_role(viewer_role_level, employee_role_level)
+        can_manage = (employee_role_level is not None
+                      and RolePermissions.can_deactivate_role(viewer_role_level, employee_role_level))
         
         cols = st.columns([1, 3, 1] if can_manage else [1, 4])
         
@@ -471,6 +408,7 @@ def display_employee_list(engine, employees, viewer_role_level):
                             UPDATE employees SET is_active = FALSE WHERE id = :id
                             '''), {'id': employee_id})
                             conn.commit()
+                        QUERY_CACHE.invalidate("employees")
                         st.success(f"Deactivated {full_name}")
                         st.rerun()
                 else:
@@ -480,6 +418,7 @@ def display_employee_list(engine, employees, viewer_role_level):
                             UPDATE employees SET is_active = TRUE WHERE id = :id
                             '''), {'id': employee_id})
                             conn.commit()
+                        QUERY_CACHE.invalidate("employees")
                         st.success(f"Activated {full_name}")
                         st.rerun()
         
@@ -937,12 +876,12 @@ def view_reports(engine, branch_id, role_level):
                 for report in date_reports:
                     name = report[0]
                     role = report[1]
-                    text = report[3]
+                    report_body = report[3]
                     
                     st.markdown(f"""
                     <div class="report-item">
                         <div><strong>{name}</strong> ({role})</div>
-                        <p>{text}</p>
+                        <p>{report_body}</p>
                     </div>
                     """, unsafe_allow_html=True)
 
@@ -1062,29 +1001,26 @@ def view_my_reports(engine, employee_id):
             start_date = st.date_input("Start Date", today - timedelta(days=30))
         with cols[1]:
             end_date = st.date_input("End Date", today)
-    else:  # All Reports
-        start_date = datetime.date(2000, 1, 1)  # A date far in the past
+    else:  # All Reports, from the first one on
+        with engine.connect() as conn:
+            first_date, _ = ReportModel.get_report_span(conn, employee_id=employee_id)
+        start_date = min(first_date, today) if first_date else today
         end_date = today
     
-    # Fetch reports
-    with engine.connect() as conn:
-        result = conn.execute(text('''
-        SELECT dr.id, dr.report_date, dr.report_text
-        FROM daily_reports dr
-        WHERE dr.employee_id = :employee_id AND dr.report_date BETWEEN :start_date AND :end_date
-        ORDER BY dr.report_date DESC
-        '''), {
-            'employee_id': employee_id,
-            'start_date': start_date,
-            'end_date': end_date
-        })
-        
-        reports = result.fetchall()
+    # Newest reports first, older ones on demand
+    def fetch(cursor):
+        with engine.connect() as conn:
+            return ReportModel.get_reports_chunk(conn, start_date, end_date, employee_id=employee_id, before=cursor)
+    
+    reports, next_cursor = load_chunks("my_reports", (employee_id, start_date, end_date), fetch)
     
     if not reports:
         st.info("No reports found for the selected period")
     else:
-        st.success(f"Found {len(reports)} reports")
+        if next_cursor is None:
+            st.success(f"Found {len(reports)} reports")
+        else:
+            st.success(f"Showing your newest {len(reports)} reports")
         
         # Create PDF download button
         if st.button("Download as PDF"):
@@ -1094,16 +1030,14 @@ def view_my_reports(engine, employee_id):
         
         # Display reports
         for report in reports:
-            report_id = report[0]
-            report_date = report[1]
-            report_text = report[2]
-            
             st.markdown(f'''
             <div class="report-item">
-                <div><strong>{report_date.strftime('%A, %d %b %Y')}</strong></div>
-                <p>{report_text}</p>
+                <div><strong>{report.report_date.strftime('%A, %d %b %Y')}</strong></div>
+                <p>{report.report_text}</p>
             </div>
             ''', unsafe_allow_html=True)
+        
+        display_load_older("my_reports", next_cursor)
 
 def edit_profile(engine, employee_id):
     """Allow employee to edit their profile.
@@ -1177,6 +1111,7 @@ def edit_profile(engine, employee_id):
                         'employee_id': employee_id
                     })
                     conn.commit()
+                QUERY_CACHE.invalidate("employees")
                 
                 # Update session state
                 st.session_state.user["full_name"] = new_full_name
@@ -32,16 +32,9 @@ def submit_report(engine):
             else:
                 try:
                     with engine.connect() as conn:
-                        if existing_report:
-                            # Update existing report
-                            ReportModel.update_report(conn, existing_report[0], report_date, report_text)
-                            success_message = "Report updated successfully"
-                        else:
-                            # Insert new report
-                            ReportModel.add_report(conn, employee_id, report_date, report_text)
-                            success_message = "Report submitted successfully"
+                        _, inserted = ReportModel.upsert_report(conn, employee_id, report_date, report_text)
                     
-                    st.success(success_message)
+                    st.success("Report submitted successfully" if inserted else "Report updated successfully")
                 except Exception as e:
                     st.error(f"Error submitting report: {e}")
 
@@ -150,6 +143,8 @@ def view_my_reports(engine):
                         st.success("Report updated successfully")
                         del st.session_state.edit_report
                         st.rerun()
+                    except ValueError as e:
+                        st.error(str(e))
                     except Exception as e:
                         st.error(f"Error updating report: {e}")
             
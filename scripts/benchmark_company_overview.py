@@ -0,0 +1,100 @@
+"""Benchmark the company dashboard overview queries.
+
+Compares the previous one-query-per-figure overview with
+CompanyStatsModel.get_overview on a seeded company of the requested size.
+Run against a scratch database only; the seeded rows are left in place.
+    
+    python -m scripts.benchmark_company_overview --url postgresql://... --employees 10000
+"""
+import argparse
+import datetime
+import time
+from sqlalchemy import text
+from scripts.common import get_engine, load_model, summarize_ms
+from scripts.seed_data import seed_database
+
+# The overview as it used to be loaded: one query per figure
+PER_FIGURE_QUERIES = [
+    '''SELECT COUNT(*) FROM branches
+    WHERE company_id = :company_id AND is_active = TRUE''',
+    '''SELECT COUNT(*) FROM branches
+    WHERE company_id = :company_id AND is_active = TRUE AND is_main_branch = TRUE''',
+    '''SELECT COUNT(*) FROM branches
+    WHERE company_id = :company_id AND is_active = TRUE AND is_main_branch = FALSE''',
+    '''SELECT COUNT(*) FROM employees e
+    JOIN branches b ON e.branch_id = b.id
+    WHERE b.company_id = :company_id AND e.is_active = TRUE''',
+    '''SELECT r.role_name, COUNT(e.id)
+    FROM employees e
+    JOIN branches b ON e.branch_id = b.id
+    JOIN employee_roles r ON e.role_id = r.id
+    WHERE b.company_id = :company_id AND e.is_active = TRUE
+    GROUP BY r.role_name, r.role_level
+    ORDER BY r.role_level''',
+    '''SELECT COUNT(*) FROM messages
+    WHERE receiver_type = 'company' AND receiver_id = :company_id AND is_read = FALSE''',
+    '''SELECT COUNT(*) FROM tasks
+    WHERE company_id = :company_id AND is_completed = FALSE''',
+    '''SELECT SUM(CASE WHEN is_completed THEN 1 ELSE 0 END), COUNT(*)
+    FROM tasks
+    WHERE company_id = :company_id AND branch_id IS NOT NULL''',
+    '''SELECT e.full_name, dr.report_date, dr.report_text, b.branch_name
+    FROM daily_reports dr
+    JOIN employees e ON dr.employee_id = e.id
+    JOIN branches b ON e.branch_id = b.id
+    WHERE b.company_id = :company_id
+    ORDER BY dr.created_at DESC
+    LIMIT 5''',
+]
+
+def load_per_figure(conn, company_id):
+    """Run the per-figure queries in sequence."""
+    return [conn.execute(text(query), {'company_id': company_id}).fetchall()
+            for query in PER_FIGURE_QUERIES]
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the company overview queries")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--employees", type=int, default=10000, help="Employees in the benchmark company")
+    parser.add_argument("--branches", type=int, default=50)
+    parser.add_argument("--report-days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args(argv)
+    
+    engine = get_engine(args.url)
+    stats_model = load_model("company_stats_model").CompanyStatsModel
+    prefix = f"overview{datetime.datetime.now():%H%M%S}"
+    
+    counts = seed_database(engine, prefix=prefix, companies=1, branches_per_company=args.branches,
+                           employees_per_branch=max(args.employees // args.branches, 1),
+                           report_days=args.report_days)
+    print(f"Seeded company '{prefix}_company_1' (database now has {counts['employees']} employees, "
+          f"{counts['daily_reports']} reports)")
+    
+    with engine.connect() as conn:
+        company_id = conn.execute(text('''
+        SELECT id FROM companies WHERE username = :username
+        '''), {'username': f"{prefix}_company_1"}).fetchone()[0]
+        
+        variants = [
+            (f"per-figure ({len(PER_FIGURE_QUERIES)} queries)", lambda: load_per_figure(conn, company_id)),
+            ("get_overview (1 query)", lambda: stats_model.get_overview(conn, company_id)),
+        ]
+        
+        print(f"{'variant':<26} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for label, func in variants:
+            func()  # warm up
+            samples = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                func()
+                samples.append((time.perf_counter() - start) * 1000)
+                conn.rollback()
+            stats = summarize_ms(samples)
+            print(f"{label:<26} {stats['p50']:>9} {stats['p99']:>9} {stats['max']:>9}")
+    
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,97 @@
+"""Benchmark company/employee login lookups under concurrency.
+
+Compares the previous two-step lookup (companies, then the employee join
+on a miss) with utils.auth.find_account's single query over the accounts
+view. Each login checks out its own pooled connection, the way a
+Streamlit session does. Uses existing employee accounts; seed some first
+with scripts/seed_data.py if the database is empty.
+    
+    python -m scripts.benchmark_login --url postgresql://... --concurrency 50
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import text
+from scripts.common import get_engine, summarize_ms
+from utils.auth import find_account
+
+def find_account_two_step(conn, username, password):
+    """Login lookup as it used to be: companies first, then employees."""
+    company = conn.execute(text('''
+    SELECT id, company_name, username, profile_pic_url
+    FROM companies
+    WHERE username = :username AND password = :password AND is_active = TRUE
+    '''), {'username': username, 'password': password}).fetchone()
+    if company:
+        return company
+    
+    return conn.execute(text('''
+    SELECT e.id, e.username, e.full_name, e.profile_pic_url,
+           b.id as branch_id, b.branch_name, c.id as company_id, c.company_name,
+           r.id as role_id, r.role_name, r.role_level
+    FROM employees e
+    JOIN branches b ON e.branch_id = b.id
+    JOIN companies c ON b.company_id = c.id
+    JOIN employee_roles r ON e.role_id = r.id
+    WHERE e.username = :username AND e.password = :password
+      AND e.is_active = TRUE AND b.is_active = TRUE AND c.is_active = TRUE
+    '''), {'username': username, 'password': password}).fetchone()
+
+def run_logins(engine, lookup, credentials, concurrency):
+    """Run one login per credential pair across a thread pool.
+    
+    Returns:
+        Tuple of (latency samples in ms, number of successful logins)
+    """
+    def login(pair):
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            found = lookup(conn, *pair)
+        return (time.perf_counter() - start) * 1000, found is not None
+    
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(login, credentials))
+    
+    return [ms for ms, _ in results], sum(1 for _, ok in results if ok)
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark concurrent login lookups")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--concurrency", type=int, default=50, help="Simultaneous logins")
+    parser.add_argument("--logins", type=int, default=2000, help="Logins per variant")
+    args = parser.parse_args(argv)
+    
+    # Enough connections that every concurrent login gets one without waiting
+    engine = get_engine(args.url, pool_size=args.concurrency, max_overflow=0)
+    
+    with engine.connect() as conn:
+        credentials = [tuple(row) for row in conn.execute(text('''
+        SELECT username, password FROM employees
+        WHERE is_active = TRUE
+        ORDER BY random()
+        LIMIT :limit
+        '''), {'limit': args.logins}).fetchall()]
+    
+    if not credentials:
+        print("No employee accounts found; seed the database first")
+        return 1
+    credentials = (credentials * (args.logins // len(credentials) + 1))[:args.logins]
+    
+    variants = [
+        ("two-step (companies, employees)", find_account_two_step),
+        ("accounts view (1 query)", find_account),
+    ]
+    
+    print(f"{len(credentials)} employee logins per variant, {args.concurrency} concurrent")
+    print(f"{'variant':<32} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'ok':>6}")
+    for label, lookup in variants:
+        run_logins(engine, lookup, credentials[:args.concurrency], args.concurrency)  # warm up
+        samples, succeeded = run_logins(engine, lookup, credentials, args.concurrency)
+        stats = summarize_ms(samples)
+        print(f"{label:<32} {stats['p50']:>9} {stats['p99']:>9} {stats['max']:>9} {succeeded:>6}")
+    
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
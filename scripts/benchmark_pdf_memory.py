@@ -0,0 +1,119 @@
+"""Benchmark peak memory of company report PDF rendering by report count.
+
+Compares the previous renderer (all rows, then all flowables with fresh
+styles per report, rendered into a BytesIO and copied out) with the
+streaming one in utils.pdf_generator, which lays out flowables as rows
+arrive and writes to a spooled temporary file. Rows are synthetic and
+generated lazily for the streaming run, the way a server-side cursor
+hands them over, so only the rendering is measured.
+    
+    python -m scripts.benchmark_pdf_memory --counts 1000 5000 20000
+"""
+import argparse
+import datetime
+import io
+import time
+import tracemalloc
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from utils.pdf_generator import create_company_report_pdf
+
+REPORT_TEXT = (
+    "Visited three retail partners to review shelf placement and restocking. "
+    "Followed up on the pending invoices from last week and updated the branch ledger. "
+    "Prepared the weekly sales summary and shared it with the branch head. "
+)
+
+def generate_reports(count, employees_per_branch=20, branch_count=10):
+    """Yield company report rows ordered by branch, employee and date.
+    
+    Args:
+        count: Number of rows to generate
+        employees_per_branch: Employees per synthetic branch
+        branch_count: Number of synthetic branches
+    """
+    employees = employees_per_branch * branch_count
+    days = max(1, -(-count // employees))
+    today = datetime.date.today()
+    report_id = 0
+    for branch in range(branch_count):
+        for employee in range(employees_per_branch):
+            for day in range(days):
+                if report_id == count:
+                    return
+                report_id += 1
+                yield (report_id, f"Employee {branch}-{employee}", "Sales Officer", f"Branch {branch:02d}",
+                       today - datetime.timedelta(days=day), REPORT_TEXT, None)
+
+def render_materialized(reports, company_name):
+    """Render the company PDF as it used to be done, returning bytes."""
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=0.5*inch, rightMargin=0.5*inch)
+    styles = getSampleStyleSheet()
+    elements = [Paragraph(f"Company Reports: {company_name}", styles['Heading1']), Spacer(1, 12)]
+    
+    reports_by_branch = {}
+    for report in reports:
+        reports_by_branch.setdefault(report[3], {}).setdefault(f"{report[1]} ({report[2]})", []).append(report)
+    
+    for branch_name, employees in reports_by_branch.items():
+        elements.append(Paragraph(f"Branch: {branch_name}", ParagraphStyle(
+            'Branch', parent=styles['Heading2'], fontSize=16, spaceAfter=10, textColor=colors.blue)))
+        for employee_name, emp_reports in employees.items():
+            elements.append(Paragraph(employee_name, ParagraphStyle(
+                'Employee', parent=styles['Heading3'], fontSize=14, spaceAfter=8)))
+            for report in emp_reports:
+                elements.append(Paragraph(report[4].strftime('%A, %d %b %Y'), ParagraphStyle(
+                    'Date', parent=styles['Normal'], fontSize=11, textColor=colors.darkblue)))
+                elements.append(Paragraph(report[5], ParagraphStyle(
+                    'ReportText', parent=styles['Normal'], fontSize=10, leftIndent=10)))
+                elements.append(Spacer(1, 10))
+            elements.append(Spacer(1, 10))
+        elements.append(Spacer(1, 20))
+    
+    doc.build(elements)
+    buffer.seek(0)
+    return buffer.getvalue()
+
+def measure(render):
+    """Run render under tracemalloc.
+    
+    Returns:
+        Tuple of (peak MiB, seconds, PDF size in bytes)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    size = render()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024), elapsed, size
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark PDF rendering memory by report count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 5000, 20000],
+                        help="Report counts to render")
+    args = parser.parse_args(argv)
+    
+    def materialized(count):
+        reports = list(generate_reports(count))
+        return len(render_materialized(reports, "Benchmark Co"))
+    
+    def streaming(count):
+        with create_company_report_pdf(generate_reports(count), "Benchmark Co",
+                                       period=(datetime.date.today(), datetime.date.today())) as pdf:
+            pdf.seek(0, io.SEEK_END)
+            return pdf.tell()
+    
+    print(f"{'reports':>8} {'renderer':>12} {'peak MiB':>9} {'seconds':>8} {'pdf KiB':>8}")
+    for count in args.counts:
+        for name, render in (("materialized", materialized), ("streaming", streaming)):
+            peak, elapsed, size = measure(lambda: render(count))
+            print(f"{count:>8} {name:>12} {peak:>9.1f} {elapsed:>8.2f} {size / 1024:>8.0f}")
+
+if __name__ == "__main__":
+    main()
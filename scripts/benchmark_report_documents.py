@@ -0,0 +1,180 @@
+"""Benchmark the report document engine against the old per-report builders.
+
+For each preset (employee, branch, company, role) and report count, times
+turning a materialized list of rows into flowables: the old builders'
+dict-of-lists grouping with fresh styles per report and date-string
+de-duplication, reimplemented here, against the sort-based single pass of
+utils.pdf_generator.render_report_document, and the engine's grouping
+pass on its own. Rows are synthetic and in query order (newest first),
+so the grouping has real work to do. With --render, also times the
+complete PDFs rendered by the presets.
+    
+    python -m scripts.benchmark_report_documents --counts 1000 10000 100000
+"""
+import argparse
+import datetime
+import io
+import random
+import time
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import Paragraph, Spacer
+from utils import pdf_generator
+from utils.pdf_generator import ReportBatch, _flowables, _sorted_entries
+
+REPORT_TEXT = "Visited three retail partners and updated the branch ledger."
+
+ROLES = ["Branch Manager", "Sales Officer", "Field Officer", "Accountant"]
+
+def generate_company_reports(count, employees=400, branch_count=10, seed=7):
+    """Build company report rows (id, name, role, branch, date, text, created_at), newest first.
+    
+    Args:
+        count: Number of rows to generate
+        employees: Number of synthetic employees
+        branch_count: Number of synthetic branches
+        seed: Random seed, so runs are comparable
+    """
+    rng = random.Random(seed)
+    staff = [(f"Employee {index:04d}", ROLES[index % len(ROLES)], f"Branch {index % branch_count:02d}")
+             for index in range(employees)]
+    days = max(1, -(-count // employees))
+    today = datetime.date.today()
+    reports = [
+        (index + 1, *rng.choice(staff), today - datetime.timedelta(days=rng.randrange(days)), REPORT_TEXT, None)
+        for index in range(count)
+    ]
+    reports.sort(key=lambda report: report[4], reverse=True)
+    return reports
+
+def preset_inputs(company_reports):
+    """Shape company rows into each preset's row layout.
+    
+    Returns:
+        Dict of preset name -> (DocumentSpec, rows)
+    """
+    return {
+        'employee': (pdf_generator.EMPLOYEE_REPORT,
+                     [(report[0], report[4], report[5]) for report in company_reports]),
+        'branch': (pdf_generator.BRANCH_REPORT,
+                   [(report[0], report[1], report[2], report[4], report[5], report[6])
+                    for report in company_reports]),
+        'company': (pdf_generator.COMPANY_REPORT, company_reports),
+        'role': (pdf_generator.ROLE_REPORT, company_reports)
+    }
+
+def legacy_flowables(preset, reports):
+    """Build flowables the way the separate builders used to."""
+    styles = getSampleStyleSheet()
+    elements = [Paragraph("Reports", styles['Heading1']), Spacer(1, 12)]
+    
+    def dated(report, date_index, text_index):
+        elements.append(Paragraph(report[date_index].strftime('%A, %d %b %Y'), ParagraphStyle(
+            'Date', parent=styles['Normal'], fontSize=11, textColor=colors.blue)))
+        elements.append(Paragraph(report[text_index], ParagraphStyle(
+            'ReportText', parent=styles['Normal'], fontSize=10, leftIndent=10)))
+        elements.append(Spacer(1, 12))
+    
+    if preset == 'company':
+        by_branch = {}
+        for report in reports:
+            by_branch.setdefault(report[3], {}).setdefault(f"{report[1]} ({report[2]})", []).append(report)
+        for branch_name, employees in by_branch.items():
+            elements.append(Paragraph(f"Branch: {branch_name}", ParagraphStyle(
+                'Branch', parent=styles['Heading2'], fontSize=16, spaceAfter=10, textColor=colors.blue)))
+            for employee_name, emp_reports in employees.items():
+                elements.append(Paragraph(employee_name, ParagraphStyle(
+                    'Employee', parent=styles['Heading3'], fontSize=14, spaceAfter=8)))
+                seen_dates = set()
+                for report in sorted(emp_reports, key=lambda report: report[4], reverse=True):
+                    date_str = report[4].strftime('%Y-%m-%d')
+                    if date_str not in seen_dates:
+                        seen_dates.add(date_str)
+                        dated(report, 4, 5)
+                elements.append(Spacer(1, 10))
+            elements.append(Spacer(1, 20))
+        return elements
+    
+    if preset == 'employee':
+        group, date_index, text_index = (lambda report: report[1].strftime('%B %Y')), 1, 2
+    elif preset == 'branch':
+        group, date_index, text_index = (lambda report: f"{report[1]} ({report[2]})"), 3, 4
+    else:
+        group, date_index, text_index = (lambda report: f"{report[1]} ({report[3]})"), 4, 5
+    
+    groups = {}
+    for report in reports:
+        groups.setdefault(group(report), []).append(report)
+    for heading, group_reports in groups.items():
+        elements.append(Paragraph(heading, ParagraphStyle(
+            'Group', parent=styles['Heading2'], fontSize=14, spaceAfter=10)))
+        seen_dates = set()
+        for report in group_reports:
+            date_str = report[date_index].strftime('%Y-%m-%d')
+            if preset == 'role' and date_str in seen_dates:
+                continue
+            seen_dates.add(date_str)
+            dated(report, date_index, text_index)
+        elements.append(Spacer(1, 15))
+    return elements
+
+def engine_grouping(spec, reports):
+    """Group and order reports with the document engine (no flowables)."""
+    return list(_sorted_entries(ReportBatch.from_rows(reports, spec.fields), spec))
+
+def engine_flowables(spec, reports):
+    """Build flowables with the document engine (no layout)."""
+    batch = ReportBatch.from_rows(reports, spec.fields)
+    return list(_flowables(_sorted_entries(batch, spec), spec, "Reports", None))
+
+def render_pdf(preset, reports):
+    """Render a complete PDF with a preset, returning its size in bytes."""
+    render = {
+        'employee': lambda: pdf_generator.create_employee_report_pdf(reports, "Benchmark Employee"),
+        'branch': lambda: pdf_generator.create_branch_report_pdf(reports, "Benchmark Branch"),
+        'company': lambda: pdf_generator.create_company_report_pdf(reports, "Benchmark Co"),
+        'role': lambda: pdf_generator.create_role_report_pdf(reports, "Sales Officer", "Benchmark Co")
+    }[preset]
+    with render() as pdf:
+        pdf.seek(0, io.SEEK_END)
+        return pdf.tell()
+
+def best_of(repeat, func):
+    """Run func repeat times, returning (fastest seconds, last result)."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark report document building by report count")
+    parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Report counts to build")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is kept)")
+    parser.add_argument("--render", action="store_true", help="Also time complete PDF rendering")
+    args = parser.parse_args(argv)
+    
+    header = (f"{'reports':>8} {'preset':>9} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8} "
+              f"{'group ms':>9} {'flowables':>10}")
+    if args.render:
+        header += f" {'render s':>9} {'pdf KiB':>8}"
+    print(header)
+    
+    for count in args.counts:
+        for preset, (spec, reports) in preset_inputs(generate_company_reports(count)).items():
+            legacy, _ = best_of(args.repeat, lambda: legacy_flowables(preset, reports))
+            engine, flowables = best_of(args.repeat, lambda: engine_flowables(spec, reports))
+            grouping, _ = best_of(args.repeat, lambda: engine_grouping(spec, reports))
+            line = (f"{count:>8} {preset:>9} {legacy * 1000:>10.1f} {engine * 1000:>10.1f} "
+                    f"{legacy / engine:>7.1f}x {grouping * 1000:>9.1f} {len(flowables):>10}")
+            if args.render:
+                elapsed, size = best_of(1, lambda: render_pdf(preset, reports))
+                line += f" {elapsed:>9.2f} {size / 1024:>8.0f}"
+            print(line)
+
+if __name__ == "__main__":
+    main()
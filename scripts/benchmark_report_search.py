@@ -0,0 +1,173 @@
+"""Benchmark full-text report search on a company with a million reports.
+
+Seeds one company (about --reports reports) and rewrites its report texts
+from a skewed vocabulary, so search terms range from rare to very common,
+with a planted "Dhaka warehouse audit" phrase in a few reports. For each
+query, compares scanning report_text with ILIKE (the only option without
+the search index) against ReportModel.search, first page and a deeper
+page reached through the cursors. Run against a scratch database only;
+the seeded rows are left in place.
+    
+    python -m scripts.benchmark_report_search --url postgresql://... --reports 1000000
+"""
+import argparse
+import datetime
+import math
+import time
+from sqlalchemy import text
+from scripts.common import get_engine, load_model, summarize_ms
+from scripts.seed_data import seed_database
+
+# Earlier words are drawn far more often than later ones
+VOCABULARY = [
+    "customer", "visit", "sales", "follow", "up", "order", "delivery", "stock", "meeting", "report",
+    "payment", "invoice", "branch", "team", "target", "market", "product", "review", "shop", "call",
+    "supplier", "price", "collection", "training", "warehouse", "shipment", "count", "display", "return",
+    "complaint", "survey", "promotion", "inventory", "ledger", "cash", "deposit", "bank", "transport",
+    "vehicle", "fuel", "repair", "contract", "tender", "audit", "budget", "forecast", "campaign",
+    "distributor", "retailer", "wholesale", "sample", "quality", "inspection", "packaging", "label",
+    "dispatch", "receipt", "credit", "discount", "commission", "recruitment", "interview", "attendance",
+    "leave", "overtime", "safety", "maintenance", "generator", "electricity", "internet", "printer",
+    "software", "backup", "reconciliation", "tax", "vat", "license", "permit", "renewal", "insurance",
+    "claim", "Chittagong", "Sylhet", "Khulna", "Rajshahi", "Barisal", "Rangpur", "Comilla", "Gazipur",
+]
+
+PLANTED_PHRASE = "Dhaka warehouse audit"
+
+QUERIES = [
+    # (label, search query, ILIKE patterns that must all match)
+    ("rare phrase", PLANTED_PHRASE, ["%Dhaka%", "%warehouse%", "%audit%"]),
+    ("quoted phrase", '"stock count"', ["%stock count%"]),
+    ("medium word", "reconciliation", ["%reconciliation%"]),
+    ("common word", "customer", ["%customer%"]),
+    ("word -excluded", "audit -Chittagong", ["%audit%"]),
+]
+
+def seed_search_company(engine, prefix, reports, planted_ratio):
+    """Seed a company and give its reports varied text.
+    
+    Returns:
+        int: ID of the seeded company
+    """
+    employees_per_branch = 50
+    branches = 20
+    report_days = max(1, math.ceil(reports / (employees_per_branch * branches * 0.9)))
+    seed_database(engine, prefix=prefix, companies=1, branches_per_company=branches,
+                  employees_per_branch=employees_per_branch, report_days=report_days,
+                  tasks_per_branch=1, messages_per_company=1)
+    
+    with engine.begin() as conn:
+        company_id = conn.execute(text('''
+        SELECT id FROM companies WHERE username = :username
+        '''), {'username': f"{prefix}_company_1"}).scalar()
+        
+        # The correlated generate_series makes the words differ per report
+        conn.execute(text('''
+        UPDATE daily_reports dr
+        SET report_text = (
+            SELECT string_agg(
+                (CAST(:words AS text[]))[1 + floor(power(random(), 3) * :word_count)::int], ' ')
+            FROM generate_series(1, 10 + dr.id % 8)
+        ) || CASE WHEN random() < :planted THEN ' ' || :phrase ELSE '' END
+        FROM employees e
+        JOIN branches b ON e.branch_id = b.id
+        WHERE dr.employee_id = e.id AND b.company_id = :company_id
+        '''), {'words': VOCABULARY, 'word_count': len(VOCABULARY), 'planted': planted_ratio,
+               'phrase': PLANTED_PHRASE, 'company_id': company_id})
+        conn.execute(text('ANALYZE daily_reports'))
+    
+    return company_id
+
+def scan_with_ilike(conn, company_id, patterns, limit):
+    """Find reports the way it was possible before: ILIKE over report_text."""
+    conditions = ' AND '.join(f'dr.report_text ILIKE :pattern_{index}' for index in range(len(patterns)))
+    params = {f'pattern_{index}': pattern for index, pattern in enumerate(patterns)}
+    params.update({'company_id': company_id, 'limit': limit})
+    return conn.execute(text(f'''
+    SELECT dr.id, e.full_name, dr.report_date, dr.report_text
+    FROM daily_reports dr
+    JOIN employees e ON dr.employee_id = e.id
+    JOIN branches b ON e.branch_id = b.id
+    WHERE b.company_id = :company_id AND {conditions}
+    ORDER BY dr.report_date DESC
+    LIMIT :limit
+    '''), params).fetchall()
+
+def time_ms(repeat, func):
+    """Run func repeat times after a warm-up, returning timing stats in ms."""
+    func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize_ms(samples)
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark full-text report search")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--reports", type=int, default=1000000, help="Reports in the benchmark company")
+    parser.add_argument("--company-id", type=int, help="Search an existing company instead of seeding one")
+    parser.add_argument("--planted-ratio", type=float, default=0.0002,
+                        help="Share of reports containing the planted phrase")
+    parser.add_argument("--page", type=int, default=5, help="Deeper page to time")
+    parser.add_argument("--limit", type=int, default=20, help="Results per page")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+    
+    engine = get_engine(args.url)
+    report_model = load_model("report_model").ReportModel
+    
+    company_id = args.company_id
+    if company_id is None:
+        prefix = f"search{datetime.datetime.now():%H%M%S}"
+        start = time.perf_counter()
+        company_id = seed_search_company(engine, prefix, args.reports, args.planted_ratio)
+        print(f"Seeded company '{prefix}_company_1' in {time.perf_counter() - start:.0f}s")
+    
+    with engine.connect() as conn:
+        total = conn.execute(text('''
+        SELECT COUNT(*) FROM daily_reports dr
+        JOIN employees e ON dr.employee_id = e.id
+        JOIN branches b ON e.branch_id = b.id
+        WHERE b.company_id = :company_id
+        '''), {'company_id': company_id}).scalar()
+        print(f"Company {company_id}: {total:,} reports")
+        
+        def deeper_page(query):
+            cursor = None
+            for _ in range(args.page - 1):
+                _, cursor = report_model.search(conn, company_id, query, cursor=cursor, limit=args.limit)
+                if cursor is None:
+                    return None
+            return cursor
+        
+        print(f"{'query':<16} {'matches':>9} {'variant':<16} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+        for label, query, patterns in QUERIES:
+            matches = conn.execute(text('''
+            SELECT COUNT(*) FROM daily_reports dr
+            JOIN employees e ON dr.employee_id = e.id
+            JOIN branches b ON e.branch_id = b.id
+            WHERE b.company_id = :company_id
+              AND dr.search_vector @@ websearch_to_tsquery('english', :query)
+            '''), {'company_id': company_id, 'query': query}).scalar()
+            
+            variants = [
+                ("ILIKE scan", lambda: scan_with_ilike(conn, company_id, patterns, args.limit)),
+                ("search page 1", lambda: report_model.search(conn, company_id, query, limit=args.limit)),
+            ]
+            cursor = deeper_page(query)
+            if cursor is not None:
+                variants.append((f"search page {args.page}",
+                                 lambda: report_model.search(conn, company_id, query, cursor=cursor,
+                                                             limit=args.limit)))
+            
+            for variant, func in variants:
+                stats = time_ms(args.repeat, func)
+                print(f"{label:<16} {matches:>9,} {variant:<16} {stats['p50']:>9} {stats['p99']:>9} {stats['max']:>9}")
+    
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
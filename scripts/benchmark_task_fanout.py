@@ -0,0 +1,119 @@
+"""Benchmark branch task fan-out.
+
+Compares the previous per-employee INSERT loop with the set-based
+TaskModel.create_task for growing branch sizes, and times
+TaskModel.create_branch_tasks across several branches. Run against a
+scratch database only; the seeded rows are left in place.
+    
+    python -m scripts.benchmark_task_fanout --url postgresql://... --sizes 10 100 300 1000
+"""
+import argparse
+import datetime
+import time
+from sqlalchemy import event, text
+from scripts.common import get_engine, load_model, summarize_ms
+from scripts.seed_data import seed_database
+
+def create_task_per_row(conn, company_id, task_description, due_date, branch_id):
+    """The old fan-out: one INSERT round trip per branch employee."""
+    with conn.begin():
+        task_id = conn.execute(text('''
+        INSERT INTO tasks (company_id, branch_id, task_description, due_date, is_completed)
+        VALUES (:company_id, :branch_id, :task_description, :due_date, FALSE)
+        RETURNING id
+        '''), {
+            'company_id': company_id,
+            'branch_id': branch_id,
+            'task_description': task_description,
+            'due_date': due_date
+        }).fetchone()[0]
+        
+        employees = conn.execute(text('''
+        SELECT id FROM employees
+        WHERE branch_id = :branch_id AND is_active = TRUE
+        '''), {'branch_id': branch_id}).fetchall()
+        
+        for emp in employees:
+            conn.execute(text('''
+            INSERT INTO task_assignments (task_id, employee_id, is_completed)
+            VALUES (:task_id, :employee_id, FALSE)
+            '''), {'task_id': task_id, 'employee_id': emp[0]})
+    
+    return task_id
+
+def time_calls(engine, func, repeat):
+    """Call func(conn) repeat times.
+    
+    Returns:
+        Tuple of (timings in milliseconds, statements sent per call)
+    """
+    statements = []
+    
+    def count(*args):
+        statements.append(1)
+    
+    samples = []
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        with engine.connect() as conn:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func(conn)
+                samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    
+    return samples, len(statements) // repeat
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark branch task fan-out")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 300, 1000],
+                        help="Branch sizes (active employees) to test")
+    parser.add_argument("--branches", type=int, default=10,
+                        help="Branches per call for the bulk variant")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    engine = get_engine(args.url)
+    task_model = load_model("task_model").TaskModel
+    run_id = datetime.datetime.now().strftime('%H%M%S')
+    due_date = datetime.date.today() + datetime.timedelta(days=7)
+    
+    print(f"{'employees':>10} {'variant':<24} {'stmts':>6} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    
+    for size in args.sizes:
+        prefix = f"fanout{run_id}_{size}"
+        seed_database(engine, prefix=prefix, companies=1, branches_per_company=args.branches,
+                      employees_per_branch=size, report_days=0, tasks_per_branch=0,
+                      messages_per_company=0)
+        
+        with engine.connect() as conn:
+            company_id, branch_ids = conn.execute(text('''
+            SELECT c.id, ARRAY_AGG(b.id ORDER BY b.id)
+            FROM companies c
+            JOIN branches b ON b.company_id = c.id
+            WHERE c.username = :username
+            GROUP BY c.id
+            '''), {'username': f"{prefix}_company_1"}).fetchone()
+        
+        branch_id = branch_ids[0]
+        variants = [
+            ("per-row loop", lambda conn: create_task_per_row(
+                conn, company_id, "Benchmark task", due_date, branch_id)),
+            ("create_task", lambda conn: task_model.create_task(
+                conn, company_id, "Benchmark task", due_date, branch_id)),
+            (f"create_branch_tasks x{len(branch_ids)}", lambda conn: task_model.create_branch_tasks(
+                conn, company_id, "Benchmark task", due_date, branch_ids)),
+        ]
+        
+        for label, func in variants:
+            samples, statements = time_calls(engine, func, args.repeat)
+            stats = summarize_ms(samples)
+            print(f"{size:>10} {label:<24} {statements:>6} {stats['p50']:>9} {stats['p99']:>9} {stats['max']:>9}")
+    
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
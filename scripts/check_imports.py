@@ -0,0 +1,72 @@
+"""Import every application module and report the ones that fail.
+
+Catches broken imports (a moved model, a missing name) before a page
+crashes on login. Nothing is rendered and no database is needed; the
+modules only have to import.
+    
+    python -m scripts.check_imports [--verbose]
+
+Exit status is non-zero when any module fails to import.
+"""
+import argparse
+import importlib
+import os
+import traceback
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages whose modules are checked
+PACKAGES = ["config", "database", "pages", "styles", "utils"]
+
+def find_modules():
+    """List the dotted names of all modules in PACKAGES.
+    
+    The page packages have no __init__.py, so the directories are walked
+    rather than imported.
+    
+    Returns:
+        Sorted list of module names
+    """
+    modules = ["app"]
+    for package in PACKAGES:
+        for directory, subdirectories, files in os.walk(os.path.join(PROJECT_DIR, package)):
+            subdirectories[:] = [name for name in subdirectories if name != "__pycache__"]
+            prefix = os.path.relpath(directory, PROJECT_DIR).replace(os.sep, ".")
+            for file_name in files:
+                if not file_name.endswith(".py"):
+                    continue
+                name = file_name[:-3]
+                modules.append(prefix if name == "__init__" else f"{prefix}.{name}")
+    return sorted(modules)
+
+def run_checks(verbose=False):
+    """Import each module.
+    
+    Returns:
+        int: Number of modules that failed to import
+    """
+    modules = find_modules()
+    failures = 0
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            failures += 1
+            print(f"FAIL  {name}: {traceback.format_exc(limit=0).strip()}")
+        else:
+            if verbose:
+                print(f"ok    {name}")
+    
+    print(f"{len(modules) - failures}/{len(modules)} modules imported")
+    return failures
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Fail on application modules that don't import")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Also list modules that import")
+    args = parser.parse_args(argv)
+    
+    return 1 if run_checks(args.verbose) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,226 @@
+"""EXPLAIN every model read query against a seeded database.
+
+Each registered check calls a model method while a cursor hook captures the
+SQL it sends; every captured statement is then re-run as
+``EXPLAIN (FORMAT JSON)`` with the same parameters. A check fails when its
+plan contains a sequential scan on a table whose row estimate is above the
+threshold, unless the scan is listed in ALLOWED_SEQ_SCANS.
+    
+    python -m scripts.check_query_plans --url postgresql://... [--seed] [--threshold 1000]
+
+Exit status is non-zero when any check fails.
+"""
+import argparse
+import datetime
+from sqlalchemy import event, text
+from scripts.common import get_engine, load_model
+
+# Scans that are the right plan at the server's default planner costs, as
+# (check label, relation) pairs.
+ALLOWED_SEQ_SCANS = {
+    # Admin employee picker: every active employee of every company
+    ('EmployeeModel.get_active_employees', 'employees'),
+    # A week of reports across all tenants is ~15% of daily_reports,
+    # hash-joined to the employees
+    ('ReportModel.get_all_reports', 'daily_reports'),
+    ('ReportModel.get_all_reports', 'employees'),
+    # The admin inbox is about half of all messages
+    ('legacy.MessageModel.get_messages_for_admin', 'messages'),
+    # Admin task list: every task, with its assignee
+    ('legacy.TaskModel.get_all_tasks', 'tasks'),
+    ('legacy.TaskModel.get_all_tasks', 'employees'),
+}
+
+def pick_sample_ids(conn):
+    """Pick representative IDs from the seeded data.
+    
+    Returns:
+        dict: IDs of a company, branch, employee, role and task that have data
+    """
+    row = conn.execute(text('''
+    SELECT b.company_id, b.id, e.id, e.role_id, e.full_name
+    FROM employees e
+    JOIN branches b ON e.branch_id = b.id
+    WHERE b.is_main_branch = FALSE
+    ORDER BY e.id
+    LIMIT 1
+    ''')).fetchone()
+    if not row:
+        raise RuntimeError("No employees found - seed the database first (--seed)")
+    
+    task_id = conn.execute(text('''
+    SELECT id FROM tasks WHERE branch_id = :branch_id ORDER BY id LIMIT 1
+    '''), {'branch_id': row[1]}).fetchone()[0]
+    
+    return {
+        'company_id': row[0],
+        'branch_id': row[1],
+        'employee_id': row[2],
+        'role_id': row[3],
+        'employee_name': row[4],
+        'task_id': task_id
+    }
+
+def build_checks(ids):
+    """Build the registry of model read calls to verify.
+    
+    Args:
+        ids: Sample IDs from pick_sample_ids
+    
+    Returns:
+        List of (label, callable(conn)) tuples
+    """
+    from database import models as legacy
+    
+    branch_model = load_model("branch_model").BranchModel
+    company_stats_model = load_model("company_stats_model").CompanyStatsModel
+    employee_model = load_model("employee_model").EmployeeModel
+    report_model = load_model("report_model").ReportModel
+    role_model = load_model("role_model").RoleModel
+    task_model = load_model("task_model").TaskModel
+    
+    today = datetime.date.today()
+    week_ago = today - datetime.timedelta(days=7)
+    company_id = ids['company_id']
+    branch_id = ids['branch_id']
+    employee_id = ids['employee_id']
+    
+    return [
+        ('BranchModel.get_company_branches', lambda c: branch_model.get_company_branches(c, company_id)),
+        ('BranchModel.get_branch_by_id', lambda c: branch_model.get_branch_by_id(c, branch_id)),
+        ('BranchModel.get_active_branches', lambda c: branch_model.get_active_branches(c, company_id)),
+        ('BranchModel.get_branch_employees', lambda c: branch_model.get_branch_employees(c, branch_id)),
+        ('BranchModel.get_employee_count_by_branch', lambda c: branch_model.get_employee_count_by_branch(c, company_id)),
+        ('BranchModel.get_subbranches', lambda c: branch_model.get_subbranches(c, branch_id)),
+        ('BranchModel.get_subtree', lambda c: branch_model.get_subtree(c, branch_id)),
+        ('BranchModel.get_ancestors', lambda c: branch_model.get_ancestors(c, branch_id)),
+        ('BranchModel.get_subtree_rollup', lambda c: branch_model.get_subtree_rollup(c, branch_id, today)),
+        ('BranchModel.get_company_tree', lambda c: branch_model.get_company_tree(c, company_id, today)),
+        ('CompanyStatsModel.get_overview', lambda c: company_stats_model.get_overview(c, company_id)),
+        ('EmployeeModel.get_all_employees', lambda c: employee_model.get_all_employees(c)),
+        ('EmployeeModel.get_all_employees(company)', lambda c: employee_model.get_all_employees(c, company_id)),
+        ('EmployeeModel.get_branch_employees', lambda c: employee_model.get_branch_employees(c, branch_id)),
+        ('EmployeeModel.get_active_employees', lambda c: employee_model.get_active_employees(c)),
+        ('EmployeeModel.get_active_employees(branch)', lambda c: employee_model.get_active_employees(c, branch_id=branch_id)),
+        ('EmployeeModel.get_employee_by_id', lambda c: employee_model.get_employee_by_id(c, employee_id)),
+        ('ReportModel.get_employee_reports', lambda c: report_model.get_employee_reports(c, employee_id, week_ago, today)),
+        ('ReportModel.get_branch_reports', lambda c: report_model.get_branch_reports(c, branch_id, week_ago, today)),
+        ('ReportModel.get_company_reports', lambda c: report_model.get_company_reports(c, company_id, week_ago, today)),
+        ('ReportModel.get_all_reports', lambda c: report_model.get_all_reports(c, week_ago, today)),
+        ('ReportModel.get_all_reports(employee)', lambda c: report_model.get_all_reports(c, week_ago, today, ids['employee_name'])),
+        ('ReportModel.check_report_exists', lambda c: report_model.check_report_exists(c, employee_id, today)),
+        ('ReportModel.search', lambda c: report_model.search(c, company_id, "followed ticket")),
+        ('ReportModel.get_report_span', lambda c: report_model.get_report_span.uncached(c, company_id)),
+        ('ReportModel.get_reports_chunk', lambda c: report_model.get_reports_chunk(c, week_ago, today, company_id)),
+        ('ReportModel.get_reports_chunk(employee)', lambda c: report_model.get_reports_chunk(
+            c, week_ago, today, employee_id=employee_id)),
+        ('RoleModel.get_all_roles', lambda c: role_model.get_all_roles(c, company_id)),
+        ('RoleModel.get_manager_roles', lambda c: role_model.get_manager_roles(c, company_id)),
+        ('TaskModel.get_tasks_for_company', lambda c: task_model.get_tasks_for_company(c, company_id)),
+        ('TaskModel.get_tasks_for_company(pending)', lambda c: task_model.get_tasks_for_company(c, company_id, "Pending")),
+        ('TaskModel.get_branch_task_progress', lambda c: task_model.get_branch_task_progress(c, ids['task_id'])),
+        ('TaskModel.get_tasks_for_employee', lambda c: task_model.get_tasks_for_employee(c, employee_id)),
+        ('legacy.MessageModel.get_messages_for_admin', lambda c: legacy.MessageModel.get_messages_for_admin(c)),
+        ('legacy.MessageModel.get_messages_for_company', lambda c: legacy.MessageModel.get_messages_for_company(c, company_id)),
+        ('legacy.MessageModel.get_admin_messages_page', lambda c: legacy.MessageModel.get_admin_messages_page(c)),
+        ('legacy.MessageModel.get_company_conversation', lambda c: legacy.MessageModel.get_company_conversation(c, company_id)),
+        ('legacy.EmployeeModel.get_all_employees', lambda c: legacy.EmployeeModel.get_all_employees(c)),
+        ('legacy.EmployeeModel.get_active_employees', lambda c: legacy.EmployeeModel.get_active_employees(c)),
+        ('legacy.ReportModel.get_employee_reports', lambda c: legacy.ReportModel.get_employee_reports(c, employee_id, week_ago, today)),
+        ('legacy.TaskModel.get_all_tasks', lambda c: legacy.TaskModel.get_all_tasks(c)),
+        ('legacy.TaskModel.get_employee_tasks', lambda c: legacy.TaskModel.get_employee_tasks(c, employee_id)),
+    ]
+
+def find_seq_scans(plan):
+    """Collect the relation name of every Seq Scan node in a plan."""
+    scans = []
+    if plan.get('Node Type') == 'Seq Scan':
+        scans.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+def run_checks(engine, threshold=1000, verbose=False):
+    """Run every registered check and report offending plans.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        threshold: Sequential scans on tables with more estimated rows fail
+        verbose: Print passing checks as well
+    
+    Returns:
+        int: Number of failed checks
+    """
+    captured = []
+    
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+            captured.append((statement, parameters))
+    
+    failures = 0
+    
+    with engine.connect() as conn:
+        table_rows = {
+            name: rows for name, rows in conn.execute(text('''
+            SELECT relname, reltuples::bigint
+            FROM pg_class
+            WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace
+            '''))
+        }
+        checks = build_checks(pick_sample_ids(conn))
+        conn.rollback()
+        
+        for label, call in checks:
+            captured.clear()
+            event.listen(engine, "before_cursor_execute", capture)
+            try:
+                call(conn)
+            finally:
+                event.remove(engine, "before_cursor_execute", capture)
+                conn.rollback()
+            
+            problems = []
+            raw = conn.connection.dbapi_connection
+            with raw.cursor() as cursor:
+                for statement, parameters in captured:
+                    cursor.execute("EXPLAIN (FORMAT JSON) " + statement, parameters)
+                    plan = cursor.fetchone()[0][0]['Plan']
+                    for relation in find_seq_scans(plan):
+                        if table_rows.get(relation, 0) <= threshold:
+                            continue
+                        if (label, relation) in ALLOWED_SEQ_SCANS:
+                            continue
+                        problems.append(f"Seq Scan on {relation} (~{table_rows[relation]} rows)")
+            raw.rollback()
+            
+            if problems:
+                failures += 1
+                print(f"FAIL  {label}: {', '.join(sorted(set(problems)))}")
+            elif verbose:
+                print(f"ok    {label}")
+    
+    print(f"{len(checks) - failures}/{len(checks)} checks passed (threshold {threshold} rows)")
+    return failures
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Fail on sequential scans in model queries")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--threshold", type=int, default=1000,
+                        help="Row estimate above which a sequential scan fails (default: 1000)")
+    parser.add_argument("--seed", action="store_true", help="Seed synthetic data before checking")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Also list passing checks")
+    args = parser.parse_args(argv)
+    
+    from scripts.seed_data import seed_database
+    
+    engine = get_engine(args.url)
+    
+    if args.seed:
+        seed_database(engine, prefix=f"plancheck{datetime.datetime.now():%H%M%S}",
+                      employees_per_branch=40)
+    
+    return 1 if run_checks(engine, args.threshold, args.verbose) else 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
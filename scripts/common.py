@@ -0,0 +1,45 @@
+"""Helpers shared by the maintenance and benchmark scripts."""
+import importlib
+import statistics
+
+def load_model(name):
+    """Import a model module from the database.models package.
+    
+    Args:
+        name: Module name, e.g. "task_model"
+    
+    Returns:
+        The imported module
+    """
+    return importlib.import_module(f"database.models.{name}")
+
+def get_engine(url=None, **pool_settings):
+    """Build an engine for a script and bring its schema up to date.
+    
+    Args:
+        url: Database URL (defaults to DATABASE_URL or Streamlit secrets)
+        pool_settings: Overrides for build_engine, e.g. pool_size
+    
+    Returns:
+        SQLAlchemy engine
+    """
+    from database.connection import build_engine
+    from database.migrate import get_database_url, run_migrations
+    
+    engine = build_engine({"url": get_database_url(url), **pool_settings})
+    run_migrations(engine)
+    return engine
+
+def summarize_ms(samples):
+    """Summarize timing samples given in milliseconds.
+    
+    Returns:
+        dict: p50, p99 and max, rounded to 0.01 ms
+    """
+    ordered = sorted(samples)
+    p99_index = min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))
+    return {
+        'p50': round(statistics.median(ordered), 2),
+        'p99': round(ordered[p99_index], 2),
+        'max': round(ordered[-1], 2)
+    }
@@ -0,0 +1,42 @@
+"""Recount the admin overview counters and report rollups from scratch.
+
+The counter shards in ``system_counter_shards`` and the monthly ``report_rollups``
+are kept current by triggers; run this after bulk maintenance that
+bypasses them (TRUNCATE, restoring a dump with triggers disabled) or
+whenever the figures look off.
+    
+    python -m scripts.repair_counters --url postgresql://...
+"""
+import argparse
+from scripts.common import get_engine, load_model
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Recount the admin overview counters and report rollups")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    args = parser.parse_args(argv)
+    
+    engine = get_engine(args.url)
+    counters_model = load_model("system_counters_model").SystemCountersModel
+    report_model = load_model("report_model").ReportModel
+    
+    with engine.connect() as conn:
+        result = counters_model.recount(conn)
+    
+    drifted = 0
+    for column, (stored, recounted) in result.items():
+        note = "" if stored == recounted else f"  (was {stored})"
+        drifted += stored != recounted
+        print(f"{column:<24} {recounted}{note}")
+    
+    print("Counters were accurate" if not drifted else f"Repaired {drifted} counter(s)")
+    
+    with engine.connect() as conn:
+        rows, drifted_rollups = report_model.rebuild_rollups(conn)
+    
+    print(f"Report rollups were accurate ({rows} rows)" if not drifted_rollups
+          else f"Repaired {drifted_rollups} of {rows} report rollup(s)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
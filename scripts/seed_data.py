@@ -0,0 +1,191 @@
+"""Synthetic data for query-plan checks and benchmarks.
+
+All inserts are set-based (generate_series), so seeding tens of thousands
+of employees or millions of reports takes seconds rather than hours.
+Never point this at a production database.
+    
+    python -m scripts.seed_data --url postgresql://... --employees-per-branch 200
+"""
+import argparse
+from sqlalchemy import text
+
+def seed_database(engine, prefix="seed", companies=3, branches_per_company=10,
+                  employees_per_branch=30, report_days=60, tasks_per_branch=20,
+                  messages_per_company=50, report_ratio=0.9):
+    """Populate the database with a synthetic tenant set.
+    
+    Args:
+        engine: SQLAlchemy database engine
+        prefix: Prefix for generated names/usernames (must be unused)
+        companies: Number of companies
+        branches_per_company: Branches per company (one main, rest sub-branches)
+        employees_per_branch: Employees per branch (1 manager, 1 asst. manager)
+        report_days: Days of report history per employee
+        tasks_per_branch: Branch-level tasks per branch (half completed)
+        messages_per_company: Messages exchanged with admin per company
+        report_ratio: Fraction of working days with a submitted report
+    
+    Returns:
+        dict: Row counts inserted per table
+    """
+    params = {
+        'prefix': prefix,
+        'companies': companies,
+        'branches': branches_per_company,
+        'employees': employees_per_branch,
+        'days': report_days,
+        'tasks': tasks_per_branch,
+        'messages': messages_per_company,
+        'ratio': report_ratio
+    }
+    
+    with engine.connect() as conn:
+        with conn.begin():
+            result = conn.execute(text('''
+            SELECT COUNT(*) FROM companies WHERE username LIKE :prefix || '_company_%'
+            '''), params)
+            if result.fetchone()[0] > 0:
+                raise ValueError(f"Seed prefix '{prefix}' is already in use")
+            
+            conn.execute(text('SELECT setseed(0.42)'))
+            
+            conn.execute(text('''
+            INSERT INTO companies (company_name, username, password, is_active)
+            SELECT :prefix || ' Company ' || g, :prefix || '_company_' || g, 'password', TRUE
+            FROM generate_series(1, :companies) g
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO employee_roles (role_name, role_level, company_id)
+            SELECT r.role_name, r.role_level, c.id
+            FROM companies c
+            CROSS JOIN (VALUES ('Manager', 1), ('Asst. Manager', 2), ('General Employee', 3))
+                AS r(role_name, role_level)
+            WHERE c.username LIKE :prefix || '_company_%'
+            ON CONFLICT (company_id, role_name) DO NOTHING
+            '''), params)
+            
+            # One main branch per company, the rest hang off it
+            conn.execute(text('''
+            INSERT INTO branches (company_id, branch_name, location, is_main_branch, is_active)
+            SELECT c.id, 'Main Branch', 'Head Office', TRUE, TRUE
+            FROM companies c
+            WHERE c.username LIKE :prefix || '_company_%'
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO branches (company_id, parent_branch_id, branch_name, location, is_main_branch, is_active)
+            SELECT c.id, m.id, 'Branch ' || g, 'Location ' || g, FALSE, TRUE
+            FROM companies c
+            JOIN branches m ON m.company_id = c.id AND m.is_main_branch = TRUE
+            CROSS JOIN generate_series(2, :branches) g
+            WHERE c.username LIKE :prefix || '_company_%'
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO employees (branch_id, role_id, username, password, full_name, is_active)
+            SELECT b.id, r.id,
+                   :prefix || '_emp_' || b.id || '_' || g, 'password',
+                   'Employee ' || b.id || '-' || g, TRUE
+            FROM branches b
+            JOIN companies c ON b.company_id = c.id
+            CROSS JOIN generate_series(1, :employees) g
+            JOIN employee_roles r ON r.company_id = c.id
+                AND r.role_level = CASE WHEN g = 1 THEN 1 WHEN g = 2 THEN 2 ELSE 3 END
+            WHERE c.username LIKE :prefix || '_company_%'
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO daily_reports (employee_id, report_date, report_text, created_at)
+            SELECT e.id, d::date,
+                   'Worked on item ' || (random() * 1000)::int || ' and followed up on ticket '
+                       || (random() * 10000)::int || ' for branch ' || e.branch_id,
+                   d + interval '18 hours'
+            FROM employees e
+            JOIN branches b ON e.branch_id = b.id
+            JOIN companies c ON b.company_id = c.id
+            CROSS JOIN generate_series(CURRENT_DATE - (:days - 1), CURRENT_DATE, interval '1 day') d
+            WHERE c.username LIKE :prefix || '_company_%'
+              AND random() < :ratio
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO tasks (company_id, branch_id, task_description, due_date, is_completed)
+            SELECT b.company_id, b.id, 'Branch task ' || g, CURRENT_DATE + (g % 14), g % 2 = 0
+            FROM branches b
+            JOIN companies c ON b.company_id = c.id
+            CROSS JOIN generate_series(1, :tasks) g
+            WHERE c.username LIKE :prefix || '_company_%'
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO task_assignments (task_id, employee_id, is_completed)
+            SELECT t.id, e.id, t.is_completed
+            FROM tasks t
+            JOIN employees e ON e.branch_id = t.branch_id
+            JOIN companies c ON t.company_id = c.id
+            WHERE c.username LIKE :prefix || '_company_%'
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO tasks (company_id, employee_id, task_description, due_date, is_completed)
+            SELECT b.company_id, e.id, 'Direct task for ' || e.full_name, CURRENT_DATE + 7, random() < 0.5
+            FROM employees e
+            JOIN branches b ON e.branch_id = b.id
+            JOIN companies c ON b.company_id = c.id
+            WHERE c.username LIKE :prefix || '_company_%'
+              AND e.id % 5 = 0
+            '''), params)
+            
+            conn.execute(text('''
+            INSERT INTO messages (sender_type, sender_id, receiver_type, receiver_id, message_text, is_read)
+            SELECT CASE WHEN g % 2 = 0 THEN 'admin' ELSE 'company' END,
+                   CASE WHEN g % 2 = 0 THEN 0 ELSE c.id END,
+                   CASE WHEN g % 2 = 0 THEN 'company' ELSE 'admin' END,
+                   CASE WHEN g % 2 = 0 THEN c.id ELSE 0 END,
+                   'Message ' || g, g < :messages - 5
+            FROM companies c
+            CROSS JOIN generate_series(1, :messages) g
+            WHERE c.username LIKE :prefix || '_company_%'
+            '''), params)
+        
+        counts = {}
+        for table in ('companies', 'branches', 'employees', 'daily_reports',
+                      'tasks', 'task_assignments', 'messages'):
+            conn.execute(text(f'ANALYZE {table}'))
+            counts[table] = conn.execute(text(f'SELECT COUNT(*) FROM {table}')).fetchone()[0]
+        conn.commit()
+    
+    return counts
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Seed a scratch database with synthetic data")
+    parser.add_argument("--url", help="Database URL (defaults to DATABASE_URL or Streamlit secrets)")
+    parser.add_argument("--prefix", default="seed")
+    parser.add_argument("--companies", type=int, default=3)
+    parser.add_argument("--branches-per-company", type=int, default=10)
+    parser.add_argument("--employees-per-branch", type=int, default=30)
+    parser.add_argument("--report-days", type=int, default=60)
+    parser.add_argument("--tasks-per-branch", type=int, default=20)
+    args = parser.parse_args(argv)
+    
+    from scripts.common import get_engine
+    
+    engine = get_engine(args.url)
+    
+    counts = seed_database(
+        engine,
+        prefix=args.prefix,
+        companies=args.companies,
+        branches_per_company=args.branches_per_company,
+        employees_per_branch=args.employees_per_branch,
+        report_days=args.report_days,
+        tasks_per_branch=args.tasks_per_branch
+    )
+    for table, count in counts.items():
+        print(f"{table:<20} {count}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -30,58 +30,62 @@ def authenticate(engine, username, password):
             "profile_pic_url": "https://www.gravatar.com/avatar/00000000000000000000000000000000?d=mp&f=y"
         }
     
-    # If not admin, check company credentials
+    # Otherwise resolve a company or employee account in one query
     with engine.connect() as conn:
-        result = conn.execute(text('''
-        SELECT id, company_name, username, profile_pic_url
-        FROM companies
-        WHERE username = :username AND password = :password AND is_active = TRUE
-        '''), {'username': username, 'password': password})
-        company = result.fetchone()
+        return find_account(conn, username, password)
+
+def find_account(conn, username, password):
+    """Look up an active company or employee account by credentials.
     
-    if company:
-        return {
-            "id": company[0], 
-            "username": company[2], 
-            "full_name": company[1], 
-            "user_type": "company",
-            "profile_pic_url": company[3]
-        }
+    Uses the accounts view (migration 0007), so user type, tenant and role
+    come back from a single query. Companies win when a company and an
+    employee share a username.
     
-    # If not company, check employee credentials with role information
-    with engine.connect() as conn:
-        result = conn.execute(text('''
-        SELECT e.id, e.username, e.full_name, e.profile_pic_url, 
-               b.id as branch_id, b.branch_name, c.id as company_id, c.company_name,
-               r.id as role_id, r.role_name, r.role_level
-        FROM employees e
-        JOIN branches b ON e.branch_id = b.id
-        JOIN companies c ON b.company_id = c.id
-        JOIN employee_roles r ON e.role_id = r.id
-        WHERE e.username = :username AND e.password = :password 
-          AND e.is_active = TRUE AND b.is_active = TRUE AND c.is_active = TRUE
-        '''), {'username': username, 'password': password})
-        employee = result.fetchone()
+    Args:
+        conn: Database connection
+        username: User's username
+        password: User's password
     
-    if employee:
-        return {
-            "id": employee[0], 
-            "username": employee[1], 
-            "full_name": employee[2],
-            "user_type": "employee",
-            "profile_pic_url": employee[3],
-            "branch_id": employee[4],
-            "branch_name": employee[5],
-            "company_id": employee[6],
-            "company_name": employee[7],
-            "role_id": employee[8],
-            "role_name": employee[9],
-            "role_level": employee[10]
-        }
+    Returns:
+        dict: Session user information, or None if no account matches
+    """
+    account = conn.execute(text('''
+    SELECT user_type, id, username, full_name, profile_pic_url,
+           branch_id, branch_name, company_id, company_name,
+           role_id, role_name, role_level, version
+    FROM accounts
+    WHERE username = :username AND password = :password AND is_active = TRUE
+    ORDER BY precedence
+    LIMIT 1
+    '''), {'username': username, 'password': password}).fetchone()
+    
+    if not account:
+        return None
+    
+    user = {
+        "id": account[1],
+        "username": account[2],
+        "full_name": account[3],
+        "user_type": account[0],
+        "profile_pic_url": account[4]
+    }
+    
+    if account[0] == "employee":
+        user.update({
+            "branch_id": account[5],
+            "branch_name": account[6],
+            "company_id": account[7],
+            "company_name": account[8],
+            "role_id": account[9],
+            "role_name": account[10],
+            "role_level": account[11],
+            "version": account[12]
+        })
     
-    return None
+    return user
 
 def logout():
     """Log out the current user by clearing session state."""
     st.session_state.pop("user", None)
+    st.session_state.pop("employee_context", None)
     st.rerun()
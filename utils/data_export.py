@@ -0,0 +1,180 @@
+"""Raw data exports (CSV and Parquet) written batch by batch.
+
+Rows are read from an iterator, normally a model ``stream_*`` method
+backed by a server-side cursor, and written BATCH_SIZE rows at a time
+into a temporary file. Only one batch is held in memory, however
+many rows are exported.
+
+Parquet needs pyarrow; when it is not installed only CSV is offered.
+"""
+import csv
+import datetime
+import io
+import itertools
+import os
+import tempfile
+from typing import NamedTuple
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Rows fetched and written per batch
+BATCH_SIZE = 5000
+
+class ExportColumn(NamedTuple):
+    """One column of a data export.
+    
+    Attributes:
+        name: Column header
+        kind: Value kind: 'int', 'text', 'bool', 'date' or 'timestamp'
+    """
+    name: str
+    kind: str
+
+REPORT_COLUMNS = [
+    ExportColumn('id', 'int'),
+    ExportColumn('employee', 'text'),
+    ExportColumn('role', 'text'),
+    ExportColumn('branch', 'text'),
+    ExportColumn('report_date', 'date'),
+    ExportColumn('report_text', 'text'),
+    ExportColumn('created_at', 'timestamp')
+]
+
+TASK_COLUMNS = [
+    ExportColumn('id', 'int'),
+    ExportColumn('task_description', 'text'),
+    ExportColumn('due_date', 'date'),
+    ExportColumn('is_completed', 'bool'),
+    ExportColumn('completed_at', 'timestamp'),
+    ExportColumn('created_at', 'timestamp'),
+    ExportColumn('branch_id', 'int'),
+    ExportColumn('employee_id', 'int'),
+    ExportColumn('assignee_name', 'text'),
+    ExportColumn('assignee_type', 'text'),
+    ExportColumn('completed_by', 'text')
+]
+
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+
+def available_formats():
+    """List the export formats usable in this environment.
+    
+    Returns:
+        List of format names (keys of FORMATS)
+    """
+    return [name for name in FORMATS if name != 'Parquet' or pyarrow is not None]
+
+def _batches(rows, batch_size):
+    """Split a row iterator into lists of at most batch_size rows."""
+    rows = iter(rows)
+    while True:
+        batch = list(itertools.islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+def _csv_value(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+def write_csv(rows, columns, output, batch_size=BATCH_SIZE):
+    """Write rows as UTF-8 CSV with a header line.
+    
+    Args:
+        rows: Iterable of row tuples in column order
+        columns: List of ExportColumn
+        output: Binary file object to write to
+        batch_size: Rows encoded and written at a time
+    
+    Returns:
+        int: Number of rows written
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    
+    count = 0
+    for batch in _batches(rows, batch_size):
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        count += len(batch)
+        output.write(buffer.getvalue().encode('utf-8'))
+        buffer.seek(0)
+        buffer.truncate()
+    
+    output.write(buffer.getvalue().encode('utf-8'))
+    return count
+
+def _parquet_schema(columns):
+    types = {
+        'int': pyarrow.int64(),
+        'text': pyarrow.string(),
+        'bool': pyarrow.bool_(),
+        'date': pyarrow.date32(),
+        'timestamp': pyarrow.timestamp('us')
+    }
+    return pyarrow.schema([(column.name, types[column.kind]) for column in columns])
+
+def write_parquet(rows, columns, output, batch_size=BATCH_SIZE):
+    """Write rows as a Parquet file, one row group per batch.
+    
+    Args:
+        rows: Iterable of row tuples in column order
+        columns: List of ExportColumn
+        output: Binary file object to write to
+        batch_size: Rows per row group
+    
+    Returns:
+        int: Number of rows written
+    
+    Raises:
+        RuntimeError: If pyarrow is not installed
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires pyarrow")
+    
+    schema = _parquet_schema(columns)
+    count = 0
+    with pyarrow.parquet.ParquetWriter(output, schema, compression='zstd') as writer:
+        for batch in _batches(rows, batch_size):
+            arrays = [pyarrow.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            writer.write_batch(pyarrow.record_batch(arrays, schema=schema))
+            count += len(batch)
+    return count
+
+def export_rows(rows, columns, file_format, batch_size=BATCH_SIZE):
+    """Export rows into a temporary file.
+    
+    The caller owns the file and removes it once it has been served.
+    
+    Args:
+        rows: Iterable of row tuples in column order, consumed lazily
+        columns: List of ExportColumn
+        file_format: 'CSV' or 'Parquet'
+        batch_size: Rows written at a time
+    
+    Returns:
+        Tuple of (path of the temporary file, row count)
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown export format: {file_format}")
+    
+    handle, path = tempfile.mkstemp(prefix="export-", suffix=f".{FORMATS[file_format][0]}")
+    try:
+        with os.fdopen(handle, 'wb') as output:
+            writer = write_csv if file_format == 'CSV' else write_parquet
+            count = writer(rows, columns, output, batch_size)
+    except Exception:
+        os.remove(path)
+        raise
+    return path, count
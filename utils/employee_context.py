@@ -0,0 +1,77 @@
+from typing import NamedTuple
+import streamlit as st
+from sqlalchemy import text
+
+class EmployeeContext(NamedTuple):
+    """Per-session employee details used by the employee dashboard"""
+    id: int
+    full_name: str
+    username: str
+    profile_pic_url: str
+    branch_id: int
+    branch_name: str
+    role_id: int
+    role_name: str
+    role_level: int
+    version: int     # employees.version the details were read at
+
+def get_employee_context(engine):
+    """Get the logged-in employee's context, reloading it only when stale.
+    
+    The context is kept in the session. Each rerun compares its version
+    with employees.version (a primary key lookup), which triggers bump
+    whenever the employee, their role or their branch changes; only then
+    is the full employee/branch/role join run again. Login seeds the
+    context, so a fresh session normally never runs the join.
+    
+    Args:
+        engine: SQLAlchemy database engine
+    
+    Returns:
+        EmployeeContext, or None if the employee no longer exists
+    """
+    user = st.session_state.user
+    context = st.session_state.get("employee_context")
+    if (context is None or context.id != user["id"]) and user.get("version") is not None:
+        context = EmployeeContext(
+            id=user["id"],
+            full_name=user["full_name"],
+            username=user["username"],
+            profile_pic_url=user["profile_pic_url"],
+            branch_id=user["branch_id"],
+            branch_name=user["branch_name"],
+            role_id=user["role_id"],
+            role_name=user["role_name"],
+            role_level=user["role_level"],
+            version=user["version"]
+        )
+    
+    with engine.connect() as conn:
+        version = conn.execute(text('''
+        SELECT version FROM employees WHERE id = :employee_id
+        '''), {'employee_id': user["id"]}).scalar()
+        
+        if version is None:
+            st.session_state.pop("employee_context", None)
+            return None
+        
+        if context is None or context.id != user["id"] or context.version != version:
+            row = conn.execute(text('''
+            SELECT e.id, e.full_name, e.username, e.profile_pic_url,
+                   b.id as branch_id, b.branch_name,
+                   r.id as role_id, r.role_name, r.role_level, e.version
+            FROM employees e
+            JOIN branches b ON e.branch_id = b.id
+            JOIN employee_roles r ON e.role_id = r.id
+            WHERE e.id = :employee_id
+            '''), {'employee_id': user["id"]}).fetchone()
+            
+            if not row:
+                st.session_state.pop("employee_context", None)
+                return None
+            context = EmployeeContext(*row)
+    
+    st.session_state.employee_context = context
+    # Keep the session user in step for pages that read it directly
+    user.update(context._asdict())
+    return context
@@ -0,0 +1,264 @@
+"""Background export jobs: report PDFs rendered in worker processes.
+
+Large exports take long enough to freeze a Streamlit session and hold
+its database connection open for the whole time. Instead the page queues
+a job (see ExportJobModel) and returns; this process claims queued jobs
+up to its worker count and renders them in a process pool, each worker
+with its own short-lived database connection. Finished files are kept in
+the export directory for the requester to download from the jobs panel.
+
+No company may have more than ``per_company`` jobs running at once, or
+more than ``max_active_per_company`` queued or running; the limits are
+checked in the database, so they hold across app processes.
+
+Settings come from the optional ``[export_jobs]`` secrets section:
+``workers`` (default 2), ``per_company`` (1), ``max_active_per_company``
+(5), ``directory`` (``akhand-exports`` under the system temp dir),
+``timeout_minutes`` (60), ``retention_hours`` (24) and ``log`` (job
+starts, finishes and failures; default ``logs/export_jobs.log``).
+"""
+import datetime
+import logging
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from database.instrumentation import configure_file_log
+from database.models.export_job_model import ExportJobModel
+from database.pdf_cache import PDF_CACHE
+
+DEFAULT_SETTINGS = {
+    "workers": 2,
+    "per_company": 1,
+    "max_active_per_company": 5,
+    "directory": os.path.join(tempfile.gettempdir(), "akhand-exports"),
+    "timeout_minutes": 60,
+    "retention_hours": 24,
+    "log": os.path.join("logs", "export_jobs.log")
+}
+
+job_logger = logging.getLogger("akhand.export_jobs")
+
+class ExportJobRunner:
+    """Process-wide dispatcher of export jobs to a process pool"""
+    
+    def __init__(self):
+        # Reentrant: a done callback may run right away in the submitting thread
+        self._lock = threading.RLock()
+        self._executor = None
+        self._in_flight = set()
+        self.settings = dict(DEFAULT_SETTINGS)
+    
+    def configure(self, settings=None):
+        """Apply [export_jobs] settings; takes effect for the next pool started."""
+        settings = settings or {}
+        with self._lock:
+            self.settings = dict(DEFAULT_SETTINGS)
+            self.settings.update({k: settings[k] for k in DEFAULT_SETTINGS if k in settings})
+            configure_file_log(job_logger, self.settings["log"], logging.INFO)
+    
+    def submit(self, engine, company_id, requested_by_type, requested_by_id, kind, params, title):
+        """Queue an export and start it if a worker is free.
+        
+        Args:
+            engine: SQLAlchemy database engine
+            company_id: Company the export belongs to (None for admin-wide exports)
+            requested_by_type: 'admin', 'company' or 'employee'
+            requested_by_id: ID of the requester
+            kind: One of RENDERERS' keys
+            params: Render parameters for the kind
+            title: Human readable description of the export
+        
+        Returns:
+            int: ID of the queued job
+        
+        Raises:
+            ValueError: If the kind is unknown or the company already has
+                too many unfinished jobs
+        """
+        if kind not in RENDERERS:
+            raise ValueError(f"Unknown export kind: {kind}")
+        
+        with engine.connect() as conn:
+            job_id = ExportJobModel.create_job(
+                conn, company_id, requested_by_type, requested_by_id, kind, params, title,
+                int(self.settings["max_active_per_company"])
+            )
+        self.dispatch(engine)
+        return job_id
+    
+    def dispatch(self, engine):
+        """Start queued jobs on this process's free workers.
+        
+        Also gives up jobs stuck running past the timeout and removes
+        expired export files. Cheap enough to call on every jobs panel run.
+        
+        Args:
+            engine: SQLAlchemy database engine
+        """
+        with self._lock:
+            workers = int(self.settings["workers"])
+            free = workers - len(self._in_flight)
+            if free <= 0:
+                return
+            
+            with engine.connect() as conn:
+                ExportJobModel.fail_stale_jobs(conn, int(self.settings["timeout_minutes"]))
+                for path in ExportJobModel.delete_expired_jobs(conn, int(self.settings["retention_hours"])):
+                    _remove(path)
+                jobs = ExportJobModel.claim_jobs(conn, free, int(self.settings["per_company"]))
+            
+            if not jobs:
+                return
+            
+            if self._executor is None:
+                # spawn: forking a process with Streamlit's threads running is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                os.makedirs(self.settings["directory"], exist_ok=True)
+            
+            database_url = engine.url.render_as_string(hide_password=False)
+            for job in jobs:
+                self._in_flight.add(job.id)
+                future = self._executor.submit(
+                    render_export, job.id, job.kind, job.params, database_url, self.settings["directory"]
+                )
+                future.add_done_callback(
+                    lambda future, job=job: self._finished(engine, job, future)
+                )
+                job_logger.info("job=%d kind=%s company=%s started", job.id, job.kind, job.company_id)
+    
+    def _finished(self, engine, job, future):
+        """Record a job's outcome and start the next ones (pool callback thread)."""
+        try:
+            file_path, file_size = future.result()
+        except Exception as e:
+            job_logger.exception("job=%d failed", job.id)
+            if isinstance(e, BrokenProcessPool):
+                # A worker died (e.g. out of memory); start a fresh pool next time
+                with self._lock:
+                    self._executor = None
+            with engine.connect() as conn:
+                ExportJobModel.fail_job(conn, job.id, f"{type(e).__name__}: {e}")
+        else:
+            job_logger.info("job=%d finished bytes=%d", job.id, file_size)
+            with engine.connect() as conn:
+                ExportJobModel.finish_job(conn, job.id, file_path, file_size)
+            if job.params.get('cache_key'):
+                # Later downloads of the same document are served from the cache
+                start_date, end_date = _dates(job.params)
+                with open(file_path, 'rb') as pdf:
+                    PDF_CACHE.put(job.params['cache_key'], pdf, job.company_id, start_date, end_date).close()
+        finally:
+            with self._lock:
+                self._in_flight.discard(job.id)
+        
+        self.dispatch(engine)
+    
+    def delete(self, engine, job_id, company_id=None):
+        """Delete a finished or failed job and its file.
+        
+        Args:
+            engine: SQLAlchemy database engine
+            job_id: ID of the job
+            company_id: Optional company ID the job must belong to
+        """
+        with engine.connect() as conn:
+            _remove(ExportJobModel.delete_job(conn, job_id, company_id))
+
+
+EXPORT_JOBS = ExportJobRunner()
+
+
+def configure_export_jobs(settings=None):
+    """Apply the [export_jobs] settings to the process-wide runner."""
+    EXPORT_JOBS.configure(settings)
+
+def _remove(path):
+    """Delete an export file if it still exists."""
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _dates(params):
+    """Parse a job's date range (dates are stored as ISO strings)."""
+    return datetime.date.fromisoformat(params['start_date']), datetime.date.fromisoformat(params['end_date'])
+
+def _period(params):
+    """Parse a job's optional period shown in the PDF header."""
+    if params.get('period_start'):
+        return datetime.date.fromisoformat(params['period_start']), datetime.date.fromisoformat(params['period_end'])
+    return None
+
+def _render_company(conn, ReportModel, pdf_generator, params):
+    start_date, end_date = _dates(params)
+    return pdf_generator.create_company_report_pdf(
+        ReportModel.stream_company_reports(conn, params['company_id'], start_date, end_date),
+        params['company_name'], period=_period(params)
+    )
+
+def _render_branch(conn, ReportModel, pdf_generator, params):
+    start_date, end_date = _dates(params)
+    return pdf_generator.create_branch_report_pdf(
+        ReportModel.stream_branch_reports(conn, params['branch_id'], start_date, end_date),
+        params['branch_name'], period=_period(params)
+    )
+
+def _render_role(conn, ReportModel, pdf_generator, params):
+    start_date, end_date = _dates(params)
+    return pdf_generator.create_role_report_pdf(
+        ReportModel.stream_company_reports(conn, params['company_id'], start_date, end_date,
+                                           role_id=params['role_id']),
+        params['role_name'], params['company_name'], period=_period(params)
+    )
+
+def _render_employee(conn, ReportModel, pdf_generator, params):
+    start_date, end_date = _dates(params)
+    return pdf_generator.create_employee_report_pdf(
+        ReportModel.get_employee_reports(conn, params['employee_id'], start_date, end_date),
+        params['employee_name']
+    )
+
+# Job kind -> renderer(conn, ReportModel, pdf_generator module, params)
+RENDERERS = {
+    'company': _render_company,
+    'branch': _render_branch,
+    'role': _render_role,
+    'employee': _render_employee
+}
+
+def render_export(job_id, kind, params, database_url, directory):
+    """Render one export job to a file (runs in a worker process).
+    
+    Args:
+        job_id: ID of the job, used for the file name
+        kind: One of RENDERERS' keys
+        params: Render parameters for the kind
+        database_url: URL to open the worker's own connection with
+        directory: Directory to write the file to
+    
+    Returns:
+        Tuple of (file path, file size in bytes)
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.pool import NullPool
+    from database.models.report_model import ReportModel
+    from utils import pdf_generator
+    
+    engine = create_engine(database_url, poolclass=NullPool)
+    path = os.path.join(directory, f"export_{job_id}.pdf")
+    try:
+        with engine.connect() as conn:
+            with RENDERERS[kind](conn, ReportModel, pdf_generator, params) as pdf:
+                with open(path, 'wb') as output:
+                    shutil.copyfileobj(pdf, output)
+    finally:
+        engine.dispose()
+    return path, os.path.getsize(path)
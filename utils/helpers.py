@@ -1,10 +1,12 @@
 import datetime
 
-def get_date_range_from_filter(date_filter):
+def get_date_range_from_filter(date_filter, first_report_date=None):
     """Get start and end dates based on a date filter selection.
     
     Args:
         date_filter: String representing the selected date range
+        first_report_date: Date of the first report in scope (see
+            ReportModel.get_report_span); "All Time" starts there
         
     Returns:
         tuple: (start_date, end_date)
@@ -24,7 +26,7 @@ def get_date_range_from_filter(date_filter):
         start_date = today.replace(month=1, day=1)
         end_date = today
     else:  # All Time/Reports
-        start_date = datetime.date(2000, 1, 1)
+        start_date = min(first_report_date, today) if first_report_date else datetime.date(2000, 1, 1)
         end_date = today
     
     return start_date, end_date
@@ -1,401 +1,387 @@
-import io
-from reportlab.lib.pagesizes import letter, landscape
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+import tempfile
+from typing import Callable, NamedTuple
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+from reportlab.pdfbase.pdfdoc import PDFArray, PDFName, PDFStream, PDFZCompress
+from reportlab.pdfgen.canvas import Canvas
 
-def create_employee_report_pdf(reports, employee_name=None):
-    """Generate a PDF report for employee daily reports.
+# PDFs up to this size stay in memory; larger ones roll over to a temp file
+SPOOL_MAX_BYTES = 1024 * 1024
+
+def _build_styles():
+    """Build the paragraph styles shared by every report PDF."""
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle('Title', parent=styles['Heading1'], fontSize=16, alignment=1, spaceAfter=12),
+        'period': ParagraphStyle('DateRange', parent=styles['Normal'], fontSize=10, alignment=1,
+                                 textColor=colors.gray),
+        'group': ParagraphStyle('Group', parent=styles['Heading2'], fontSize=14, spaceAfter=10),
+        'branch': ParagraphStyle('Branch', parent=styles['Heading2'], fontSize=16, spaceAfter=10,
+                                 textColor=colors.blue),
+        'employee': ParagraphStyle('Employee', parent=styles['Heading3'], fontSize=14, spaceAfter=8),
+        'date': ParagraphStyle('Date', parent=styles['Normal'], fontSize=11, textColor=colors.blue),
+        'company_date': ParagraphStyle('CompanyDate', parent=styles['Normal'], fontSize=11,
+                                       textColor=colors.darkblue),
+        'text': ParagraphStyle('ReportText', parent=styles['Normal'], fontSize=10, leftIndent=10)
+    }
+
+STYLES = _build_styles()
+
+class _FlowableStream:
+    """List-like queue over a flowable iterator for SimpleDocTemplate.build.
+    
+    build() only ever looks at, removes from and inserts at the front of
+    its flowable list, so a small lookahead buffer refilled from the
+    iterator stands in for the full list. Flowables are created as the
+    pages are laid out and dropped once drawn.
+    """
+    LOOKAHEAD = 32
     
+    def __init__(self, flowables):
+        self._source = iter(flowables)
+        self._buffer = []
+    
+    def _fill(self, count):
+        while len(self._buffer) < count:
+            try:
+                self._buffer.append(next(self._source))
+            except StopIteration:
+                break
+    
+    def __len__(self):
+        # Never past the end, so build() stops at the right time; within
+        # the lookahead, enough for keepWithNext chains
+        self._fill(self.LOOKAHEAD)
+        return len(self._buffer)
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self._fill(index.stop if index.stop is not None else self.LOOKAHEAD)
+        else:
+            self._fill(index + 1)
+        return self._buffer[index]
+    
+    def __setitem__(self, index, value):
+        self._buffer[index] = value
+    
+    def __delitem__(self, index):
+        self[index]
+        del self._buffer[index]
+    
+    def insert(self, index, value):
+        self._buffer.insert(index, value)
+
+class _CompressingCanvas(Canvas):
+    """Canvas that compresses each page's content as soon as it is finished.
+    
+    reportlab keeps every page's drawing commands as text until the
+    document is saved, which grows with the report count; compressed
+    pages take a fraction of that.
+    """
+    
+    def showPage(self):
+        super().showPage()
+        page = self._doc.Pages[-1]
+        contents = PDFStream(content=PDFZCompress.encode(page.stream))
+        contents.dictionary["Filter"] = PDFArray([PDFName(PDFZCompress.pdfname)])
+        contents.__Comment__ = "page stream"
+        page.Contents = contents
+        page.stream = None
+
+def _render(flowables, **doc_options):
+    """Lay out flowables into a spooled temporary file.
+
     Args:
-        reports: List of report data tuples (id, date, text)
-        employee_name: Name of the employee (optional)
-        
+        flowables: Iterable of flowables, consumed lazily
+        doc_options: Extra SimpleDocTemplate options, e.g. margins
+    
     Returns:
-        bytes: PDF content as bytes
+        SpooledTemporaryFile holding the PDF, positioned at the start
     """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    # Title
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=1,
-        spaceAfter=12
-    )
-    title = f"Work Reports: {employee_name}" if employee_name else "Work Reports"
-    elements.append(Paragraph(title, title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Date range
-    if reports:
-        date_style = ParagraphStyle(
-            'DateRange',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,
-            textColor=colors.gray
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, suffix=".pdf")
+    doc = SimpleDocTemplate(output, pagesize=letter, **doc_options)
+    doc.build(_FlowableStream(flowables), canvasmaker=_CompressingCanvas)
+    output.seek(0)
+    return output
+
+class ReportBatch:
+    """Report rows stored column by column.
+    
+    Args:
+        columns: Mapping of field name to a sequence of values; all
+            sequences have the same length
+    
+    Raises:
+        ValueError: If the columns differ in length
+    """
+    
+    def __init__(self, columns):
+        self.columns = dict(columns)
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Report batch columns differ in length")
+        self.length = lengths.pop() if lengths else 0
+    
+    @classmethod
+    def from_rows(cls, rows, fields):
+        """Build a batch from row tuples.
+        
+        Args:
+            rows: Sequence of row tuples
+            fields: Names of the row positions, in order
+        
+        Returns:
+            ReportBatch
+        """
+        columns = list(zip(*rows)) if rows else [()] * len(fields)
+        return cls(zip(fields, columns))
+    
+    def __len__(self):
+        return self.length
+    
+    def __getitem__(self, field):
+        return self.columns[field]
+
+class GroupLevel(NamedTuple):
+    """One level of headings in a report document"""
+    fields: tuple           # fields the heading is built from
+    heading: Callable       # field values -> heading text
+    style: str = 'group'
+    spacing: int = 15       # space after the group
+
+class DocumentSpec(NamedTuple):
+    """Layout of a report document: row fields, grouping and styling.
+    
+    Rows need at least 'date' and 'text' fields, plus the fields the
+    group levels are built from. Levels nest outermost first.
+    """
+    fields: tuple
+    levels: tuple
+    date_style: str = 'date'
+    spacing: int = 12           # space after each report
+    one_per_date: bool = False  # show only the first report of a date per group
+    newest_first: bool = False  # sort each group's reports by date
+    doc_options: dict = None    # extra SimpleDocTemplate options, e.g. margins
+
+def _heading_column(batch, level):
+    """Build a level's heading for every row of a batch.
+    
+    Headings are built once per distinct combination of values.
+    """
+    headings = {}
+    column = []
+    for values in zip(*(batch[field] for field in level.fields)):
+        heading = headings.get(values)
+        if heading is None:
+            heading = headings[values] = level.heading(*values)
+        column.append(heading)
+    return column
+
+def _sorted_entries(batch, spec):
+    """Yield (headings, date, text) of a batch in document order.
+    
+    A single sort puts each group's rows together: groups keep the order
+    they first appear in, nested groups within their parent, and rows
+    keep their order within a group (or go newest first).
+    """
+    headings = [_heading_column(batch, level) for level in spec.levels]
+    dates = batch['date']
+    texts = batch['text']
+    
+    sort_columns = []
+    for depth in range(len(headings)):
+        # Rank each group by where it first appears within its parents
+        first_seen = {}
+        sort_columns.append([
+            first_seen.setdefault(path, len(first_seen))
+            for path in zip(*headings[:depth + 1])
+        ])
+    if spec.newest_first:
+        sort_columns.append([-report_date.toordinal() for report_date in dates])
+    
+    sort_keys = list(zip(*sort_columns))
+    labels = list(zip(*headings))
+    for index in sorted(range(len(batch)), key=sort_keys.__getitem__):
+        yield labels[index], dates[index], texts[index]
+
+def _streamed_entries(rows, spec):
+    """Yield (headings, date, text) of rows already in document order."""
+    positions = [tuple(spec.fields.index(field) for field in level.fields) for level in spec.levels]
+    date_index = spec.fields.index('date')
+    text_index = spec.fields.index('text')
+    
+    for row in rows:
+        labels = tuple(
+            level.heading(*(row[position] for position in level_positions))
+            for level, level_positions in zip(spec.levels, positions)
         )
-        min_date = min(report[1] for report in reports).strftime('%d %b %Y')
-        max_date = max(report[1] for report in reports).strftime('%d %b %Y')
-        elements.append(Paragraph(f"Period: {min_date} to {max_date}", date_style))
-        elements.append(Spacer(1, 20))
-    
-    # Group reports by month
-    reports_by_month = {}
-    for report in reports:
-        month_year = report[1].strftime('%B %Y')
-        if month_year not in reports_by_month:
-            reports_by_month[month_year] = []
-        reports_by_month[month_year].append(report)
-    
-    # Add each month's reports
-    for month, month_reports in reports_by_month.items():
-        # Month header
-        month_style = ParagraphStyle(
-            'Month',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10
+        yield labels, row[date_index], row[text_index]
+
+def _flowables(entries, spec, title, period):
+    """Yield the flowables of a report document in one pass over its entries."""
+    yield Paragraph(title, STYLES['title'])
+    yield Spacer(1, 12)
+    
+    if period is not None:
+        yield Paragraph(
+            f"Period: {period[0].strftime('%d %b %Y')} to {period[1].strftime('%d %b %Y')}",
+            STYLES['period']
         )
-        elements.append(Paragraph(month, month_style))
-        
-        # Reports for the month
-        for report in month_reports:
-            # Date
-            date_style = ParagraphStyle(
-                'Date',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor=colors.blue
-            )
-            elements.append(Paragraph(report[1].strftime('%A, %d %b %Y'), date_style))
-            
-            # Report text
-            text_style = ParagraphStyle(
-                'ReportText',
-                parent=styles['Normal'],
-                fontSize=10,
-                leftIndent=10
-            )
-            elements.append(Paragraph(report[2], text_style))
-            elements.append(Spacer(1, 12))
+        yield Spacer(1, 20)
+    
+    levels = spec.levels
+    open_labels = ()
+    last_date = None
+    for labels, report_date, report_text in entries:
+        if labels != open_labels:
+            # Close the groups from the outermost changed level inwards, then open the new ones
+            depth = 0
+            while depth < len(open_labels) and open_labels[depth] == labels[depth]:
+                depth += 1
+            if open_labels:
+                for level in reversed(levels[depth:]):
+                    yield Spacer(1, level.spacing)
+            for level, label in zip(levels[depth:], labels[depth:]):
+                yield Paragraph(label, STYLES[level.style])
+            open_labels = labels
+            last_date = None
         
-        elements.append(Spacer(1, 10))
+        if spec.one_per_date and report_date == last_date:
+            continue
+        last_date = report_date
+        yield Paragraph(report_date.strftime('%A, %d %b %Y'), STYLES[spec.date_style])
+        yield Paragraph(report_text, STYLES['text'])
+        yield Spacer(1, spec.spacing)
+    
+    if open_labels:
+        for level in reversed(levels):
+            yield Spacer(1, level.spacing)
+
+def render_report_document(reports, spec, title, period=None):
+    """Render reports into a PDF laid out by a document spec.
+    
+    Args:
+        reports: A ReportBatch, a list of row tuples laid out as
+            spec.fields, or an iterator of such rows already in document
+            order (e.g. a streamed query result)
+        spec: DocumentSpec of the document
+        title: Document title
+        period: Optional (start_date, end_date) shown as the period;
+            derived from the reports unless they are an iterator
+    
+    Returns:
+        SpooledTemporaryFile holding the PDF, positioned at the start
+    """
+    if isinstance(reports, (list, tuple)):
+        reports = ReportBatch.from_rows(reports, spec.fields)
+    
+    if isinstance(reports, ReportBatch):
+        if period is None and len(reports):
+            period = (min(reports['date']), max(reports['date']))
+        entries = _sorted_entries(reports, spec)
+    else:
+        entries = _streamed_entries(reports, spec)
     
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return _render(_flowables(entries, spec, title, period), **(spec.doc_options or {}))
 
-def create_branch_report_pdf(reports, branch_name):
+_COMPANY_FIELDS = ('id', 'employee_name', 'role_name', 'branch_name', 'date', 'text', 'created_at')
+
+EMPLOYEE_REPORT = DocumentSpec(
+    fields=('id', 'date', 'text'),
+    levels=(GroupLevel(('date',), lambda report_date: report_date.strftime('%B %Y'), spacing=10),)
+)
+
+BRANCH_REPORT = DocumentSpec(
+    fields=('id', 'employee_name', 'role_name', 'date', 'text', 'created_at'),
+    levels=(GroupLevel(('employee_name', 'role_name'), '{} ({})'.format),)
+)
+
+COMPANY_REPORT = DocumentSpec(
+    fields=_COMPANY_FIELDS,
+    levels=(
+        GroupLevel(('branch_name',), 'Branch: {}'.format, style='branch', spacing=20),
+        GroupLevel(('employee_name', 'role_name'), '{} ({})'.format, style='employee', spacing=10)
+    ),
+    date_style='company_date',
+    spacing=10,
+    one_per_date=True,
+    newest_first=True,
+    doc_options={'leftMargin': 0.5 * inch, 'rightMargin': 0.5 * inch}
+)
+
+ROLE_REPORT = DocumentSpec(
+    fields=_COMPANY_FIELDS,
+    levels=(GroupLevel(('employee_name', 'branch_name'), '{} ({})'.format),),
+    spacing=10,
+    one_per_date=True,
+    newest_first=True
+)
+
+def create_employee_report_pdf(reports, employee_name=None, period=None):
+    """Generate a PDF report for employee daily reports.
+    
+    Args:
+        reports: Report data tuples (id, date, text), newest first; a list
+            or an iterator such as a streamed query result
+        employee_name: Name of the employee (optional)
+        period: Optional (start_date, end_date) shown as the period;
+            derived from the reports when they are a list
+
+    Returns:
+        SpooledTemporaryFile holding the PDF, positioned at the start
+    """
+    title = f"Work Reports: {employee_name}" if employee_name else "Work Reports"
+    return render_report_document(reports, EMPLOYEE_REPORT, title, period)
+
+def create_branch_report_pdf(reports, branch_name, period=None):
     """Generate a PDF report for all employees in a branch.
     
     Args:
-        reports: List of report data tuples (id, employee_name, role, date, text, created_at)
+        reports: Report data tuples (id, employee_name, role, date, text, created_at);
+            a list, or an iterator ordered by employee (see
+            ReportModel.stream_branch_reports)
         branch_name: Name of the branch
-        
+        period: Optional (start_date, end_date) shown as the period;
+            derived from the reports when they are a list
+    
     Returns:
-        bytes: PDF content as bytes
+        SpooledTemporaryFile holding the PDF, positioned at the start
     """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    # Title
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=1,
-        spaceAfter=12
-    )
-    elements.append(Paragraph(f"Branch Reports: {branch_name}", title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Date range
-    if reports:
-        date_style = ParagraphStyle(
-            'DateRange',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,
-            textColor=colors.gray
-        )
-        min_date = min(report[3] for report in reports).strftime('%d %b %Y')
-        max_date = max(report[3] for report in reports).strftime('%d %b %Y')
-        elements.append(Paragraph(f"Period: {min_date} to {max_date}", date_style))
-        elements.append(Spacer(1, 20))
-    
-    # Group reports by employee and date
-    reports_by_employee = {}
-    for report in reports:
-        employee_name = report[1]
-        role_name = report[2]
-        
-        key = f"{employee_name} ({role_name})"
-        if key not in reports_by_employee:
-            reports_by_employee[key] = []
-        
-        reports_by_employee[key].append(report)
-    
-    # Add each employee's reports
-    for employee, emp_reports in reports_by_employee.items():
-        # Employee header
-        emp_style = ParagraphStyle(
-            'Employee',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10
-        )
-        elements.append(Paragraph(employee, emp_style))
-        
-        # Group by date
-        for report in emp_reports:
-            # Date
-            date_style = ParagraphStyle(
-                'Date',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor=colors.blue
-            )
-            elements.append(Paragraph(report[3].strftime('%A, %d %b %Y'), date_style))
-            
-            # Report text
-            text_style = ParagraphStyle(
-                'ReportText',
-                parent=styles['Normal'],
-                fontSize=10,
-                leftIndent=10
-            )
-            elements.append(Paragraph(report[4], text_style))
-            elements.append(Spacer(1, 12))
-        
-        elements.append(Spacer(1, 15))
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return render_report_document(reports, BRANCH_REPORT, f"Branch Reports: {branch_name}", period)
 
-def create_company_report_pdf(reports, company_name):
+def create_company_report_pdf(reports, company_name, period=None):
     """Generate a PDF report for all branches in a company.
     
     Args:
-        reports: List of report data tuples (id, employee_name, role, branch_name, date, text, created_at)
+        reports: Report data tuples (id, employee_name, role, branch_name, date, text, created_at);
+            a list, or an iterator ordered by branch and employee (see
+            ReportModel.stream_company_reports)
         company_name: Name of the company
-        
+        period: Optional (start_date, end_date) shown as the period;
+            derived from the reports when they are a list
+    
     Returns:
-        bytes: PDF content as bytes
+        SpooledTemporaryFile holding the PDF, positioned at the start
     """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=0.5*inch, rightMargin=0.5*inch)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    # Title
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=1,
-        spaceAfter=12
-    )
-    elements.append(Paragraph(f"Company Reports: {company_name}", title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Date range
-    if reports:
-        date_style = ParagraphStyle(
-            'DateRange',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,
-            textColor=colors.gray
-        )
-        min_date = min(report[4] for report in reports).strftime('%d %b %Y')
-        max_date = max(report[4] for report in reports).strftime('%d %b %Y')
-        elements.append(Paragraph(f"Period: {min_date} to {max_date}", date_style))
-        elements.append(Spacer(1, 20))
-    
-    # Group reports by branch, then by employee
-    reports_by_branch = {}
-    for report in reports:
-        branch_name = report[3]
-        
-        if branch_name not in reports_by_branch:
-            reports_by_branch[branch_name] = {}
-        
-        employee_name = report[1]
-        role_name = report[2]
-        key = f"{employee_name} ({role_name})"
-        
-        if key not in reports_by_branch[branch_name]:
-            reports_by_branch[branch_name][key] = []
-        
-        reports_by_branch[branch_name][key].append(report)
-    
-    # Add each branch's reports
-    for branch_name, employees in reports_by_branch.items():
-        # Branch header
-        branch_style = ParagraphStyle(
-            'Branch',
-            parent=styles['Heading2'],
-            fontSize=16,
-            spaceAfter=10,
-            textColor=colors.blue
-        )
-        elements.append(Paragraph(f"Branch: {branch_name}", branch_style))
-        
-        # For each employee in the branch
-        for employee_name, emp_reports in employees.items():
-            # Employee header
-            emp_style = ParagraphStyle(
-                'Employee',
-                parent=styles['Heading3'],
-                fontSize=14,
-                spaceAfter=8
-            )
-            elements.append(Paragraph(employee_name, emp_style))
-            
-            # Group by date
-            emp_reports_by_date = {}
-            for report in emp_reports:
-                date_str = report[4].strftime('%Y-%m-%d')
-                if date_str not in emp_reports_by_date:
-                    emp_reports_by_date[date_str] = report
-            
-            # Add each report
-            for date_str, report in sorted(emp_reports_by_date.items(), reverse=True):
-                # Date
-                date_style = ParagraphStyle(
-                    'Date',
-                    parent=styles['Normal'],
-                    fontSize=11,
-                    textColor=colors.darkblue
-                )
-                elements.append(Paragraph(report[4].strftime('%A, %d %b %Y'), date_style))
-                
-                # Report text
-                text_style = ParagraphStyle(
-                    'ReportText',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    leftIndent=10
-                )
-                elements.append(Paragraph(report[5], text_style))
-                elements.append(Spacer(1, 10))
-            
-            elements.append(Spacer(1, 10))
-        
-        elements.append(Spacer(1, 20))
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return render_report_document(reports, COMPANY_REPORT, f"Company Reports: {company_name}", period)
 
-def create_role_report_pdf(reports, role_name, company_name):
+def create_role_report_pdf(reports, role_name, company_name, period=None):
     """Generate a PDF report for all employees of a specific role.
     
     Args:
-        reports: List of report data tuples with employee and branch info
+        reports: Report data tuples with employee and branch info, as
+            returned by ReportModel.get_company_reports; a list, or an
+            iterator ordered by branch and employee (see
+            ReportModel.stream_company_reports)
         role_name: Name of the role
         company_name: Name of the company
-        
+        period: Optional (start_date, end_date) shown as the period;
+            derived from the reports when they are a list
+    
     Returns:
-        bytes: PDF content as bytes
+        SpooledTemporaryFile holding the PDF, positioned at the start
     """
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter)
-    styles = getSampleStyleSheet()
-    elements = []
-    
-    # Title
-    title_style = ParagraphStyle(
-        'Title',
-        parent=styles['Heading1'],
-        fontSize=16,
-        alignment=1,
-        spaceAfter=12
-    )
-    elements.append(Paragraph(f"{role_name} Reports - {company_name}", title_style))
-    elements.append(Spacer(1, 12))
-    
-    # Date range
-    if reports:
-        date_style = ParagraphStyle(
-            'DateRange',
-            parent=styles['Normal'],
-            fontSize=10,
-            alignment=1,
-            textColor=colors.gray
-        )
-        min_date = min(report[4] for report in reports).strftime('%d %b %Y')
-        max_date = max(report[4] for report in reports).strftime('%d %b %Y')
-        elements.append(Paragraph(f"Period: {min_date} to {max_date}", date_style))
-        elements.append(Spacer(1, 20))
-    
-    # Group reports by employee and branch
-    reports_by_employee = {}
-    for report in reports:
-        employee_name = report[1]
-        branch_name = report[3]
-        
-        key = f"{employee_name} ({branch_name})"
-        if key not in reports_by_employee:
-            reports_by_employee[key] = []
-        
-        reports_by_employee[key].append(report)
-    
-    # Add each employee's reports
-    for employee, emp_reports in reports_by_employee.items():
-        # Employee header
-        emp_style = ParagraphStyle(
-            'Employee',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10
-        )
-        elements.append(Paragraph(employee, emp_style))
-        
-        # Group by date
-        emp_reports_by_date = {}
-        for report in emp_reports:
-            date_str = report[4].strftime('%Y-%m-%d')
-            if date_str not in emp_reports_by_date:
-                emp_reports_by_date[date_str] = report
-        
-        # Add each report
-        for date_str, report in sorted(emp_reports_by_date.items(), reverse=True):
-            # Date
-            date_style = ParagraphStyle(
-                'Date',
-                parent=styles['Normal'],
-                fontSize=11,
-                textColor=colors.blue
-            )
-            elements.append(Paragraph(report[4].strftime('%A, %d %b %Y'), date_style))
-            
-            # Report text
-            text_style = ParagraphStyle(
-                'ReportText',
-                parent=styles['Normal'],
-                fontSize=10,
-                leftIndent=10
-            )
-            elements.append(Paragraph(report[5], text_style))
-            elements.append(Spacer(1, 10))
-        
-        elements.append(Spacer(1, 15))
-    
-    # Build PDF
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer.getvalue()
+    return render_report_document(reports, ROLE_REPORT, f"{role_name} Reports - {company_name}", period)